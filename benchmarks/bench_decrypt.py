@@ -0,0 +1,181 @@
+"""Benchmark bulk decryption of an EncryptedStringDeque across worker counts.
+
+Decrypts every record of a deque with :meth:`RSADecryptor.decrypt_all` (serial)
+and with :meth:`RSADecryptor.decrypt_parallel` on thread and process pools of
+each size in ``--workers``. The per-record RSA unwrap of
+:meth:`EncryptedStringDeque.decrypt` is timed on a sample and extrapolated. Thread
+pools scale only as far as the AES calls release the GIL; use the free-threaded
+build or a process pool for CPU-bound scaling.
+
+Usage example::
+
+    uv run python benchmarks/bench_decrypt.py --records 200000 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from Crypto.PublicKey import RSA  # nosec: B413
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import EncryptedColumns
+    from stringdatadeque import EncryptedStringDeque
+    from stringdatadeque import ParallelRender
+    from stringdatadeque import RSADecryptor
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import EncryptedColumns
+        from stringdatadeque import EncryptedStringDeque
+        from stringdatadeque import ParallelRender
+        from stringdatadeque import RSADecryptor
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import EncryptedColumns
+            from stringdatadeque import EncryptedStringDeque
+            from stringdatadeque import ParallelRender
+            from stringdatadeque import RSADecryptor
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+_KEYS = Path(__file__).resolve().parents[1] / "tests"
+# records decrypted one by one with EncryptedStringDeque.decrypt
+_PER_RECORD_SAMPLE = 200
+
+
+@dataclass
+class BenchResult:
+    """Container for a single benchmark result."""
+
+    label: str
+    workers: int
+    avg_s: float
+    best_s: float
+    records_per_s: float
+
+
+def _per_record(
+    esd: EncryptedStringDeque, private_key: RSA.RsaKey, records: int
+) -> BenchResult:
+    """Time EncryptedStringDeque.decrypt on a sample and extrapolate."""
+    sample = min(_PER_RECORD_SAMPLE, len(esd))
+    start = perf_counter()
+    for index in range(sample):
+        EncryptedStringDeque.decrypt(esd[index], private_key)
+    elapsed = (perf_counter() - start) / sample * records
+    return BenchResult("decrypt() per record", 1, elapsed, elapsed, records / elapsed)
+
+
+def _bench_case(
+    label: str,
+    workers: int,
+    func: Callable[[], Sequence[object]],
+    expected: list[str],
+    iterations: int,
+) -> BenchResult:
+    """Time func and check that it returns the expected plaintexts."""
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = perf_counter()
+        result = func()
+        samples.append(perf_counter() - start)
+        if result != expected:
+            msg = f"{label} ({workers} workers): plaintexts differ"
+            raise RuntimeError(msg)
+    avg = statistics.mean(samples)
+    return BenchResult(label, workers, avg, min(samples), len(expected) / avg)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--records", type=int, default=200_000, help="records in the deque"
+    )
+    parser.add_argument("--size", type=int, default=64, help="characters per record")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="pool sizes to run",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=3, help="number of samples per benchmark"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that runs the serial and every pooled case."""
+    args = parse_args(argv or sys.argv[1:])
+    public_key = RSA.import_key((_KEYS / "default.pem").read_text(encoding="utf-8"))
+    private_key = RSA.import_key((_KEYS / "private.pem").read_text(encoding="utf-8"))
+    expected = [f"{n:08d} ".ljust(args.size, "x") for n in range(args.records)]
+    esd = EncryptedStringDeque(public_key, storage=EncryptedColumns)
+    esd.insert_batch(expected)
+    decryptor = RSADecryptor(private_key)
+
+    results = [
+        _per_record(esd, private_key, args.records),
+        _bench_case(
+            "decrypt_all",
+            1,
+            partial(decryptor.decrypt_all, esd),
+            expected,
+            args.iterations,
+        ),
+    ]
+    for executor in ("thread", "process"):
+        for workers in args.workers:
+            parallel = ParallelRender(executor, workers, min_slice=1024)
+            results.append(
+                _bench_case(
+                    f"{executor} pool",
+                    workers,
+                    partial(decryptor.decrypt_parallel, esd, parallel),
+                    expected,
+                    args.iterations,
+                ),
+            )
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python          : {sys.version.split()[0]}")
+    print(f"GIL enabled     : {gil}")
+    print(f"CPUs            : {os.process_cpu_count()}")
+    print(f"Records         : {args.records} x {args.size} characters")
+    print(f"Iterations/case : {args.iterations}")
+    print()
+    print(
+        f"{'Benchmark':22} {'workers':>7} {'avg (ms)':>11} {'best (ms)':>11} "
+        f"{'records/s':>11} {'speedup':>8}"
+    )
+    print("-" * 75)
+    serial = results[1]
+    for res in results:
+        print(
+            f"{res.label:22} "
+            f"{res.workers:7d} "
+            f"{res.avg_s * 1000:11.1f} "
+            f"{res.best_s * 1000:11.1f} "
+            f"{res.records_per_s:11.0f} "
+            f"{serial.avg_s / res.avg_s:8.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
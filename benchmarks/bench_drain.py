@@ -0,0 +1,132 @@
+"""Benchmark draining a deque in batches.
+
+A consumer empties a deque of ``--elements`` fragments in batches of
+``--batch``, first with a loop of ``draw(0)`` calls, the only way before bulk
+draining existed, then with ``draw_many`` and ``draw_joined``. Every case starts
+from a freshly filled deque; the fill is not timed.
+
+Usage example::
+
+    uv run python benchmarks/bench_drain.py --elements 200000 --batch 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import StringDeque
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import StringDeque
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import StringDeque
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+
+@dataclass
+class BenchResult:
+    """Container for a single benchmark result."""
+
+    label: str
+    avg_s: float
+    best_s: float
+    elements: int
+
+
+def _time(
+    func: Callable[[StringDeque], int], lines: list[str], iterations: int
+) -> tuple[float, float, int]:
+    """Return the average and best time of func, and its last result."""
+    samples: list[float] = []
+    result = 0
+    for _ in range(iterations):
+        sd = StringDeque(lines, sep="\n")
+        start = perf_counter()
+        result = func(sd)
+        samples.append(perf_counter() - start)
+    return statistics.mean(samples), min(samples), result
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--elements", type=int, default=200_000, help="fragments in the deque"
+    )
+    parser.add_argument(
+        "--batch", type=int, default=5_000, help="fragments removed per batch"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=5, help="number of samples per benchmark"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that drains a deque with every strategy."""
+    args = parse_args(argv or sys.argv[1:])
+    lines = [f"fragment {n}" for n in range(args.elements)]
+    batch = args.batch
+
+    def draw_loop(sd: StringDeque) -> int:
+        drained = 0
+        while len(sd):
+            chunk = [sd.draw(0) for _ in range(min(batch, len(sd)))]
+            drained += len(chunk)
+        return drained
+
+    def draw_many(sd: StringDeque) -> int:
+        drained = 0
+        while chunk := sd.draw_many(batch):
+            drained += len(chunk)
+        return drained
+
+    def draw_joined(sd: StringDeque) -> int:
+        drained = 0
+        while before := len(sd):
+            sd.draw_joined(batch)
+            drained += before - len(sd)
+        return drained
+
+    cases: list[tuple[str, Callable[[StringDeque], int]]] = [
+        ("draw(0) loop", draw_loop),
+        ("draw_many", draw_many),
+        ("draw_joined", draw_joined),
+    ]
+    results: list[BenchResult] = []
+    for label, func in cases:
+        avg, best, count = _time(func, lines, args.iterations)
+        results.append(BenchResult(label, avg, best, count))
+
+    print(f"Elements        : {args.elements}")
+    print(f"Batch           : {args.batch}")
+    print(f"Iterations/case : {args.iterations}")
+    print()
+    print(f"{'Benchmark':16} {'drained':>10} {'avg (ms)':>10} {'best (ms)':>10}")
+    print("-" * 49)
+    for res in results:
+        print(
+            f"{res.label:16} "
+            f"{res.elements:10d} "
+            f"{res.avg_s * 1000:10.3f} "
+            f"{res.best_s * 1000:10.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+"""Benchmark encrypting records into an EncryptedStringDeque.
+
+Compares appending records one at a time (``+=``), which encrypts each record on
+its own, with :meth:`EncryptedStringDeque.insert_batch`, which encrypts the whole
+batch in one pass, into the default storage and into
+:class:`~stringdatadeque.EncryptedColumns`. A baseline builds every record with
+PyCryptodome's own EAX object, as the deque did before batching. The memory
+retained by the deque is measured with :mod:`tracemalloc` in a separate run.
+Every record is still decrypted and verified individually after each run.
+
+Usage example::
+
+    uv run python benchmarks/bench_encrypt.py --records 20000 --size 64 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import statistics
+import sys
+import tracemalloc
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from Crypto.Cipher import AES  # nosec: B413
+from Crypto.PublicKey import RSA  # nosec: B413
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import EncryptedColumns
+    from stringdatadeque import EncryptedStringDeque
+    from stringdatadeque import RSAMessage
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import EncryptedColumns
+        from stringdatadeque import EncryptedStringDeque
+        from stringdatadeque import RSAMessage
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import EncryptedColumns
+            from stringdatadeque import EncryptedStringDeque
+            from stringdatadeque import RSAMessage
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+_KEYS = Path(__file__).resolve().parents[1] / "tests"
+
+
+@dataclass
+class BenchResult:
+    """Container for a single benchmark result."""
+
+    label: str
+    size: int
+    avg_s: float
+    best_s: float
+    records_per_s: float
+    retained_bytes: int
+
+
+def _pycryptodome_eax(esd: EncryptedStringDeque, records: list[str]) -> None:
+    """Encrypt with a new PyCryptodome EAX object per record."""
+    esd.insert_batch(())  # create and wrap the session key
+    for record in records:
+        cipher = AES.new(esd.session_key, AES.MODE_EAX)  # pyright: ignore[reportUnknownMemberType]
+        ciphertext, tag = cipher.encrypt_and_digest(record.encode("utf-8"))
+        esd.insert(
+            RSAMessage(esd.enc_session_key, cipher.nonce, tag, ciphertext),
+            skip_conversion=True,
+        )
+
+
+def _append(esd: EncryptedStringDeque, records: list[str]) -> None:
+    """Append records one at a time."""
+    for record in records:
+        esd += record
+
+
+def _batch(esd: EncryptedStringDeque, records: list[str]) -> None:
+    """Append all records with one batch insert."""
+    esd.insert_batch(records)
+
+
+Storage = Callable[[], "deque[RSAMessage] | EncryptedColumns"]
+Case = tuple[str, Callable[[EncryptedStringDeque, list[str]], None], Storage]
+
+
+def _retained(case: Case, public_key: RSA.RsaKey, records: list[str]) -> int:
+    """Return the bytes still allocated after filling a deque, deque included."""
+    _, func, storage = case
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        esd = EncryptedStringDeque(public_key, storage=storage)
+        func(esd, records)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del esd
+    return retained
+
+
+def _bench_case(
+    case: Case,
+    keys: tuple[RSA.RsaKey, RSA.RsaKey],
+    records: list[str],
+    iterations: int,
+) -> BenchResult:
+    """Time encrypting records into a fresh deque, then verify every record."""
+    label, func, storage = case
+    public_key, private_key = keys
+    samples: list[float] = []
+    for _ in range(iterations):
+        esd = EncryptedStringDeque(public_key, storage=storage)
+        start = perf_counter()
+        func(esd, records)
+        samples.append(perf_counter() - start)
+        decrypted = [EncryptedStringDeque.decrypt(esd[i], private_key) for i in (0, -1)]
+        if len(esd) != len(records) or decrypted != [records[0], records[-1]]:
+            msg = f"{label}: records did not round trip"
+            raise RuntimeError(msg)
+    avg = statistics.mean(samples)
+    return BenchResult(
+        label=label,
+        size=len(records[0]),
+        avg_s=avg,
+        best_s=min(samples),
+        records_per_s=len(records) / avg,
+        retained_bytes=_retained(case, public_key, records),
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--records", type=int, default=20_000, help="records encrypted per run"
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        nargs="+",
+        default=[32, 128, 1024],
+        help="record sizes in characters",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=3, help="number of samples per benchmark"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that runs every case for every record size."""
+    args = parse_args(argv or sys.argv[1:])
+    keys = (
+        RSA.import_key((_KEYS / "default.pem").read_text(encoding="utf-8")),
+        RSA.import_key((_KEYS / "private.pem").read_text(encoding="utf-8")),
+    )
+    cases: list[Case] = [
+        ("PyCryptodome EAX", _pycryptodome_eax, deque),
+        ("+= per record", _append, deque),
+        ("insert_batch", _batch, deque),
+        ("+= columns", _append, EncryptedColumns),
+        ("batch columns", _batch, EncryptedColumns),
+    ]
+    results = []
+    for size in args.size:
+        records = [f"{n:08d} ".ljust(size, "x") for n in range(args.records)]
+        results.extend(
+            _bench_case(case, keys, records, args.iterations) for case in cases
+        )
+
+    print(f"Records/run     : {args.records}")
+    print(f"Iterations/case : {args.iterations}")
+    print()
+    print(
+        f"{'Benchmark':18} {'size':>6} {'avg (ms)':>10} {'best (ms)':>10} "
+        f"{'records/s':>11} {'speedup':>8} {'bytes/rec':>10}"
+    )
+    print("-" * 79)
+    for number, res in enumerate(results):
+        baseline = results[number - number % len(cases)]
+        print(
+            f"{res.label:18} "
+            f"{res.size:6d} "
+            f"{res.avg_s * 1000:10.3f} "
+            f"{res.best_s * 1000:10.3f} "
+            f"{res.records_per_s:11.0f} "
+            f"{baseline.avg_s / res.avg_s:8.2f} "
+            f"{res.retained_bytes / args.records:10.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+"""Benchmark ``import stringdatadeque`` with ``python -X importtime``.
+
+Starts a fresh interpreter per sample, parses the ``-X importtime`` report and
+prints the cumulative import time of the package and the slowest modules it
+pulled in. Modules that must stay lazy (PyCryptodome, asyncio, the process pool)
+are checked on every run, and ``--max-ms`` turns the median into a pass/fail
+guard, e.g. for CI.
+
+Usage example::
+
+    uv run python benchmarks/bench_import.py --samples 10 --max-ms 250
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+# modules `import stringdatadeque` must not load
+LAZY_MODULES = ("Crypto", "asyncio", "concurrent.futures.process")
+
+
+@dataclass
+class ImportSample:
+    """Parsed ``-X importtime`` output of one interpreter run."""
+
+    total_us: int
+    self_us: dict[str, int]
+
+
+def _sample(package: str) -> ImportSample:
+    """Import package in a fresh interpreter and parse the timing report."""
+    env = dict(os.environ)
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (src, env.get("PYTHONPATH"))))
+    stderr = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {package}"],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    ).stderr
+    self_us: dict[str, int] = {}
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_field, cumulative, name = line.removeprefix("import time:").split("|")
+        if not self_field.strip().isdigit():
+            continue  # the header line
+        module = name.strip()
+        self_us[module] = int(self_field)
+        if module == package:
+            total_us = int(cumulative)
+    return ImportSample(total_us=total_us, self_us=self_us)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--samples", type=int, default=10, help="number of interpreter runs"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="number of slowest modules to list"
+    )
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="fail if the median import time exceeds this many milliseconds",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that samples the import and reports the result."""
+    args = parse_args(argv or sys.argv[1:])
+    samples = [_sample("stringdatadeque") for _ in range(args.samples)]
+    totals_ms = [sample.total_us / 1000 for sample in samples]
+    median_ms = statistics.median(totals_ms)
+
+    loaded = {
+        module
+        for sample in samples
+        for module in sample.self_us
+        for lazy in LAZY_MODULES
+        if module == lazy or module.startswith(f"{lazy}.")
+    }
+    slowest = sorted(
+        samples[0].self_us,
+        key=lambda module: statistics.median(s.self_us.get(module, 0) for s in samples),
+        reverse=True,
+    )[: args.top]
+
+    print(f"Samples         : {args.samples}")
+    print(f"Median (ms)     : {median_ms:.2f}")
+    print(f"Best (ms)       : {min(totals_ms):.2f}")
+    print()
+    print(f"{'Slowest modules (self time)':44} {'median (ms)':>12}")
+    print("-" * 57)
+    for module in slowest:
+        median = statistics.median(s.self_us.get(module, 0) for s in samples)
+        print(f"{module:44} {median / 1000:12.2f}")
+
+    status = 0
+    if loaded:
+        print(f"\nFAIL: imported eagerly: {', '.join(sorted(loaded))}")
+        status = 1
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"\nFAIL: median {median_ms:.2f} ms exceeds {args.max_ms:.2f} ms")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
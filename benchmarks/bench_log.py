@@ -0,0 +1,178 @@
+"""Benchmark writing and reading an encrypted on-disk log.
+
+Writes ``--records`` records to an :class:`~stringdatadeque.EncryptedLogWriter`,
+and compares the file size with saving ``str(RSAMessage)`` of every record, one
+per line, the only serialization available before. It then times reading back
+the whole log with :meth:`EncryptedLogReader.decrypt`, and decrypting a few
+records after seeking to the end of the log, once through the sparse index and
+once with the index disabled (one interval covering the whole log).
+
+Usage example::
+
+    uv run python benchmarks/bench_log.py --records 100000 --size 64 --interval 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from Crypto.PublicKey import RSA  # nosec: B413
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import EncryptedLogReader
+    from stringdatadeque import EncryptedLogWriter
+    from stringdatadeque import EncryptedStringDeque
+    from stringdatadeque import RSADecryptor
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import EncryptedLogReader
+        from stringdatadeque import EncryptedLogWriter
+        from stringdatadeque import EncryptedStringDeque
+        from stringdatadeque import RSADecryptor
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import EncryptedLogReader
+            from stringdatadeque import EncryptedLogWriter
+            from stringdatadeque import EncryptedStringDeque
+            from stringdatadeque import RSADecryptor
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+_KEYS = Path(__file__).resolve().parents[1] / "tests"
+# records decrypted after each seek
+_TAIL = 10
+
+
+@dataclass
+class BenchResult:
+    """Container for a single benchmark result."""
+
+    label: str
+    avg_s: float
+    best_s: float
+    records: int
+
+
+def _time(func: Callable[[], int], iterations: int) -> tuple[float, float, int]:
+    """Return the average and best time of func, and its last result."""
+    samples: list[float] = []
+    result = 0
+    for _ in range(iterations):
+        start = perf_counter()
+        result = func()
+        samples.append(perf_counter() - start)
+    return statistics.mean(samples), min(samples), result
+
+
+def _write(
+    path: Path, public_key: RSA.RsaKey, records: list[str], interval: int
+) -> int:
+    """Write a new log in batches of 1000 records."""
+    path.unlink(missing_ok=True)
+    with EncryptedLogWriter(path, public_key, index_interval=interval) as writer:
+        for start in range(0, len(records), 1000):
+            writer.extend(records[start : start + 1000])
+        return len(writer)
+
+
+def _read_all(path: Path, decryptor: RSADecryptor, expected: list[str]) -> int:
+    """Decrypt the whole log and verify it."""
+    with EncryptedLogReader(path) as reader:
+        decrypted = list(reader.decrypt(decryptor))
+    if decrypted != expected:
+        msg = "log did not round trip"
+        raise RuntimeError(msg)
+    return len(decrypted)
+
+
+def _read_tail(path: Path, decryptor: RSADecryptor, expected: list[str]) -> int:
+    """Open the log, seek to its last records and decrypt them."""
+    with EncryptedLogReader(path) as reader:
+        decrypted = list(reader.decrypt(decryptor, -_TAIL))
+    if decrypted != expected[-_TAIL:]:
+        msg = "tail did not round trip"
+        raise RuntimeError(msg)
+    return len(decrypted)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--records", type=int, default=100_000, help="records written to the log"
+    )
+    parser.add_argument(
+        "--size", type=int, default=64, help="record size in characters"
+    )
+    parser.add_argument(
+        "--interval", type=int, default=1024, help="records per index entry"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=3, help="number of samples per benchmark"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that writes, measures and reads back a log."""
+    args = parse_args(argv or sys.argv[1:])
+    public_key = RSA.import_key((_KEYS / "default.pem").read_text(encoding="utf-8"))
+    private_key = RSA.import_key((_KEYS / "private.pem").read_text(encoding="utf-8"))
+    decryptor = RSADecryptor(private_key)
+    records = [f"{n:08d} ".ljust(args.size, "x") for n in range(args.records)]
+
+    esd = EncryptedStringDeque(public_key, data=records)
+    str_bytes = sum(len(str(msg).encode("utf-8")) + 1 for msg in esd)
+
+    results: list[BenchResult] = []
+    with tempfile.TemporaryDirectory() as directory:
+        indexed = Path(directory) / "indexed.log"
+        unindexed = Path(directory) / "unindexed.log"
+        avg, best, count = _time(
+            lambda: _write(indexed, public_key, records, args.interval),
+            args.iterations,
+        )
+        results.append(BenchResult("write", avg, best, count))
+        _write(unindexed, public_key, records, args.records + 1)
+        log_bytes = indexed.stat().st_size
+        cases: list[tuple[str, Callable[[], int]]] = [
+            ("read all", lambda: _read_all(indexed, decryptor, records)),
+            ("seek, indexed", lambda: _read_tail(indexed, decryptor, records)),
+            ("seek, no index", lambda: _read_tail(unindexed, decryptor, records)),
+        ]
+        for label, func in cases:
+            avg, best, count = _time(func, args.iterations)
+            results.append(BenchResult(label, avg, best, count))
+
+    print(f"Records         : {args.records} x {args.size} characters")
+    print(f"Index interval  : {args.interval}")
+    print(f"Iterations/case : {args.iterations}")
+    print(f"str(RSAMessage) : {str_bytes / args.records:8.1f} bytes/record")
+    print(f"Log file        : {log_bytes / args.records:8.1f} bytes/record")
+    print()
+    print(f"{'Benchmark':16} {'records':>8} {'avg (ms)':>10} {'best (ms)':>10}")
+    print("-" * 47)
+    for res in results:
+        print(
+            f"{res.label:16} "
+            f"{res.records:8d} "
+            f"{res.avg_s * 1000:10.3f} "
+            f"{res.best_s * 1000:10.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,158 @@
+"""Memory benchmark comparing StringDeque storage backends.
+
+Appends many short, freshly created fragments and reports the memory retained by
+the deque (measured with :mod:`tracemalloc`) for the default ``collections.deque``
+storage and for :class:`~stringdatadeque.RopeStorage`.
+
+Usage example::
+
+    uv run python benchmarks/bench_memory.py --size 1000000 --min-length 10 \
+        --max-length 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import string
+import sys
+import tracemalloc
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import RopeStorage
+    from stringdatadeque import StringDeque
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import RopeStorage
+        from stringdatadeque import StringDeque
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import RopeStorage
+            from stringdatadeque import StringDeque
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+
+@dataclass
+class MemoryResult:
+    """Container for a single memory measurement."""
+
+    label: str
+    retained_bytes: int
+    peak_bytes: int
+    build_s: float
+
+
+def _fragments(min_length: int, max_length: int) -> Callable[[], str]:
+    """Return a factory producing deterministic fragments of varying length."""
+    alphabet = (string.ascii_letters + string.digits) * 2
+    span = max_length - min_length + 1
+    rng = 42
+
+    def make() -> str:
+        nonlocal rng
+        rng = (1103515245 * rng + 12345) & 0x7FFFFFFF
+        start = rng % 62
+        # slicing gives a new str object per fragment, like formatted log lines
+        return alphabet[start : start + min_length + rng % span]
+
+    return make
+
+
+def _measure(
+    label: str,
+    build: Callable[[], StringDeque],
+) -> tuple[MemoryResult, StringDeque]:
+    """Build a deque under tracemalloc and report what it retains."""
+    gc.collect()
+    tracemalloc.start()
+    start = perf_counter()
+    deque_ = build()
+    elapsed = perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return MemoryResult(label, retained, peak, elapsed), deque_
+
+
+def _build(
+    storage: Callable[[], object] | None,
+    size: int,
+    make: Callable[[], str],
+) -> StringDeque:
+    """Append ``size`` fragments to a StringDeque using ``storage``."""
+    if storage is None:
+        sd = StringDeque(sep="\n")
+    else:
+        sd = StringDeque(sep="\n", storage=storage)
+    for _ in range(size):
+        sd += make()
+    return sd
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size", type=int, default=1_000_000, help="number of fragments to append"
+    )
+    parser.add_argument(
+        "--min-length", type=int, default=10, help="shortest fragment (characters)"
+    )
+    parser.add_argument(
+        "--max-length", type=int, default=40, help="longest fragment (characters)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=64 * 1024,
+        help="characters per RopeStorage chunk",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that runs each backend and prints a comparison table."""
+    args = parse_args(argv or sys.argv[1:])
+    cases: list[tuple[str, Callable[[], object] | None]] = [
+        ("deque (default)", None),
+        ("RopeStorage", partial(RopeStorage, chunk_size=args.chunk_size)),
+    ]
+    results: list[MemoryResult] = []
+    rendered: set[int] = set()
+    for label, storage in cases:
+        make = _fragments(args.min_length, args.max_length)
+        result, sd = _measure(label, partial(_build, storage, args.size, make))
+        results.append(result)
+        rendered.add(hash(str(sd)))
+        del sd
+    if len(rendered) != 1:
+        print("warning: backends rendered different output")
+
+    print(f"Fragments       : {args.size}")
+    print(f"Fragment length : {args.min_length}-{args.max_length}")
+    print()
+    print(f"{'Storage':20} {'retained (MB)':>14} {'peak (MB)':>10} {'build (s)':>10}")
+    print("-" * 57)
+    for res in results:
+        print(
+            f"{res.label:20} "
+            f"{res.retained_bytes / 1_000_000:14.2f} "
+            f"{res.peak_bytes / 1_000_000:10.2f} "
+            f"{res.build_s:10.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
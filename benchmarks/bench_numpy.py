@@ -0,0 +1,129 @@
+"""Benchmark ingesting NumPy arrays into a StringDeque.
+
+Compares ``deque |= array``, which converts arrays in bulk, with the conversion it
+replaces, calling ``str()`` on one NumPy scalar at a time, for a few dtypes.
+Requires NumPy.
+
+Usage example::
+
+    uv run python benchmarks/bench_numpy.py --size 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Any
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import StringDeque
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import StringDeque
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import StringDeque
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+
+@dataclass
+class BenchResult:
+    """Container for a single benchmark result."""
+
+    label: str
+    avg_s: float
+    best_s: float
+
+
+def _per_element(array: Any) -> StringDeque:
+    """Ingest by converting each NumPy scalar on its own."""
+    sd = StringDeque()
+    sd |= list(array)
+    return sd
+
+
+def _bulk(array: Any) -> StringDeque:
+    """Ingest through the ndarray fast path."""
+    sd = StringDeque()
+    sd |= array
+    return sd
+
+
+def _bench_case(
+    label: str,
+    ingest: Callable[[Any], StringDeque],
+    array: Any,
+    iterations: int,
+) -> tuple[BenchResult, list[str]]:
+    """Time ``ingest`` and return statistics and the stored elements."""
+    samples: list[float] = []
+    stored: list[str] = []
+    for _ in range(iterations):
+        start = perf_counter()
+        sd = ingest(array)
+        samples.append(perf_counter() - start)
+        stored = list(sd)
+    return (
+        BenchResult(label=label, avg_s=statistics.mean(samples), best_s=min(samples)),
+        stored,
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size", type=int, default=1_000_000, help="number of array elements"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=3, help="number of samples per benchmark"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that runs every dtype/method combination."""
+    args = parse_args(argv or sys.argv[1:])
+    rng = np.random.default_rng(0)
+    arrays = {
+        "int64": rng.integers(-(2**40), 2**40, args.size),
+        "float64": rng.standard_normal(args.size),
+        "bool": rng.integers(0, 2, args.size).astype(bool),
+        "unicode": rng.integers(0, 10**6, args.size).astype(str),
+    }
+    results: list[BenchResult] = []
+    for dtype, array in arrays.items():
+        reference, expected = _bench_case(
+            f"{dtype} per-element", _per_element, array, args.iterations
+        )
+        bulk, stored = _bench_case(f"{dtype} bulk", _bulk, array, args.iterations)
+        if stored != expected:
+            msg = f"{dtype}: bulk ingest differs from per-element conversion"
+            raise RuntimeError(msg)
+        results.extend((reference, bulk))
+
+    print(f"Elements        : {args.size}")
+    print(f"Iterations/case : {args.iterations}")
+    print()
+    print(f"{'Benchmark':22} {'avg (ms)':>10} {'best (ms)':>10}")
+    print("-" * 44)
+    for res in results:
+        print(f"{res.label:22} {res.avg_s * 1000:10.3f} {res.best_s * 1000:10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
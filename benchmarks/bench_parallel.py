@@ -0,0 +1,142 @@
+"""Benchmark parallel rendering with an expensive format_func.
+
+Renders a StringDataDeque of records whose ``format_func`` does a fixed amount of
+CPU work, serially and with :class:`ParallelRender` on thread and process pools.
+Thread pools only scale on the free-threaded build or when the formatter releases
+the GIL.
+
+Usage example::
+
+    uv run python benchmarks/bench_parallel.py --size 50000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import ParallelRender
+    from stringdatadeque import StringDataDeque
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import ParallelRender
+        from stringdatadeque import StringDataDeque
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import ParallelRender
+            from stringdatadeque import StringDataDeque
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+
+@dataclass
+class BenchResult:
+    """Container for a single benchmark result."""
+
+    label: str
+    avg_s: float
+    best_s: float
+
+
+def _format_record(value: int) -> str:
+    """Format a record with some deliberate CPU work (module level for pickling)."""
+    acc = value
+    for _ in range(200):
+        acc = (acc * 1_103_515_245 + 12_345) & 0xFFFFFFFF
+    return f"record {value}: {acc:08x}"
+
+
+def _bench_case(
+    label: str,
+    parallel: ParallelRender | None,
+    size: int,
+    iterations: int,
+) -> tuple[BenchResult, str]:
+    """Time ``str()`` on a fresh deque and return statistics and the output."""
+    samples: list[float] = []
+    rendered = ""
+    for _ in range(iterations):
+        # a fresh deque each time so str() cannot reuse a cached rendering
+        sd = StringDataDeque(
+            convert_func=int,
+            format_func=_format_record,
+            data=list(range(size)),
+            sep="\n",
+        )
+        sd.parallel = parallel
+        start = perf_counter()
+        rendered = str(sd)
+        samples.append(perf_counter() - start)
+    return (
+        BenchResult(label=label, avg_s=statistics.mean(samples), best_s=min(samples)),
+        rendered,
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=50_000, help="number of records")
+    parser.add_argument("--workers", type=int, default=4, help="pool size")
+    parser.add_argument(
+        "--min-slice", type=int, default=1024, help="minimum elements per slice"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=3, help="number of samples per benchmark"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that runs the serial and parallel cases."""
+    args = parse_args(argv or sys.argv[1:])
+    cases: list[tuple[str, ParallelRender | None]] = [
+        ("serial", None),
+        (
+            "thread pool",
+            ParallelRender("thread", args.workers, args.min_slice),
+        ),
+        (
+            "process pool",
+            ParallelRender("process", args.workers, args.min_slice),
+        ),
+    ]
+    results = []
+    expected = None
+    for label, parallel in cases:
+        result, rendered = _bench_case(label, parallel, args.size, args.iterations)
+        if expected is None:
+            expected = rendered
+        elif rendered != expected:
+            msg = f"{label}: output differs from the serial rendering"
+            raise RuntimeError(msg)
+        results.append(result)
+
+    print(f"Records         : {args.size}")
+    print(f"Workers         : {args.workers}")
+    print(f"Iterations/case : {args.iterations}")
+    print()
+    print(f"{'Benchmark':16} {'avg (ms)':>10} {'best (ms)':>10} {'speedup':>8}")
+    print("-" * 47)
+    for res in results:
+        print(
+            f"{res.label:16} "
+            f"{res.avg_s * 1000:10.3f} "
+            f"{res.best_s * 1000:10.3f} "
+            f"{results[0].avg_s / res.avg_s:8.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
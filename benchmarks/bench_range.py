@@ -0,0 +1,128 @@
+"""Benchmark rendering a range of elements from the middle of a deque.
+
+Compares copying the whole storage into a list and slicing it, the only way to
+render a range before ``StringDataDeque.render(start, stop)`` existed, with
+``render`` on the default ``collections.deque`` storage (walked in from the
+nearer end), on :class:`~stringdatadeque.BlockStorage` (O(1) indexing) and on
+:class:`~stringdatadeque.RopeStorage` (bisected chunks). Ranges start at random
+positions.
+
+Usage example::
+
+    uv run python benchmarks/bench_range.py --elements 1000000 --span 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import BlockStorage
+    from stringdatadeque import RopeStorage
+    from stringdatadeque import StringDeque
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import BlockStorage
+        from stringdatadeque import RopeStorage
+        from stringdatadeque import StringDeque
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import BlockStorage
+            from stringdatadeque import RopeStorage
+            from stringdatadeque import StringDeque
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+
+@dataclass
+class BenchResult:
+    """Container for a single benchmark result."""
+
+    label: str
+    avg_s: float
+    best_s: float
+
+
+def _time(func: Callable[[int], str], starts: list[int]) -> tuple[float, float]:
+    """Return the average and best time of func over the start positions."""
+    samples: list[float] = []
+    for start in starts:
+        begin = perf_counter()
+        func(start)
+        samples.append(perf_counter() - begin)
+    return statistics.mean(samples), min(samples)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--elements", type=int, default=1_000_000, help="elements in the deque"
+    )
+    parser.add_argument(
+        "--span", type=int, default=10_000, help="elements rendered per range"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=20, help="ranges rendered per benchmark"
+    )
+    parser.add_argument("--seed", type=int, default=1234, help="random seed")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that renders random ranges with every strategy."""
+    args = parse_args(argv or sys.argv[1:])
+    lines = [f"line {n}" for n in range(args.elements)]
+    rng = random.Random(args.seed)  # noqa: S311 - only picks range starts
+    starts = [
+        rng.randrange(args.elements - args.span + 1) for _ in range(args.iterations)
+    ]
+    plain = StringDeque(lines, sep="\n")
+    block = StringDeque(lines, sep="\n", storage=BlockStorage)
+    rope = StringDeque(lines, sep="\n", storage=RopeStorage)
+    span = args.span
+
+    def copy_and_slice(start: int) -> str:
+        # the storage itself, iterating the deque would go through __getitem__
+        return "\n".join(list(plain._data)[start : start + span])  # noqa: SLF001
+
+    cases: list[tuple[str, Callable[[int], str]]] = [
+        ("list copy", copy_and_slice),
+        ("render, deque", lambda start: plain.render(start, start + span)),
+        ("render, block", lambda start: block.render(start, start + span)),
+        ("render, rope", lambda start: rope.render(start, start + span)),
+    ]
+    expected = [copy_and_slice(start) for start in starts[:3]]
+    results: list[BenchResult] = []
+    for label, func in cases:
+        if [func(start) for start in starts[:3]] != expected:
+            msg = f"{label} rendered a different range"
+            raise RuntimeError(msg)
+        avg, best = _time(func, starts)
+        results.append(BenchResult(label, avg, best))
+
+    print(f"Elements        : {args.elements}")
+    print(f"Range span      : {args.span}")
+    print(f"Iterations/case : {args.iterations}")
+    print()
+    print(f"{'Benchmark':16} {'avg (ms)':>10} {'best (ms)':>10}")
+    print("-" * 38)
+    for res in results:
+        print(f"{res.label:16} {res.avg_s * 1000:10.3f} {res.best_s * 1000:10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
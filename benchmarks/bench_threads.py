@@ -0,0 +1,166 @@
+"""Benchmark concurrent appends to StringDeque and ShardedStringDeque.
+
+Every thread appends ``--appends`` fragments with ``+=`` to one shared deque, for
+each thread count in ``--threads``. The shared StringDeque funnels every append
+into a single ``collections.deque``, ShardedStringDeque gives each thread its own
+shard. Run it with both the regular and the free-threaded interpreter to compare
+(``python3.13t``, or ``uv run --python 3.13t``); the header shows whether the GIL is
+enabled.
+
+Usage example::
+
+    uv run python benchmarks/bench_threads.py --appends 100000 --threads 1 2 4 8 16 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import threading
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import ShardedStringDeque
+    from stringdatadeque import StringDeque
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import ShardedStringDeque
+        from stringdatadeque import StringDeque
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import ShardedStringDeque
+            from stringdatadeque import StringDeque
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+
+@dataclass
+class BenchResult:
+    """Container for a single benchmark result."""
+
+    label: str
+    threads: int
+    avg_s: float
+    best_s: float
+    appends_per_s: float
+    render_ms: float
+
+
+def _append_worker(sd: StringDeque, appends: int, barrier: threading.Barrier) -> None:
+    """Wait for the other workers, then append ``appends`` fragments."""
+    barrier.wait()
+    for _ in range(appends):
+        sd += "fragment"
+
+
+def _bench_case(
+    label: str,
+    factory: Callable[[], StringDeque],
+    threads: int,
+    appends: int,
+    iterations: int,
+) -> BenchResult:
+    """Time concurrent appends from ``threads`` threads."""
+    samples: list[float] = []
+    render: list[float] = []
+    for _ in range(iterations):
+        sd = factory()
+        barrier = threading.Barrier(threads + 1)
+        workers = [
+            threading.Thread(target=_append_worker, args=(sd, appends, barrier))
+            for _ in range(threads)
+        ]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        start = perf_counter()
+        for worker in workers:
+            worker.join()
+        samples.append(perf_counter() - start)
+        start = perf_counter()
+        rendered = str(sd)
+        render.append(perf_counter() - start)
+        expected = threads * appends * len("fragment")
+        if len(rendered) != expected:
+            msg = f"{label}: rendered {len(rendered)} characters, expected {expected}"
+            raise RuntimeError(msg)
+    avg = statistics.mean(samples)
+    best = min(samples)
+    rate = 0.0 if avg == 0 else threads * appends / avg
+    return BenchResult(
+        label=label,
+        threads=threads,
+        avg_s=avg,
+        best_s=best,
+        appends_per_s=rate,
+        render_ms=statistics.mean(render) * 1000,
+    )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--appends", type=int, default=100_000, help="appends per thread"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16, 32],
+        help="thread counts to run",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=3, help="number of samples per benchmark"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that runs every deque/thread count combination."""
+    args = parse_args(argv or sys.argv[1:])
+    cases: list[tuple[str, Callable[[], StringDeque]]] = [
+        ("StringDeque", StringDeque),
+        ("Sharded (thread)", ShardedStringDeque),
+        ("Sharded (arrival)", lambda: ShardedStringDeque(order="arrival")),
+    ]
+    results = [
+        _bench_case(label, factory, threads, args.appends, args.iterations)
+        for threads in args.threads
+        for label, factory in cases
+    ]
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python          : {sys.version.split()[0]}")
+    print(f"GIL enabled     : {gil}")
+    print(f"Appends/thread  : {args.appends}")
+    print(f"Iterations/case : {args.iterations}")
+    print()
+    print(
+        f"{'Benchmark':20} {'threads':>7} {'avg (ms)':>10} {'best (ms)':>10} "
+        f"{'Mappends/s':>11} {'str() (ms)':>11}"
+    )
+    print("-" * 74)
+    for res in results:
+        print(
+            f"{res.label:20} "
+            f"{res.threads:7d} "
+            f"{res.avg_s * 1000:10.3f} "
+            f"{res.best_s * 1000:10.3f} "
+            f"{res.appends_per_s / 1_000_000:11.2f} "
+            f"{res.render_ms:11.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
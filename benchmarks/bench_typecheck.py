@@ -0,0 +1,123 @@
+"""Benchmark StringDeque methods at each runtime type-checking level.
+
+Each level (``full``, ``boundary``, ``off``) is measured in a fresh interpreter
+started with ``STRINGDATADEQUE_TYPECHECK`` set, because the level is fixed when
+the package is imported. The table shows the cost per call of each method.
+
+Usage example::
+
+    uv run python benchmarks/bench_typecheck.py --number 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections.abc import Callable
+from collections.abc import Sequence
+from pathlib import Path
+from timeit import Timer
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import StringDeque
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import StringDeque
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import StringDeque
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+LEVELS = ("full", "boundary", "off")
+
+
+def _cases() -> dict[str, Callable[[], object]]:
+    """Return the operations to time, keyed by label."""
+    sd = StringDeque(["alpha", "beta", "gamma"], sep=",")
+
+    def draw() -> None:
+        sd.insert("x")
+        sd.draw()
+
+    def iadd() -> None:
+        nonlocal sd
+        sd += "x"
+        sd.draw()
+
+    return {
+        "__init__": lambda: StringDeque(["a", "b"], sep=","),
+        "insert(str) + draw": draw,
+        "insert(list)": lambda: sd.insert(["x", "y"]) and sd.draw() and sd.draw(),
+        "+= + draw": iadd,
+        "__contains__": lambda: "beta" in sd,
+        "__format__ sep=": lambda: format(sd, "sep=|"),
+        "__str__": lambda: str(sd),
+        "__setitem__": lambda: sd.__setitem__(0, "alpha"),
+        "clear": StringDeque().clear,
+    }
+
+
+def _run_child(number: int) -> int:
+    """Time every case in this interpreter and print the results as JSON."""
+    results = {
+        label: Timer(func).timeit(number) / number * 1_000_000
+        for label, func in _cases().items()
+    }
+    print(json.dumps(results))
+    return 0
+
+
+def _measure(level: str, number: int) -> dict[str, float]:
+    """Run this script in a child interpreter at the given level."""
+    env = {**os.environ, "STRINGDATADEQUE_TYPECHECK": level}
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (src, env.get("PYTHONPATH"))))
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, __file__, "--child", "--number", str(number)],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    ).stdout
+    return json.loads(output)  # type: ignore[no-any-return]
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--number", type=int, default=50_000, help="calls timed per method"
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that measures every level and prints a comparison."""
+    args = parse_args(argv or sys.argv[1:])
+    if args.child:
+        return _run_child(args.number)
+    results = {level: _measure(level, args.number) for level in LEVELS}
+
+    print(f"Calls/method    : {args.number}")
+    print()
+    header = "".join(f"{level + ' (us)':>16}" for level in LEVELS)
+    print(f"{'Method':22}{header}{'full/off':>10}")
+    print("-" * (22 + 16 * len(LEVELS) + 10))
+    for label in results["full"]:
+        row = "".join(f"{results[level][label]:16.3f}" for level in LEVELS)
+        ratio = results["full"][label] / results["off"][label]
+        print(f"{label:22}{row}{ratio:10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
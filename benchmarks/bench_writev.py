@@ -0,0 +1,206 @@
+"""Benchmark vectored flush_to() against join + write.
+
+Sends a StringDeque over a local ``socket.socketpair()`` and an ``os.pipe()``,
+either by rendering it with ``str()``, encoding and writing the result, or with
+:meth:`StringDeque.flush_to`, which hands the encoded fragments straight to
+``socket.sendmsg`` / ``os.writev``. A background thread drains the read end.
+
+Usage example::
+
+    uv run python benchmarks/bench_writev.py --size 200000 --length 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import statistics
+import string
+import sys
+import threading
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from stringdatadeque import StringDeque
+else:  # pragma: no cover - convenience for direct execution
+    try:
+        from stringdatadeque import StringDeque
+    except ModuleNotFoundError:
+        _PROJECT_ROOT = Path(__file__).resolve().parents[1]
+        _SRC_PATH = _PROJECT_ROOT / "src"
+        if _SRC_PATH.exists():
+            sys.path.insert(0, str(_SRC_PATH))
+            from stringdatadeque import StringDeque
+        else:  # Fall back to the original error if the repo layout is unexpected.
+            raise
+
+# (writer end, reader callable, closer) for one transport
+Channel = tuple[object, Callable[[], int], Callable[[], None]]
+
+
+@dataclass
+class BenchResult:
+    """Container for a single benchmark result."""
+
+    label: str
+    avg_s: float
+    best_s: float
+    throughput_mb_s: float
+
+
+def _make_payload(size: int, length: int) -> list[str]:
+    """Return deterministic payload fragments."""
+    charset = (string.ascii_letters + string.digits) * (length // 62 + 2)
+    return [charset[n % 62 : n % 62 + length] for n in range(size)]
+
+
+def _socket_channel() -> Channel:
+    """Open a socketpair and return its write end plus a draining reader."""
+    left, right = socket.socketpair()
+
+    def drain() -> int:
+        total = 0
+        while data := right.recv(1 << 20):
+            total += len(data)
+        return total
+
+    def close() -> None:
+        left.close()
+        right.close()
+
+    return left, drain, close
+
+
+def _pipe_channel() -> Channel:
+    """Open a pipe and return its write end plus a draining reader."""
+    read_fd, write_fd = os.pipe()
+
+    def drain() -> int:
+        total = 0
+        while data := os.read(read_fd, 1 << 20):
+            total += len(data)
+        return total
+
+    def close() -> None:
+        os.close(read_fd)
+
+    return write_fd, drain, close
+
+
+def _finish(target: object) -> None:
+    """Signal end of stream on the write end."""
+    if isinstance(target, socket.socket):
+        target.shutdown(socket.SHUT_WR)
+    else:
+        os.close(target)  # type: ignore[arg-type]
+
+
+def _join_and_write(sd: StringDeque, target: object) -> None:
+    """Render, encode and write the whole buffer."""
+    data = str(sd).encode("utf-8")
+    if isinstance(target, socket.socket):
+        target.sendall(data)
+        return
+    view = memoryview(data)
+    while view:
+        view = view[os.write(target, view) :]  # type: ignore[arg-type]
+
+
+def _flush_to(sd: StringDeque, target: object) -> None:
+    """Write with vectored I/O."""
+    sd.flush_to(target)  # type: ignore[arg-type]
+
+
+def _collect(drain: Callable[[], int], received: list[int]) -> None:
+    """Run ``drain`` and record how many bytes it read."""
+    received.append(drain())
+
+
+def _bench_case(
+    label: str,
+    send: Callable[[StringDeque, object], None],
+    open_channel: Callable[[], Channel],
+    payload: Sequence[str],
+    iterations: int,
+) -> BenchResult:
+    """Time ``send`` over fresh channels and return summary statistics."""
+    samples: list[float] = []
+    total_bytes = len("\n".join(payload).encode("utf-8"))
+    for _ in range(iterations):
+        # a fresh deque each time so str() cannot reuse a cached rendering
+        sd = StringDeque(data=payload, sep="\n")
+        target, drain, close = open_channel()
+        received: list[int] = []
+        reader = threading.Thread(target=_collect, args=(drain, received))
+        reader.start()
+        start = perf_counter()
+        send(sd, target)
+        _finish(target)
+        reader.join()
+        samples.append(perf_counter() - start)
+        close()
+        if received != [total_bytes]:
+            msg = f"{label}: received {received} bytes, expected {total_bytes}"
+            raise RuntimeError(msg)
+    avg = statistics.mean(samples)
+    best = min(samples)
+    throughput = 0.0 if avg == 0 else (total_bytes / avg) / 1_000_000
+    return BenchResult(label=label, avg_s=avg, best_s=best, throughput_mb_s=throughput)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size", type=int, default=200_000, help="number of string fragments"
+    )
+    parser.add_argument(
+        "--length", type=int, default=32, help="length of each fragment (characters)"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=10, help="number of samples per benchmark"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point that runs every transport/method combination."""
+    args = parse_args(argv or sys.argv[1:])
+    payload = _make_payload(args.size, args.length)
+
+    results = [
+        _bench_case(f"{method} ({transport})", send, channel, payload, args.iterations)
+        for transport, channel in (
+            ("socketpair", _socket_channel),
+            ("pipe", _pipe_channel),
+        )
+        for method, send in (
+            ("join + write", _join_and_write),
+            ("flush_to", _flush_to),
+        )
+    ]
+
+    print(f"Fragments       : {args.size}")
+    print(f"Fragment length : {args.length}")
+    print(f"Iterations/case : {args.iterations}")
+    print()
+    print(f"{'Benchmark':28} {'avg (ms)':>10} {'best (ms)':>10} {'MB/s':>10}")
+    print("-" * 61)
+    for res in results:
+        print(
+            f"{res.label:28} "
+            f"{res.avg_s * 1000:10.3f} "
+            f"{res.best_s * 1000:10.3f} "
+            f"{res.throughput_mb_s:10.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,44 +6,106 @@ import warnings as _warnings
 from typing import TYPE_CHECKING
 from typing import Final
 
+from .bytesdatadeque import BytesDataDeque
+from .parallel import ParallelRender
+from .storage import BlockStorage
+from .storage import BoundedStorage
+from .storage import RopeStorage
+from .storage import ShardedStorage
+from .storage import SpillStorage
 from .stringdatadeque import CircularStringDeque
+from .stringdatadeque import ShardedStringDeque
+from .stringdatadeque import SliceView
+from .stringdatadeque import SpillingStringDeque
 from .stringdatadeque import StringDataDeque
 from .stringdatadeque import StringDeque
+from .stringdatadeque import WORMSnapshot
 from .stringdatadeque import WORMStringDeque
 
 if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from .encryptedlog import EncryptedLogReader
+    from .encryptedlog import EncryptedLogWriter
+    from .encryptedstringdeque import DecryptionError
+    from .encryptedstringdeque import EncryptedColumns
     from .encryptedstringdeque import EncryptedStringDeque
+    from .encryptedstringdeque import RSADecryptor
     from .encryptedstringdeque import RSAMessage
-else:  # pragma: no cover - runtime optional import
-    try:
-        from .encryptedstringdeque import EncryptedStringDeque
-        from .encryptedstringdeque import RSAMessage
-    except ModuleNotFoundError:
-        EncryptedStringDeque = None  # type: ignore[assignment]
-        RSAMessage = None  # type: ignore[assignment]
 
 USING_PURE_PYTHON: Final[bool] = True
 
 PureStringDeque = StringDeque
 
-if (
-    not TYPE_CHECKING
-) and EncryptedStringDeque is None:  # pragma: no cover - optional dependency
-    _warnings.warn(
-        "PyCryptodome required for EncryptedStringDeque",
-        ImportWarning,
-        stacklevel=2,
-    )
-    EncryptedStringDeque = None  # type: ignore[assignment]
-    RSAMessage = None  # type: ignore[assignment]
+# PyCryptodome is only imported when these names are first used
+_LAZY_ENCRYPTED: Final = frozenset(
+    {
+        "DecryptionError",
+        "EncryptedColumns",
+        "EncryptedLogReader",
+        "EncryptedLogWriter",
+        "EncryptedStringDeque",
+        "RSADecryptor",
+        "RSAMessage",
+    },
+)
+
+
+def __getattr__(name: str) -> object:
+    """Import the optional encryption classes on first access.
+
+    :param name: The attribute being looked up.
+    :type name: str
+
+    :return: The class, or None when PyCryptodome is not installed.
+    :rtype: object
+
+    :raises AttributeError: If name is not a lazily loaded attribute.
+    """
+    if name not in _LAZY_ENCRYPTED:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    try:
+        from . import encryptedlog  # noqa: PLC0415
+        from . import encryptedstringdeque  # noqa: PLC0415
+    except ModuleNotFoundError:  # pragma: no cover - optional dependency
+        _warnings.warn(
+            "PyCryptodome required for EncryptedStringDeque",
+            ImportWarning,
+            stacklevel=2,
+        )
+        values: dict[str, object] = dict.fromkeys(_LAZY_ENCRYPTED)
+    else:
+        values = {
+            lazy: getattr(encryptedlog, lazy, None)
+            or getattr(encryptedstringdeque, lazy)
+            for lazy in _LAZY_ENCRYPTED
+        }
+    globals().update(values)
+    return values[name]
+
 
 __all__ = [
     "USING_PURE_PYTHON",
+    "BlockStorage",
+    "BoundedStorage",
+    "BytesDataDeque",
     "CircularStringDeque",
+    "DecryptionError",
+    "EncryptedColumns",
+    "EncryptedLogReader",
+    "EncryptedLogWriter",
     "EncryptedStringDeque",
+    "ParallelRender",
     "PureStringDeque",
+    "RSADecryptor",
     "RSAMessage",
+    "RopeStorage",
+    "ShardedStorage",
+    "ShardedStringDeque",
+    "SliceView",
+    "SpillStorage",
+    "SpillingStringDeque",
     "StringDataDeque",
     "StringDeque",
+    "WORMSnapshot",
     "WORMStringDeque",
 ]
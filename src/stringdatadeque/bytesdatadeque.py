@@ -0,0 +1,451 @@
+"""Holds BytesDataDeque, a bytes-native sibling of StringDataDeque."""
+
+import socket
+from collections import deque
+from collections.abc import Buffer
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from functools import partial
+from typing import Self
+from typing import SupportsIndex
+from typing import TypeVar
+from typing import overload
+
+from .protocols import DequeLike
+from .protocols import SupportsWrite
+from .stringdatadeque import DEFAULT_RENDER_CHUNK_SIZE
+from .stringdatadeque import nobeartype
+from .stringdatadeque import search_rendered
+from .typecheck import typechecked
+from .vectorio import SupportsFileno
+from .vectorio import interleave
+from .vectorio import nbytes
+from .vectorio import writev_all
+
+T = TypeVar("T")
+
+
+def _check_buffer(item: object) -> Buffer:
+    """Ensure item supports the buffer protocol with C-contiguous memory.
+
+    Joining, slice assignment and vectored writes all need contiguous buffers,
+    so strided views (e.g. ``memoryview(data)[::2]``) are rejected up front.
+
+    :param item: The object to check.
+    :type item: object
+
+    :return: The unchanged item.
+    :rtype: Buffer
+
+    :raises TypeError: If item is not a buffer or is not C-contiguous.
+    """
+    if type(item) is bytes or type(item) is bytearray:
+        return item
+    if not isinstance(item, Buffer):
+        msg = f"a bytes-like object is required, not {type(item).__qualname__!r}"
+        raise TypeError(msg)
+    with memoryview(item) as view:
+        if not view.c_contiguous:
+            msg = "a C-contiguous buffer is required, copy it with bytes() first"
+            raise TypeError(msg)
+    return item
+
+
+@typechecked
+class BytesDataDeque:
+    """A deque of bytes-like fragments that can be rendered as ``bytes``.
+
+    Elements are any objects supporting the buffer protocol (``bytes``,
+    ``bytearray``, ``memoryview``, ``array.array``, ...). They are stored as-is,
+    without copying, so mutable buffers must not be changed while stored.
+    ``bytes(deque)`` joins them with ``sep`` in a single ``bytes.join`` and
+    :meth:`render_into` writes them into a caller supplied buffer.
+
+    :param data: The data to be stored in the deque.
+    :type data: Iterable[Buffer] | Buffer | None
+    :param sep: The separator placed between elements, defaults to b''
+    :type sep: bytes
+    :param storage: Factory for the container holding the elements,
+        defaults to collections.deque
+    :type storage: Callable[[], DequeLike[Buffer]]
+    """
+
+    __slots__ = ("_data", "sep")
+
+    def __init__(
+        self,
+        data: Iterable[Buffer] | Buffer | None = None,
+        sep: bytes = b"",
+        storage: Callable[[], DequeLike[Buffer]] = deque,
+    ) -> None:
+        """Initialize the BytesDataDeque.
+
+        :param data: Initial data, a single buffer or an iterable of buffers.
+        :type data: Iterable[Buffer] | Buffer | None
+
+        :param sep: The separator placed between elements.
+        :type sep: bytes
+
+        :param storage: Factory for the container holding the elements.
+        :type storage: Callable[[], DequeLike[Buffer]]
+
+        :return: None
+        :rtype: None
+        """
+        self._data: DequeLike[Buffer] = storage()
+        self.sep = sep
+        if data is not None:
+            self.insert(data)
+
+    @nobeartype
+    def __bytes__(self) -> bytes:
+        """Return the elements joined by sep.
+
+        :return: The rendered bytes.
+        :rtype: bytes
+        """
+        return self.sep.join(self._data)
+
+    @property
+    def nbytes(self) -> int:
+        """Size in bytes of the rendered output.
+
+        :return: The number of bytes ``bytes(self)`` would produce.
+        :rtype: int
+        """
+        count = len(self._data)
+        return sum(map(nbytes, self._data)) + max(count - 1, 0) * len(self.sep)
+
+    def render_into(self, target: Buffer, offset: int = 0) -> int:
+        """Write the rendered output into a preallocated writable buffer.
+
+        Each element is copied exactly once, straight into ``target``. Size the
+        buffer with :attr:`nbytes`, e.g. ``bytearray(deque.nbytes)``.
+
+        :param target: A writable buffer such as a bytearray.
+        :type target: Buffer
+        :param offset: Position in target to start writing at, defaults to 0
+        :type offset: int
+
+        :return: The number of bytes written.
+        :rtype: int
+
+        :raises TypeError: If target is read-only.
+        :raises ValueError: If target is too small.
+        """
+        with memoryview(target) as raw, raw.cast("B") as view:
+            if view.readonly:
+                msg = "render_into requires a writable buffer"
+                raise TypeError(msg)
+            if offset < 0 or offset + self.nbytes > view.nbytes:
+                msg = "target buffer is too small"
+                raise ValueError(msg)
+            sep = self.sep
+            sep_len = len(sep)
+            pos = offset
+            first = True
+            for item in self._data:
+                if first:
+                    first = False
+                elif sep_len:
+                    view[pos : pos + sep_len] = sep
+                    pos += sep_len
+                with memoryview(item) as item_raw, item_raw.cast("B") as chunk:
+                    view[pos : pos + chunk.nbytes] = chunk
+                    pos += chunk.nbytes
+        return pos - offset
+
+    def iter_chunks(
+        self,
+        chunk_size: int = DEFAULT_RENDER_CHUNK_SIZE,
+        sep: bytes | None = None,
+    ) -> Iterator[bytes]:
+        """Yield the rendered output in pieces of at most ``chunk_size`` bytes.
+
+        :param chunk_size: Maximum number of bytes per piece,
+            defaults to DEFAULT_RENDER_CHUNK_SIZE
+        :type chunk_size: int
+        :param sep: Separator override, defaults to None (use self.sep)
+        :type sep: bytes | None
+
+        :return: An iterator over the pieces.
+        :rtype: Iterator[bytes]
+
+        :raises ValueError: If chunk_size is not positive.
+        """
+        if chunk_size <= 0:
+            msg = "chunk_size must be positive"
+            raise ValueError(msg)
+        return self._iter_rendered(self.sep if sep is None else sep, chunk_size)
+
+    def _iter_rendered(self, sep: bytes, chunk_size: int) -> Iterator[bytes]:
+        """Yield the sep-joined output in pieces of at most ``chunk_size`` bytes.
+
+        :param sep: The separator placed between elements.
+        :type sep: bytes
+        :param chunk_size: Maximum number of bytes per piece.
+        :type chunk_size: int
+
+        :return: An iterator over the pieces.
+        :rtype: Iterator[bytes]
+        """
+        buffer: list[Buffer] = []
+        size = 0
+        first = True
+        for item in self._data:
+            if first:
+                first = False
+            elif sep:
+                buffer.append(sep)
+                size += len(sep)
+            buffer.append(item)
+            size += nbytes(item)
+            if size >= chunk_size:
+                joined = b"".join(buffer)
+                end = size - size % chunk_size
+                for start in range(0, end, chunk_size):
+                    yield joined[start : start + chunk_size]
+                rest = joined[end:]
+                buffer = [rest]
+                size = len(rest)
+        if size:
+            yield b"".join(buffer)
+
+    def write_to(
+        self,
+        file: SupportsWrite,
+        chunk_size: int = DEFAULT_RENDER_CHUNK_SIZE,
+        sep: bytes | None = None,
+    ) -> int:
+        """Stream the rendered output into a binary writable.
+
+        :param file: The writable to send the output to.
+        :type file: SupportsWrite
+        :param chunk_size: Maximum number of bytes per write,
+            defaults to DEFAULT_RENDER_CHUNK_SIZE
+        :type chunk_size: int
+        :param sep: Separator override, defaults to None (use self.sep)
+        :type sep: bytes | None
+
+        :return: The number of bytes written.
+        :rtype: int
+        """
+        written = 0
+        for chunk in self.iter_chunks(chunk_size, sep):
+            file.write(chunk)
+            written += len(chunk)
+        return written
+
+    def flush_to(
+        self,
+        target: int | socket.socket | SupportsFileno,
+        clear: bool = False,
+    ) -> int:
+        """Write the elements and separators to a descriptor or socket in one pass.
+
+        The stored buffers are passed directly to ``os.writev``/``socket.sendmsg``
+        (see :func:`~stringdatadeque.vectorio.writev_all`), so nothing is joined or
+        copied in Python.
+
+        A non-blocking target, or a socket with a timeout, may stop partway: the
+        BlockingIOError or TimeoutError carries the bytes already written in
+        ``characters_written`` and no element is removed, even with ``clear``.
+
+        :param target: A file descriptor, socket or object with ``fileno()``.
+        :type target: int | socket.socket | SupportsFileno
+        :param clear: Remove all elements after a successful write,
+            defaults to False
+        :type clear: bool
+
+        :return: The number of bytes written.
+        :rtype: int
+
+        :raises BlockingIOError: If a non-blocking target would block.
+        :raises TimeoutError: If a target with a timeout timed out.
+        """
+        written = writev_all(target, interleave(self._data, self.sep))
+        if clear:
+            self.clear()
+        return written
+
+    def __contains__(self, key: Buffer) -> bool:
+        """Return true if key is an element or occurs in the rendered bytes.
+
+        The rendered output is searched piece by piece with a ``len(key) - 1`` byte
+        overlap between pieces, so the joined bytes are never built.
+
+        :param key: The bytes to look for.
+        :type key: Buffer
+
+        :return: True if key is found, False otherwise.
+        :rtype: bool
+
+        :raises TypeError: If key is not a buffer, even with type checking off;
+            ``bytes(3)`` would otherwise search for three NUL bytes.
+        """
+        # memoryview rejects ints, unlike bytes()
+        needle = memoryview(key).tobytes()
+        if key in self._data:
+            return True
+        return search_rendered(partial(self._iter_rendered, self.sep), needle, b"")
+
+    @nobeartype
+    def __add__(self, other: Buffer) -> Self:
+        """Append a buffer.
+
+        :param other: The buffer to append.
+        :type other: Buffer
+
+        :return: This deque.
+        :rtype: Self
+        """
+        self._data.append(_check_buffer(other))
+        return self
+
+    @nobeartype
+    def __radd__(self, other: Buffer) -> Self:
+        """Append a buffer (right add).
+
+        :param other: The buffer to append.
+        :type other: Buffer
+
+        :return: This deque.
+        :rtype: Self
+        """
+        self._data.append(_check_buffer(other))
+        return self
+
+    @nobeartype
+    def __iadd__(self, other: Buffer) -> Self:
+        """Append a buffer in place.
+
+        :param other: The buffer to append.
+        :type other: Buffer
+
+        :return: This deque.
+        :rtype: Self
+        """
+        self._data.append(_check_buffer(other))
+        return self
+
+    @nobeartype
+    def __ror__(self, other: Iterable[Buffer]) -> Self:
+        """Extend the deque with an iterable of buffers (right or).
+
+        :param other: The buffers to append.
+        :type other: Iterable[Buffer]
+
+        :return: This deque.
+        :rtype: Self
+        """
+        self._data.extend(map(_check_buffer, other))
+        return self
+
+    @nobeartype
+    def __ior__(self, other: Iterable[Buffer]) -> Self:
+        """Extend the deque with an iterable of buffers in place.
+
+        :param other: The buffers to append.
+        :type other: Iterable[Buffer]
+
+        :return: This deque.
+        :rtype: Self
+        """
+        self._data.extend(map(_check_buffer, other))
+        return self
+
+    @nobeartype
+    def __len__(self) -> int:
+        """Return the number of elements.
+
+        :return: The number of elements.
+        :rtype: int
+        """
+        return len(self._data)
+
+    @nobeartype
+    def __getitem__(self, key: SupportsIndex) -> Buffer:
+        """Return the element at key, the stored object itself.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+
+        :return: The element.
+        :rtype: Buffer
+        """
+        return self._data[key]
+
+    @nobeartype
+    def __setitem__(self, key: SupportsIndex, value: Buffer) -> None:
+        """Replace the element at key.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+        :param value: The new element.
+        :type value: Buffer
+        """
+        self._data[key] = _check_buffer(value)
+
+    @overload
+    def insert(
+        self,
+        other: Iterable[T],
+        /,
+        pre_process_func: Callable[[T], Buffer] | None = None,
+    ) -> Self: ...
+
+    @overload
+    def insert(
+        self,
+        other: Buffer,
+        /,
+        pre_process_func: None = None,
+    ) -> Self: ...
+
+    def insert(
+        self,
+        other: Iterable[T] | Buffer,
+        /,
+        pre_process_func: Callable[[T], Buffer] | None = None,
+    ) -> Self:
+        """Insert item(s) into the deque.
+
+        A single buffer is appended as one element; any other iterable is treated as
+        a collection of elements.
+
+        :param other: Item(s) to insert.
+        :param pre_process_func: Function that converts each item to a buffer,
+            defaults to None
+        :return: The BytesDataDeque.
+        """
+        if isinstance(other, Buffer) and pre_process_func is None:
+            self._data.append(_check_buffer(other))
+            return self
+        items: Iterable[T] = (other,) if isinstance(other, Buffer) else other  # type: ignore[assignment]
+        if pre_process_func is not None:
+            self._data.extend(map(_check_buffer, map(pre_process_func, items)))
+        else:
+            self._data.extend(map(_check_buffer, items))
+        return self
+
+    def clear(self) -> None:
+        """Remove all elements.
+
+        :return: None
+        :rtype: None
+        """
+        self._data.clear()
+
+    def draw(self, index: int = -1) -> Buffer:
+        """Remove and return the element at index.
+
+        :param index: The index of the element, defaults to -1 (last element).
+        :type index: int
+
+        :return: The removed element.
+        :rtype: Buffer
+        """
+        ret = self._data[index]
+        del self._data[index]
+        return ret
@@ -0,0 +1,354 @@
+"""AES-EAX encryption and decryption of many records under one session key.
+
+:class:`EaxBatch` produces exactly what ``AES.new(key, AES.MODE_EAX)`` produces
+for each record (a 16 byte nonce and tag, no associated data), so every record is
+independently authenticated and can still be decrypted and verified on its own
+with PyCryptodome. PyCryptodome sets up three CMACs, each with its own cipher,
+for every EAX message; here the mode is assembled from the ECB, CTR and CBC
+primitives instead, so everything that depends only on the key is computed once.
+
+Only 16 byte tags are supported. A record with a truncated tag (PyCryptodome's
+``mac_len`` below 16) fails verification here, exactly as it does in
+:meth:`~stringdatadeque.EncryptedStringDeque.decrypt`, which uses PyCryptodome's
+default ``mac_len``; the two must keep agreeing on what counts as valid.
+"""
+
+import hmac
+from collections.abc import Sequence
+from typing import Final
+
+from Crypto.Cipher import AES  # nosec: B413
+from Crypto.Hash import CMAC  # nosec: B413
+from Crypto.Random import get_random_bytes  # nosec: B413
+
+from .typecheck import typechecked
+
+BLOCK: Final = 16
+_MASK: Final = (1 << 128) - 1
+# reduction constant of GF(2^128), used to derive the CMAC subkeys
+_RB: Final = 0x87
+# records of up to this many blocks are encrypted in lockstep: one ECB call per
+# block position for the whole batch instead of a CTR and a CBC cipher per record
+LOCKSTEP_BLOCKS: Final = 16
+
+
+def _double(value: int) -> int:
+    """Multiply value by x in GF(2^128).
+
+    :param value: A 128 bit block as an integer.
+    :type value: int
+
+    :return: The doubled block.
+    :rtype: int
+    """
+    value <<= 1
+    if value >> 128:
+        value = (value & _MASK) ^ _RB
+    return value
+
+
+@typechecked
+class EaxBatch:
+    """Encrypt and decrypt records with AES-EAX, sharing the per-key setup.
+
+    :param key: The AES session key.
+    :type key: bytes
+    """
+
+    __slots__ = (
+        "_ct_iv",
+        "_ecb",
+        "_empty_ct_mac",
+        "_header_mac",
+        "_k1",
+        "_k2",
+        "_key",
+        "_nonce_mask",
+    )
+
+    def __init__(self, key: bytes) -> None:
+        """Derive the CMAC subkeys and the key-only parts of EAX.
+
+        EAX uses ``OMAC^t(M) = CMAC(key, [t] || M)`` for the nonce (t=0), the
+        header (t=1) and the ciphertext (t=2). ``[t]`` is a whole block, so the
+        CMAC state after it only depends on the key.
+
+        :param key: The AES session key.
+        :type key: bytes
+
+        :return: None
+        :rtype: None
+        """
+        self._key = key
+        self._ecb = AES.new(key, AES.MODE_ECB)  # pyright: ignore[reportUnknownMemberType]
+        prefix = [self._encrypt_block(t) for t in range(3)]
+        self._k1 = _double(prefix[0])  # [0] is the zero block, so prefix[0] is L
+        self._k2 = _double(self._k1)
+        # a one block nonce is the last CMAC block: E(E([0]) ^ nonce ^ K1)
+        self._nonce_mask = (prefix[0] ^ self._k1).to_bytes(BLOCK)
+        # no header is ever passed, OMAC^1 of the empty string
+        self._header_mac = self._encrypt_block(1 ^ self._k1)
+        self._empty_ct_mac = self._encrypt_block(2 ^ self._k1)
+        self._ct_iv = prefix[2].to_bytes(BLOCK)
+
+    @property
+    def key(self) -> bytes:
+        """The AES session key.
+
+        :return: The key.
+        :rtype: bytes
+        """
+        return self._key
+
+    def _encrypt_block(self, block: int) -> int:
+        """Encrypt a single block with the raw cipher.
+
+        :param block: The block as an integer.
+        :type block: int
+
+        :return: The encrypted block as an integer.
+        :rtype: int
+        """
+        return int.from_bytes(self._ecb.encrypt(block.to_bytes(BLOCK)))
+
+    def _cmac_blocks(self, ciphertext: bytes) -> bytes:
+        """Pad ciphertext to whole blocks and mask its last block for CMAC.
+
+        :param ciphertext: The encrypted record.
+        :type ciphertext: bytes
+
+        :return: The blocks to chain, empty for an empty ciphertext.
+        :rtype: bytes
+        """
+        if not ciphertext:
+            return ciphertext
+        partial = len(ciphertext) % BLOCK
+        if partial:
+            ciphertext += b"\x80" + bytes(BLOCK - 1 - partial)
+            subkey = self._k2
+        else:
+            subkey = self._k1
+        last = (int.from_bytes(ciphertext[-BLOCK:]) ^ subkey).to_bytes(BLOCK)
+        return ciphertext[:-BLOCK] + last
+
+    def _ciphertext_mac(self, ciphertext: bytes) -> int:
+        """Return OMAC^2 of a ciphertext.
+
+        :param ciphertext: The encrypted record.
+        :type ciphertext: bytes
+
+        :return: The MAC as an integer.
+        :rtype: int
+        """
+        blocks = self._cmac_blocks(ciphertext)
+        if not blocks:
+            return self._empty_ct_mac
+        cipher = AES.new(self._key, AES.MODE_CBC, iv=self._ct_iv)  # pyright: ignore[reportUnknownMemberType]
+        return int.from_bytes(cipher.encrypt(blocks)[-BLOCK:])
+
+    def _ctr_lockstep(
+        self, counters: Sequence[int], plaintexts: Sequence[bytes]
+    ) -> list[bytes]:
+        """CTR-encrypt short records with one keystream call for all of them.
+
+        :param counters: The initial counter of each record.
+        :type counters: Sequence[int]
+
+        :param plaintexts: The records to encrypt.
+        :type plaintexts: Sequence[bytes]
+
+        :return: The ciphertexts, in order.
+        :rtype: list[bytes]
+        """
+        blocks = [-(-len(plaintext) // BLOCK) for plaintext in plaintexts]
+        stream = self._ecb.encrypt(
+            b"".join(
+                ((counter + step) & _MASK).to_bytes(BLOCK)
+                for counter, count in zip(counters, blocks, strict=True)
+                for step in range(count)
+            ),
+        )
+        ciphertexts = []
+        position = 0
+        for plaintext, count in zip(plaintexts, blocks, strict=True):
+            size = len(plaintext)
+            keystream = int.from_bytes(stream[position : position + size])
+            ciphertexts.append((int.from_bytes(plaintext) ^ keystream).to_bytes(size))
+            position += count * BLOCK
+        return ciphertexts
+
+    def _mac_lockstep(self, ciphertexts: Sequence[bytes]) -> list[int]:
+        """Return OMAC^2 of short ciphertexts, one ECB call per block position.
+
+        Every CBC chain advances one block per call; records are sorted longest
+        first so the chains still running are always a prefix.
+
+        :param ciphertexts: The encrypted records.
+        :type ciphertexts: Sequence[bytes]
+
+        :return: The MAC of each ciphertext as an integer, in order.
+        :rtype: list[int]
+        """
+        padded = [self._cmac_blocks(ciphertext) for ciphertext in ciphertexts]
+        state = [int.from_bytes(self._ct_iv)] * len(padded)
+        active = sorted(
+            range(len(padded)), key=lambda index: len(padded[index]), reverse=True
+        )
+        offset = 0
+        while True:
+            while active and len(padded[active[-1]]) <= offset:
+                active.pop()
+            if not active:
+                break
+            chained = self._ecb.encrypt(
+                b"".join(
+                    (
+                        state[index]
+                        ^ int.from_bytes(padded[index][offset : offset + BLOCK])
+                    ).to_bytes(BLOCK)
+                    for index in active
+                ),
+            )
+            for position, index in enumerate(active):
+                start = position * BLOCK
+                state[index] = int.from_bytes(chained[start : start + BLOCK])
+            offset += BLOCK
+        return [
+            mac if blocks else self._empty_ct_mac
+            for mac, blocks in zip(state, padded, strict=True)
+        ]
+
+    def _counters(self, nonces: Sequence[bytes]) -> list[int]:
+        """Return OMAC^0 of every nonce, each its record's initial CTR counter.
+
+        One block nonces, the only size :meth:`encrypt` produces, are processed
+        in a single ECB call.
+
+        :param nonces: The nonce of each record.
+        :type nonces: Sequence[bytes]
+
+        :raises ValueError: If a nonce is empty.
+
+        :return: The counters, in order.
+        :rtype: list[int]
+        """
+        if all(len(nonce) == BLOCK for nonce in nonces):
+            size = BLOCK * len(nonces)
+            mixed = int.from_bytes(b"".join(nonces)) ^ int.from_bytes(
+                self._nonce_mask * len(nonces),
+            )
+            encrypted = self._ecb.encrypt(mixed.to_bytes(size))
+            return [
+                int.from_bytes(encrypted[start : start + BLOCK])
+                for start in range(0, size, BLOCK)
+            ]
+        if not all(nonces):
+            msg = "Nonce cannot be empty in EAX mode"
+            raise ValueError(msg)
+        return [
+            int.from_bytes(
+                CMAC.new(self._key, bytes(BLOCK) + nonce, ciphermod=AES).digest(),
+            )
+            for nonce in nonces
+        ]
+
+    def _crypt(
+        self,
+        counters: Sequence[int],
+        data: Sequence[bytes],
+        *,
+        encrypting: bool,
+    ) -> tuple[list[bytes], list[int]]:
+        """Apply CTR mode to every record and MAC the ciphertexts.
+
+        Records of up to :data:`LOCKSTEP_BLOCKS` blocks are processed together,
+        a few ECB calls for the whole batch; longer records get their own CTR and
+        CBC cipher.
+
+        :param counters: The initial counter of each record.
+        :type counters: Sequence[int]
+
+        :param data: The plaintexts when encrypting, else the ciphertexts.
+        :type data: Sequence[bytes]
+
+        :param encrypting: Whether data holds plaintexts.
+        :type encrypting: bool
+
+        :return: The transformed records and the OMAC^2 of each ciphertext.
+        :rtype: tuple[list[bytes], list[int]]
+        """
+        count = len(data)
+        limit = LOCKSTEP_BLOCKS * BLOCK
+        short = [i for i, record in enumerate(data) if len(record) <= limit]
+        outputs = [b""] * count
+        macs = [0] * count
+        short_data = [data[i] for i in short]
+        short_outputs = self._ctr_lockstep([counters[i] for i in short], short_data)
+        short_macs = self._mac_lockstep(short_outputs if encrypting else short_data)
+        for i, output, mac in zip(short, short_outputs, short_macs, strict=True):
+            outputs[i] = output
+            macs[i] = mac
+        if len(short) < count:
+            for i in set(range(count)).difference(short):
+                outputs[i] = AES.new(  # pyright: ignore[reportUnknownMemberType]
+                    self._key,
+                    AES.MODE_CTR,
+                    nonce=b"",
+                    initial_value=counters[i].to_bytes(BLOCK),
+                ).encrypt(data[i])
+                macs[i] = self._ciphertext_mac(outputs[i] if encrypting else data[i])
+        return outputs, macs
+
+    def encrypt(self, plaintexts: Sequence[bytes]) -> list[tuple[bytes, bytes, bytes]]:
+        """Encrypt every plaintext under its own fresh random nonce.
+
+        :param plaintexts: The records to encrypt.
+        :type plaintexts: Sequence[bytes]
+
+        :return: A ``(nonce, tag, ciphertext)`` tuple per record, in order.
+        :rtype: list[tuple[bytes, bytes, bytes]]
+        """
+        count = len(plaintexts)
+        if not count:
+            return []
+        nonces = get_random_bytes(BLOCK * count)
+        split = [
+            nonces[start : start + BLOCK] for start in range(0, len(nonces), BLOCK)
+        ]
+        counters = self._counters(split)
+        ciphertexts, macs = self._crypt(counters, plaintexts, encrypting=True)
+        return [
+            (nonce, (counter ^ self._header_mac ^ mac).to_bytes(BLOCK), ciphertext)
+            for nonce, counter, mac, ciphertext in zip(
+                split, counters, macs, ciphertexts, strict=True
+            )
+        ]
+
+    def decrypt(
+        self, records: Sequence[tuple[bytes, bytes, bytes]]
+    ) -> list[bytes | None]:
+        """Decrypt and verify every record independently.
+
+        :param records: A ``(nonce, tag, ciphertext)`` tuple per record.
+        :type records: Sequence[tuple[bytes, bytes, bytes]]
+
+        :raises ValueError: If a nonce is empty.
+
+        :return: The plaintext of each record, in order, or None for a record
+            whose tag does not verify.
+        :rtype: list[bytes | None]
+        """
+        if not records:
+            return []
+        nonces, tags, ciphertexts = zip(*records, strict=True)
+        counters = self._counters(nonces)
+        plaintexts, macs = self._crypt(counters, ciphertexts, encrypting=False)
+        header_mac = self._header_mac
+        return [
+            plaintext
+            if hmac.compare_digest((counter ^ header_mac ^ mac).to_bytes(BLOCK), tag)
+            else None
+            for plaintext, counter, mac, tag in zip(
+                plaintexts, counters, macs, tags, strict=True
+            )
+        ]
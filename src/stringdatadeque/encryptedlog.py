@@ -0,0 +1,740 @@
+"""Append-only on-disk log of encrypted records.
+
+The records of an :class:`~stringdatadeque.EncryptedStringDeque` are stored in a
+compact, length-prefixed binary file instead of the ``str`` of every
+:class:`~stringdatadeque.RSAMessage`. All integers are little endian::
+
+    header  MAGIC | wrapped key length (u16) | RSA-wrapped session key
+    frame   ciphertext length (u32) | nonce (16 bytes) | tag (16 bytes) | ciphertext
+
+A log has a single session key, wrapped once in the header; every frame is an
+independent AES-EAX message under it. Next to the log, ``<name>.idx`` holds the
+index interval (u32) and the byte offset (u64) of every ``interval``-th frame. A
+reader seeks to the indexed frame at or before record N and skips the rest by
+their headers alone. The index only speeds up seeking: a missing or stale one is
+rebuilt from the frame headers, and a frame cut short by a crash is ignored by
+readers and truncated by the next writer. A writer refuses to open a log whose
+last readable frame authenticates with a shorter length than it states: that is
+a damaged length field hiding complete records, not a torn tail.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import groupby
+from itertools import islice
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO
+from typing import Final
+from typing import Self
+from typing import SupportsIndex
+
+from Crypto.Cipher import PKCS1_OAEP  # nosec: B413
+from Crypto.PublicKey import RSA  # nosec: B413
+from Crypto.Random import get_random_bytes  # nosec: B413
+
+from .eax import BLOCK
+from .eax import EaxBatch
+from .encryptedstringdeque import DEFAULT_DECRYPT_CHUNK
+from .encryptedstringdeque import EncryptedStringDeque
+from .encryptedstringdeque import RawMessage
+from .encryptedstringdeque import RSADecryptor
+from .encryptedstringdeque import RSAMessage
+from .encryptedstringdeque import _b64
+from .encryptedstringdeque import _iter_raw
+from .protocols import Builtin_or_DefinesDunderStr
+from .typecheck import typechecked
+
+MAGIC: Final = b"SDDQLOG\x01"
+INDEX_MAGIC: Final = b"SDDQIDX\x01"
+# records between two entries of the sparse index
+DEFAULT_INDEX_INTERVAL: Final = 1024
+
+_HEADER: Final = struct.Struct("<8sH")
+_FRAME: Final = struct.Struct("<I16s16s")
+_LENGTH: Final = struct.Struct("<I")
+_INDEX_HEADER: Final = struct.Struct("<8sI")
+
+
+def _index_path(path: Path) -> Path:
+    """Return the path of the sparse index of a log.
+
+    :param path: The log file.
+    :type path: Path
+
+    :return: The index file next to it.
+    :rtype: Path
+    """
+    return path.with_name(f"{path.name}.idx")
+
+
+def _offsets_bytes(offsets: Iterable[int]) -> bytes:
+    """Encode frame offsets as little endian u64 values.
+
+    :param offsets: The offsets to encode.
+    :type offsets: Iterable[int]
+
+    :return: The encoded offsets.
+    :rtype: bytes
+    """
+    encoded = array("Q", offsets)
+    if sys.byteorder == "big":  # pragma: no cover - platform dependent
+        encoded.byteswap()
+    return encoded.tobytes()
+
+
+def _read_index(path: Path) -> tuple[int, array[int]]:
+    """Read the sparse index of a log.
+
+    :param path: The log file.
+    :type path: Path
+
+    :return: The index interval, 0 if there is no usable index, and the frame
+        offsets.
+    :rtype: tuple[int, array[int]]
+    """
+    offsets = array("Q")
+    try:
+        data = _index_path(path).read_bytes()
+    except FileNotFoundError:
+        return 0, offsets
+    if len(data) < _INDEX_HEADER.size:
+        return 0, offsets
+    magic, interval = _INDEX_HEADER.unpack_from(data)
+    if magic != INDEX_MAGIC:
+        return 0, offsets
+    body = data[_INDEX_HEADER.size :]
+    # an entry cut short by a crash is dropped
+    offsets.frombytes(body[: len(body) - len(body) % offsets.itemsize])
+    if sys.byteorder == "big":  # pragma: no cover - platform dependent
+        offsets.byteswap()
+    return interval, offsets
+
+
+def _read_header(file: BinaryIO) -> bytes:
+    """Read the header of a log, leaving the file at its first frame.
+
+    :param file: The log, opened in binary mode.
+    :type file: BinaryIO
+
+    :raises ValueError: If the file does not start with a log header.
+
+    :return: The RSA-wrapped session key.
+    :rtype: bytes
+    """
+    file.seek(0)
+    header = file.read(_HEADER.size)
+    if len(header) == _HEADER.size:
+        magic, size = _HEADER.unpack(header)
+        wrapped = file.read(size)
+        if magic == MAGIC and size and len(wrapped) == size:
+            return wrapped
+    msg = f"{file.name} is not an encrypted log"
+    raise ValueError(msg)
+
+
+class _Log:
+    """The header, frame count and sparse index shared by readers and writers."""
+
+    __slots__ = (
+        "_end",
+        "_file",
+        "_interval",
+        "_offsets",
+        "_records",
+        "_start",
+        "_wrapped",
+        "path",
+    )
+
+    _file: BinaryIO
+    path: Path
+
+    def _load(self, interval: int | None) -> None:
+        """Read the header and index, then count the frames after the index.
+
+        Index entries that do not point inside the log are dropped, and the
+        index is rebuilt when it belongs to another interval.
+
+        :param interval: The index interval wanted, None for the stored one.
+        :type interval: int | None
+        """
+        file = self._file
+        self._wrapped = _read_header(file)
+        self._start = file.tell()
+        size = file.seek(0, os.SEEK_END)
+        stored, offsets = _read_index(self.path)
+        if interval is None:
+            interval = stored or DEFAULT_INDEX_INTERVAL
+        if stored != interval or not offsets or offsets[0] != self._start:
+            offsets = array("Q")
+        keep = 1
+        while keep < len(offsets) and offsets[keep - 1] < offsets[keep] < size:
+            keep += 1
+        del offsets[keep:]
+        self._interval = interval
+        self._offsets = offsets
+        self._records = 0
+        self._end = self._start
+        self._scan(size)
+
+    def _scan(self, size: int) -> None:
+        """Walk the frame headers from the last indexed frame to the end.
+
+        Only the headers are read. Every ``interval``-th frame is added to the
+        index; a trailing frame cut short is left out.
+
+        :param size: The size of the file.
+        :type size: int
+        """
+        file = self._file
+        offsets = self._offsets
+        offset = offsets.pop() if offsets else self._start
+        record = len(offsets) * self._interval
+        while offset + _FRAME.size <= size:
+            file.seek(offset)
+            (length,) = _LENGTH.unpack(file.read(_LENGTH.size))
+            end = offset + _FRAME.size + length
+            if end > size:
+                break
+            if not record % self._interval:
+                offsets.append(offset)
+            offset = end
+            record += 1
+        self._records = record
+        self._end = offset
+
+    def _frame_offset(self, index: int) -> int:
+        """Return the byte offset of a frame, seeking from the nearest index entry.
+
+        :param index: The record number, at most the number of records.
+        :type index: int
+
+        :return: The offset of the frame, the end of the log for ``len(self)``.
+        :rtype: int
+        """
+        if index == self._records:
+            return self._end
+        slot = index // self._interval
+        offset = self._offsets[slot]
+        file = self._file
+        for _ in range(index - slot * self._interval):
+            file.seek(offset)
+            (length,) = _LENGTH.unpack(file.read(_LENGTH.size))
+            offset += _FRAME.size + length
+        return offset
+
+    @property
+    def enc_session_key(self) -> bytes:
+        """The RSA-wrapped session key of the log.
+
+        :return: The wrapped session key.
+        :rtype: bytes
+        """
+        return self._wrapped
+
+    @property
+    def index_interval(self) -> int:
+        """The number of records between two entries of the sparse index.
+
+        :return: The index interval.
+        :rtype: int
+        """
+        return self._interval
+
+    def __len__(self) -> int:
+        """Return the number of complete records.
+
+        :return: The number of records.
+        :rtype: int
+        """
+        return self._records
+
+    def close(self) -> None:
+        """Close the log."""
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        """Return the log itself.
+
+        :return: The log.
+        :rtype: Self
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the log.
+
+        :param exc_type: The exception type, if any.
+        :type exc_type: type[BaseException] | None
+        :param exc_value: The exception, if any.
+        :type exc_value: BaseException | None
+        :param traceback: The traceback, if any.
+        :type traceback: TracebackType | None
+        """
+        self.close()
+
+
+@typechecked
+class EncryptedLogWriter(_Log):
+    """Append records to an encrypted log.
+
+    A new log gets a fresh session key, wrapped with ``key``. An existing log is
+    continued: its session key is unwrapped with ``key``, which must then be
+    the private key, and a frame cut short by a crash is truncated. A log with
+    a damaged frame length is left alone and raises ValueError instead.
+
+    Frames are buffered; :meth:`flush` or :meth:`close` writes them out.
+
+    :param path: The log file.
+    :type path: str | os.PathLike[str]
+    :param key: The public key for a new log, the private key to continue one.
+    :type key: RSA.RsaKey
+    :param index_interval: Records between two entries of the sparse index.
+    :type index_interval: int
+    """
+
+    __slots__ = ("_b64_key", "_batch", "_index_file")
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        key: RSA.RsaKey,
+        index_interval: int = DEFAULT_INDEX_INTERVAL,
+    ) -> None:
+        """Open or create the log.
+
+        :param path: The log file.
+        :type path: str | os.PathLike[str]
+
+        :param key: The public key for a new log, the private key to continue
+            an existing one.
+        :type key: RSA.RsaKey
+
+        :param index_interval: Records between two entries of the sparse index.
+            Defaults to DEFAULT_INDEX_INTERVAL.
+        :type index_interval: int
+
+        :raises ValueError: If index_interval is less than 1, or the file is
+            not a log or its session key cannot be unwrapped with key.
+        :raises TypeError: If the log exists and key is not a private key.
+
+        :return: None
+        :rtype: None
+        """
+        path = Path(path)
+        cipher_rsa = PKCS1_OAEP.new(key)
+        if path.exists() and path.stat().st_size:
+            with path.open("rb") as file:
+                session_key = cipher_rsa.decrypt(_read_header(file))
+            self._open(path, EaxBatch(session_key), None, index_interval)
+        else:
+            session_key = get_random_bytes(16)
+            wrapped = cipher_rsa.encrypt(session_key)
+            self._open(path, EaxBatch(session_key), wrapped, index_interval)
+
+    @classmethod
+    def from_deque(
+        cls,
+        path: str | os.PathLike[str],
+        esd: EncryptedStringDeque,
+        index_interval: int = DEFAULT_INDEX_INTERVAL,
+    ) -> Self:
+        """Start a new log with the session key of a deque and write its records.
+
+        The records are copied as they are, without decrypting them. Later
+        appends are encrypted under the same session key.
+
+        :param path: The log file, which must not exist yet or be empty.
+        :type path: str | os.PathLike[str]
+
+        :param esd: The deque to write.
+        :type esd: EncryptedStringDeque
+
+        :param index_interval: Records between two entries of the sparse index.
+            Defaults to DEFAULT_INDEX_INTERVAL.
+        :type index_interval: int
+
+        :raises FileExistsError: If the log already holds data.
+        :raises ValueError: If a record is encrypted under another session key.
+
+        :return: The writer, positioned after the deque's records.
+        :rtype: Self
+        """
+        path = Path(path)
+        if path.exists() and path.stat().st_size:
+            msg = f"{path} already exists"
+            raise FileExistsError(msg)
+        esd.insert_batch(())  # create the session key of an empty deque
+        batch, _ = esd._session  # type: ignore[misc]  # noqa: SLF001
+        writer = cls.__new__(cls)
+        writer._open(path, batch, esd.enc_session_key, index_interval)  # noqa: SLF001
+        try:
+            writer.append_messages(esd)
+        except:
+            writer.close()
+            raise
+        return writer
+
+    def _open(
+        self,
+        path: Path,
+        batch: EaxBatch,
+        wrapped: bytes | None,
+        index_interval: int,
+    ) -> None:
+        """Create or reopen the log and rewrite its sparse index.
+
+        :param path: The log file.
+        :type path: Path
+
+        :param batch: The cipher of the session key.
+        :type batch: EaxBatch
+
+        :param wrapped: The wrapped session key of a new log, None to continue
+            the existing one.
+        :type wrapped: bytes | None
+
+        :param index_interval: Records between two entries of the sparse index.
+        :type index_interval: int
+
+        :raises ValueError: If index_interval is less than 1, or a frame length
+            in the log is damaged.
+        """
+        if index_interval < 1:
+            msg = "index_interval must be at least 1"
+            raise ValueError(msg)
+        if wrapped is not None:
+            with path.open("wb") as file:
+                file.write(_HEADER.pack(MAGIC, len(wrapped)) + wrapped)
+        self.path = path
+        self._batch = batch
+        self._file = path.open("r+b")
+        try:
+            self._load(index_interval)
+            self._check_tail(self._file.seek(0, os.SEEK_END))
+            self._file.truncate(self._end)
+            self._file.seek(self._end)
+            self._index_file = _index_path(path).open("wb")
+        except:
+            self._file.close()
+            raise
+        self._b64_key = _b64(self._wrapped)
+        self._index_file.write(
+            _INDEX_HEADER.pack(INDEX_MAGIC, index_interval)
+            + _offsets_bytes(self._offsets),
+        )
+
+    def _check_tail(self, size: int) -> None:
+        """Make sure the bytes after the last complete frame are a torn frame.
+
+        A crash while appending leaves the start of one frame, which never
+        authenticates. A damaged length field instead makes a complete frame
+        look like it runs past the end of the file. Every shorter length that is
+        followed by the end of the file, or by a frame header whose length fits,
+        is tried with the session key.
+
+        :param size: The size of the file.
+        :type size: int
+
+        :raises ValueError: If the frame authenticates with a shorter length
+            than it states.
+        """
+        start = self._end
+        if size - start < _FRAME.size:
+            return
+        file = self._file
+        file.seek(start)
+        stated, nonce, tag = _FRAME.unpack(file.read(_FRAME.size))
+        body = file.read(size - start - _FRAME.size)
+        remaining = len(body)
+        for length in range(remaining + 1):
+            if length < remaining:
+                if length + _FRAME.size > remaining:
+                    continue
+                (following,) = _LENGTH.unpack_from(body, length)
+                if length + _FRAME.size + following > remaining:
+                    continue
+            if self._batch.decrypt([(nonce, tag, body[:length])])[0] is not None:
+                msg = (
+                    f"the frame at offset {start} states {stated} bytes but"
+                    f" authenticates with {length}; its length field is damaged,"
+                    " the log was left unchanged"
+                )
+                raise ValueError(msg)
+
+    def _write(
+        self, enc_session_key: str, records: list[tuple[bytes, bytes, bytes]]
+    ) -> None:
+        """Append encrypted records as frames.
+
+        :param enc_session_key: The wrapped session key, base64 encoded.
+        :type enc_session_key: str
+
+        :param records: A ``(nonce, tag, ciphertext)`` tuple per record.
+        :type records: list[tuple[bytes, bytes, bytes]]
+
+        :raises ValueError: If the records belong to another session key, or a
+            nonce or tag is not 16 bytes.
+        """
+        if enc_session_key != self._b64_key:
+            msg = "message is encrypted under another session key than the log"
+            raise ValueError(msg)
+        if any(len(nonce) != BLOCK or len(tag) != BLOCK for nonce, tag, _ in records):
+            msg = "an encrypted log only stores 16 byte nonces and tags"
+            raise ValueError(msg)
+        frames: list[bytes] = []
+        indexed: list[int] = []
+        offset = self._end
+        record = self._records
+        for nonce, tag, ciphertext in records:
+            if not record % self._interval:
+                indexed.append(offset)
+            frames.append(_FRAME.pack(len(ciphertext), nonce, tag))
+            frames.append(ciphertext)
+            offset += _FRAME.size + len(ciphertext)
+            record += 1
+        self._file.write(b"".join(frames))
+        self._end = offset
+        self._records = record
+        if indexed:
+            self._offsets.extend(indexed)
+            self._index_file.write(_offsets_bytes(indexed))
+
+    def append(self, item: Builtin_or_DefinesDunderStr) -> None:
+        """Encrypt an item and append it.
+
+        :param item: The item to append.
+        :type item: Builtin_or_DefinesDunderStr
+        """
+        self.extend((item,))
+
+    def extend(self, items: Iterable[Builtin_or_DefinesDunderStr]) -> None:
+        """Encrypt items in one batch and append them.
+
+        :param items: The items to append.
+        :type items: Iterable[Builtin_or_DefinesDunderStr]
+        """
+        records = self._batch.encrypt([str(item).encode("utf-8") for item in items])
+        self._write(self._b64_key, records)
+
+    def append_messages(
+        self, msgs: Iterable[RSAMessage] | EncryptedStringDeque
+    ) -> None:
+        """Append messages that are already encrypted, as they are.
+
+        :param msgs: The messages, or a deque whose messages to append.
+        :type msgs: Iterable[RSAMessage] | EncryptedStringDeque
+
+        :raises ValueError: If a message is encrypted under another session key
+            than the log, or its nonce or tag is not 16 bytes.
+        """
+        raw = (
+            _iter_raw(msgs)
+            if isinstance(msgs, EncryptedStringDeque)
+            else (msg._raw() for msg in msgs)  # noqa: SLF001
+        )
+        for enc_session_key, run in groupby(raw, key=lambda pair: pair[0]):
+            self._write(enc_session_key, [record for _, record in run])
+
+    def flush(self) -> None:
+        """Write buffered frames, then their index entries, to disk."""
+        self._file.flush()
+        self._index_file.flush()
+
+    def close(self) -> None:
+        """Flush and close the log and its index."""
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._index_file.close()
+
+
+@typechecked
+class EncryptedLogReader(_Log):
+    """Read records from an encrypted log without loading it.
+
+    Reading needs no key; :meth:`decrypt` takes an :class:`RSADecryptor`. The
+    reader sees the records complete when it was opened, or when
+    :meth:`refresh` was last called, so a log can be followed while a writer
+    appends to it.
+
+    :param path: The log file.
+    :type path: str | os.PathLike[str]
+    """
+
+    __slots__ = ("_b64_key",)
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open the log and its sparse index.
+
+        :param path: The log file.
+        :type path: str | os.PathLike[str]
+
+        :raises ValueError: If the file is not a log.
+
+        :return: None
+        :rtype: None
+        """
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        try:
+            self._load(None)
+        except:
+            self._file.close()
+            raise
+        self._b64_key = _b64(self._wrapped)
+
+    def refresh(self) -> int:
+        """Pick up the records appended since the log was opened or refreshed.
+
+        :return: The number of records.
+        :rtype: int
+        """
+        self._scan(self._file.seek(0, os.SEEK_END))
+        return self._records
+
+    def iter_raw(self, start: int = 0, stop: int | None = None) -> Iterator[RawMessage]:
+        """Stream the raw fields of records, read from disk one frame at a time.
+
+        ``start`` and ``stop`` are interpreted like a slice.
+
+        :param start: The first record. Defaults to 0.
+        :type start: int
+
+        :param stop: The record to stop before, None for the end.
+        :type stop: int | None
+
+        :return: An iterator of the base64 wrapped session key and
+            ``(nonce, tag, ciphertext)`` tuples.
+        :rtype: Iterator[RawMessage]
+        """
+        start, stop, _ = slice(start, stop).indices(self._records)
+        if start >= stop:
+            return
+        file = self._file
+        key = self._b64_key
+        offset = self._frame_offset(start)
+        for _ in range(start, stop):
+            # seek every time, so interleaved iterators do not disturb each other
+            file.seek(offset)
+            length, nonce, tag = _FRAME.unpack(file.read(_FRAME.size))
+            yield key, (nonce, tag, file.read(length))
+            offset += _FRAME.size + length
+
+    def __getitem__(self, key: SupportsIndex) -> RSAMessage:
+        """Return the message at ``key``.
+
+        :param key: The record number.
+        :type key: SupportsIndex
+
+        :raises IndexError: If the index is out of range.
+
+        :return: The message.
+        :rtype: RSAMessage
+        """
+        index = key.__index__()
+        if index < 0:
+            index += self._records
+        if not 0 <= index < self._records:
+            msg = "log index out of range"
+            raise IndexError(msg)
+        enc_session_key, (nonce, tag, ciphertext) = next(
+            self.iter_raw(index, index + 1),
+        )
+        return RSAMessage._from_base64(  # noqa: SLF001
+            enc_session_key,
+            _b64(nonce),
+            _b64(tag),
+            _b64(ciphertext),
+        )
+
+    def __iter__(self) -> Iterator[RSAMessage]:
+        """Iterate over the messages from first to last.
+
+        :return: An iterator over the messages.
+        :rtype: Iterator[RSAMessage]
+        """
+        for enc_session_key, (nonce, tag, ciphertext) in self.iter_raw():
+            yield RSAMessage._from_base64(  # noqa: SLF001
+                enc_session_key,
+                _b64(nonce),
+                _b64(tag),
+                _b64(ciphertext),
+            )
+
+    def decrypt(
+        self,
+        decryptor: RSADecryptor,
+        start: int = 0,
+        stop: int | None = None,
+        chunk_size: int = DEFAULT_DECRYPT_CHUNK,
+    ) -> Iterator[str]:
+        """Stream decrypted records, reading and decrypting a chunk at a time.
+
+        ``start`` and ``stop`` are interpreted like a slice.
+
+        :param decryptor: The decryptor holding the private key.
+        :type decryptor: RSADecryptor
+
+        :param start: The first record. Defaults to 0.
+        :type start: int
+
+        :param stop: The record to stop before, None for the end.
+        :type stop: int | None
+
+        :param chunk_size: The number of records decrypted per batch.
+            Defaults to DEFAULT_DECRYPT_CHUNK.
+        :type chunk_size: int
+
+        :raises ValueError: If chunk_size is not positive.
+        :raises DecryptionError: While iterating, if a record fails
+            authentication.
+
+        :return: An iterator over the decrypted records.
+        :rtype: Iterator[str]
+        """
+        if chunk_size <= 0:
+            msg = "chunk_size must be positive"
+            raise ValueError(msg)
+        start, stop, _ = slice(start, stop).indices(self._records)
+        return self._decrypt(decryptor, start, stop, chunk_size)
+
+    def _decrypt(
+        self,
+        decryptor: RSADecryptor,
+        start: int,
+        stop: int,
+        chunk_size: int,
+    ) -> Iterator[str]:
+        """Decrypt records start to stop lazily, see :meth:`decrypt`.
+
+        :param decryptor: The decryptor holding the private key.
+        :type decryptor: RSADecryptor
+
+        :param start: The first record.
+        :type start: int
+
+        :param stop: The record to stop before.
+        :type stop: int
+
+        :param chunk_size: The number of records decrypted per batch.
+        :type chunk_size: int
+
+        :return: An iterator over the decrypted records.
+        :rtype: Iterator[str]
+        """
+        raw = self.iter_raw(start, stop)
+        while chunk := list(islice(raw, chunk_size)):
+            yield from decryptor.decrypt_raw(chunk, start)
+            start += len(chunk)
@@ -2,15 +2,26 @@
 
 import base64
 import binascii
+import operator
+from array import array
 from collections import deque
 from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from functools import lru_cache
 from functools import partial
+from itertools import accumulate
+from itertools import chain
+from itertools import groupby
+from itertools import islice
 from typing import Any
 from typing import ClassVar
+from typing import Final
 from typing import Self
+from typing import SupportsIndex
 from typing import cast
 
-from beartype import beartype
 from Crypto.Cipher import AES  # nosec: B413
 from Crypto.Cipher import PKCS1_OAEP  # nosec: B413
 from Crypto.PublicKey import (  # nosec: B413 #false positive as we are using pycryptome
@@ -18,12 +29,71 @@ from Crypto.PublicKey import (  # nosec: B413 #false positive as we are using py
 )
 from Crypto.Random import get_random_bytes  # nosec: B413
 
+from .eax import BLOCK
+from .eax import EaxBatch
+from .parallel import ParallelRender
 from .protocols import Builtin_or_DefinesDunderStr
+from .protocols import DequeLike
 from .protocols import SequenceNonstrOfStr
 from .stringdatadeque import StringDataDeque
+from .typecheck import typechecked
 
+# unwrapped session keys kept by an RSADecryptor; a deque uses a single one
+DEFAULT_SESSION_CACHE_SIZE: Final = 16
+# messages decrypted per batch by RSADecryptor.iter_decrypted
+DEFAULT_DECRYPT_CHUNK: Final = 4096
 
-@beartype
+# the raw fields of a message: base64 wrapped session key, (nonce, tag, ciphertext)
+RawMessage = tuple[str, tuple[bytes, bytes, bytes]]
+
+
+class DecryptionError(ValueError):
+    """A message that failed authentication or whose session key is unusable.
+
+    :param index: The position of the message.
+    :type index: int
+    :param reason: What went wrong.
+    :type reason: str
+    """
+
+    def __init__(self, index: int, reason: str) -> None:
+        """Initialize the error.
+
+        :param index: The position of the message.
+        :type index: int
+
+        :param reason: What went wrong.
+        :type reason: str
+
+        :return: None
+        :rtype: None
+        """
+        super().__init__(index, reason)
+        self.index = index
+        self.reason = reason
+
+    def __str__(self) -> str:
+        """Return the reason and position.
+
+        :return: The error message.
+        :rtype: str
+        """
+        return f"{self.reason} for message {self.index}"
+
+
+def _b64(value: bytes) -> str:
+    """Base64 encode bytes to a str.
+
+    :param value: The bytes to encode.
+    :type value: bytes
+
+    :return: The base64 encoding.
+    :rtype: str
+    """
+    return binascii.b2a_base64(value, newline=False).decode("ascii")
+
+
+@typechecked
 class Base64Encoded(str):
     """A class representing a Base64 encoded string."""
 
@@ -127,12 +197,18 @@ class RSAMessage:
     __slots__ = ("_ciphertext", "_enc_session_key", "_nonce", "_tag")
     __hash__: ClassVar[Any] = None
 
+    # storage behind the descriptors, always base64 encoded
+    _enc_session_key: str
+    _nonce: str
+    _tag: str
+    _ciphertext: str
+
     enc_session_key: str | bytes = Base64Encoded("_enc_session_key")
     nonce: str | bytes = Base64Encoded("_nonce")
     tag: str | bytes = Base64Encoded("_tag")
     ciphertext: str | bytes = Base64Encoded("_ciphertext")
 
-    @beartype
+    @typechecked
     def __init__(
         self,
         enc_session_key: str | bytes,
@@ -162,7 +238,52 @@ class RSAMessage:
         self.tag = tag  # type: ignore[misc] # noqa: PLE0237
         self.ciphertext = ciphertext  # type: ignore[misc] # noqa: PLE0237
 
-    @beartype
+    @classmethod
+    def _from_base64(
+        cls,
+        enc_session_key: str,
+        nonce: str,
+        tag: str,
+        ciphertext: str,
+    ) -> Self:
+        """Build a message from fields already base64 encoded, without checking.
+
+        :param enc_session_key: The encrypted session key, base64 encoded.
+        :type enc_session_key: str
+
+        :param nonce: The nonce, base64 encoded.
+        :type nonce: str
+
+        :param tag: The tag, base64 encoded.
+        :type tag: str
+
+        :param ciphertext: The encrypted ciphertext, base64 encoded.
+        :type ciphertext: str
+
+        :return: The message.
+        :rtype: Self
+        """
+        msg = cls.__new__(cls)
+        msg._enc_session_key = enc_session_key  # noqa: SLF001
+        msg._nonce = nonce  # noqa: SLF001
+        msg._tag = tag  # noqa: SLF001
+        msg._ciphertext = ciphertext  # noqa: SLF001
+        return msg
+
+    def _raw(self) -> RawMessage:
+        """Return the encoded session key and the decoded nonce, tag, ciphertext.
+
+        :return: The encrypted session key, still base64 encoded, and a
+            ``(nonce, tag, ciphertext)`` tuple.
+        :rtype: RawMessage
+        """
+        return self._enc_session_key, (
+            binascii.a2b_base64(self._nonce),
+            binascii.a2b_base64(self._tag),
+            binascii.a2b_base64(self._ciphertext),
+        )
+
+    @typechecked
     def attribute_as_bytes(self, attribute_name: str) -> bytes:
         """Return the decoded attribute value as bytes.
 
@@ -176,7 +297,7 @@ class RSAMessage:
             instance=self,
         )
 
-    @beartype
+    @typechecked
     def __str__(self) -> str:
         """Return the string representation of the object.
 
@@ -185,7 +306,7 @@ class RSAMessage:
         """
         return f"{self.enc_session_key=}{self.nonce=}{self.tag=}{self.ciphertext=}"
 
-    @beartype
+    @typechecked
     def __eq__(self, value: object) -> bool:
         """Check if the object is equal to another object.
 
@@ -205,7 +326,409 @@ class RSAMessage:
         )
 
 
-@beartype
+class EncryptedColumns:
+    """Deque-like storage keeping encrypted records as raw bytes in columns.
+
+    An :class:`RSAMessage` holds four base64 strings, including its own copy of
+    the 256 byte wrapped session key. Here every distinct wrapped key is kept
+    once and each record costs its 16 byte nonce and tag, its ciphertext and a
+    few bytes of offset and key index. Nonces, tags and ciphertexts live in
+    contiguous ``bytearray`` buffers; :class:`RSAMessage` objects are only
+    built when an element is read.
+
+    Removing the first or last element is cheap; other removals and
+    assignments of a ciphertext with a different length move the rest of the
+    buffers.
+
+    :param data: Initial messages, defaults to ()
+    :type data: Iterable[RSAMessage]
+    """
+
+    __slots__ = (
+        "_ciphertexts",
+        "_head",
+        "_key_ids",
+        "_key_index",
+        "_keys",
+        "_nonces",
+        "_offsets",
+        "_tags",
+    )
+
+    def __init__(self, data: Iterable[RSAMessage] = ()) -> None:
+        """Initialize empty columns and extend them with ``data``.
+
+        :param data: Initial messages, defaults to ()
+        :type data: Iterable[RSAMessage]
+        """
+        self._keys: list[str] = []
+        self._key_ids: dict[str, int] = {}
+        # records before _head were removed from the left but not compacted yet
+        self._head = 0
+        self._key_index = array("I")
+        self._nonces = bytearray()
+        self._tags = bytearray()
+        self._ciphertexts = bytearray()
+        # record i's ciphertext is _ciphertexts[_offsets[i] : _offsets[i + 1]]
+        self._offsets = array("Q", (0,))
+        self.extend(data)
+
+    @property
+    def session_keys(self) -> int:
+        """Number of distinct wrapped session keys stored.
+
+        :return: The number of session keys.
+        :rtype: int
+        """
+        return len(self._keys)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the record buffers, excluding the session keys.
+
+        :return: The size of the buffers and offset tables.
+        :rtype: int
+        """
+        return (
+            len(self._nonces)
+            + len(self._tags)
+            + len(self._ciphertexts)
+            + self._offsets.itemsize * len(self._offsets)
+            + self._key_index.itemsize * len(self._key_index)
+        )
+
+    def _key_id(self, enc_session_key: str) -> int:
+        """Return the index of a wrapped session key, adding it if new.
+
+        :param enc_session_key: The wrapped session key, base64 encoded.
+        :type enc_session_key: str
+
+        :return: The key index.
+        :rtype: int
+        """
+        key_id = self._key_ids.get(enc_session_key)
+        if key_id is None:
+            key_id = self._key_ids[enc_session_key] = len(self._keys)
+            self._keys.append(enc_session_key)
+        return key_id
+
+    @staticmethod
+    def _check(record: tuple[bytes, bytes, bytes]) -> None:
+        """Reject records whose nonce or tag is not one block long.
+
+        :param record: A ``(nonce, tag, ciphertext)`` tuple.
+        :type record: tuple[bytes, bytes, bytes]
+
+        :raises ValueError: If the nonce or tag is not 16 bytes.
+        """
+        if len(record[0]) != BLOCK or len(record[1]) != BLOCK:
+            msg = f"EncryptedColumns only stores {BLOCK} byte nonces and tags"
+            raise ValueError(msg)
+
+    def extend_raw(
+        self,
+        enc_session_key: str,
+        records: Sequence[tuple[bytes, bytes, bytes]],
+    ) -> None:
+        """Add records encrypted under one session key to the right side.
+
+        :param enc_session_key: The wrapped session key, base64 encoded.
+        :type enc_session_key: str
+        :param records: A ``(nonce, tag, ciphertext)`` tuple per record.
+        :type records: Sequence[tuple[bytes, bytes, bytes]]
+
+        :raises ValueError: If a nonce or tag is not 16 bytes.
+        """
+        if not records:
+            return
+        for record in records:
+            self._check(record)
+        key_id = self._key_id(enc_session_key)
+        self._key_index.extend([key_id] * len(records))
+        self._nonces += b"".join(record[0] for record in records)
+        self._tags += b"".join(record[1] for record in records)
+        ends = accumulate(
+            (len(record[2]) for record in records),
+            initial=self._offsets[-1],
+        )
+        self._offsets.extend(islice(ends, 1, None))
+        self._ciphertexts += b"".join(record[2] for record in records)
+
+    def append(self, item: RSAMessage) -> None:
+        """Add a message to the right side.
+
+        :param item: The message to add.
+        :type item: RSAMessage
+
+        :raises ValueError: If the nonce or tag is not 16 bytes.
+        """
+        enc_session_key, record = item._raw()  # noqa: SLF001
+        self.extend_raw(enc_session_key, (record,))
+
+    def extend(self, items: Iterable[RSAMessage]) -> None:
+        """Add messages to the right side.
+
+        :param items: The messages to add.
+        :type items: Iterable[RSAMessage]
+
+        :raises ValueError: If a nonce or tag is not 16 bytes.
+        """
+        raw = (item._raw() for item in items)  # noqa: SLF001
+        for enc_session_key, run in groupby(raw, key=lambda pair: pair[0]):
+            self.extend_raw(enc_session_key, [record for _, record in run])
+
+    def clear(self) -> None:
+        """Remove all messages."""
+        self._keys.clear()
+        self._key_ids.clear()
+        self._head = 0
+        self._key_index = array("I")
+        self._nonces.clear()
+        self._tags.clear()
+        self._ciphertexts.clear()
+        self._offsets = array("Q", (0,))
+
+    def __len__(self) -> int:
+        """Return the number of stored messages.
+
+        :return: The number of messages.
+        :rtype: int
+        """
+        return len(self._key_index) - self._head
+
+    def _physical(self, key: SupportsIndex) -> int:
+        """Translate a (possibly negative) index into a physical index.
+
+        :param key: The index to translate.
+        :type key: SupportsIndex
+
+        :return: The physical index of the record.
+        :rtype: int
+
+        :raises IndexError: If the index is out of range.
+        """
+        index = operator.index(key)
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            msg = "deque index out of range"
+            raise IndexError(msg)
+        return index + self._head
+
+    def _raw(self, physical: int) -> RawMessage:
+        """Return the raw fields of the record at a physical index.
+
+        :param physical: The physical index.
+        :type physical: int
+
+        :return: The wrapped session key and a ``(nonce, tag, ciphertext)`` tuple.
+        :rtype: RawMessage
+        """
+        start = physical * BLOCK
+        return self._keys[self._key_index[physical]], (
+            bytes(self._nonces[start : start + BLOCK]),
+            bytes(self._tags[start : start + BLOCK]),
+            bytes(
+                self._ciphertexts[
+                    self._offsets[physical] : self._offsets[physical + 1]
+                ],
+            ),
+        )
+
+    @staticmethod
+    def _message(raw: RawMessage) -> RSAMessage:
+        """Materialize a message from its raw fields.
+
+        :param raw: The wrapped session key and a ``(nonce, tag, ciphertext)``
+            tuple.
+        :type raw: RawMessage
+
+        :return: The message.
+        :rtype: RSAMessage
+        """
+        enc_session_key, (nonce, tag, ciphertext) = raw
+        return RSAMessage._from_base64(  # noqa: SLF001
+            enc_session_key,
+            _b64(nonce),
+            _b64(tag),
+            _b64(ciphertext),
+        )
+
+    def iter_raw(self) -> Iterator[RawMessage]:
+        """Iterate over the raw fields of every record, left to right.
+
+        :return: An iterator of wrapped session keys and
+            ``(nonce, tag, ciphertext)`` tuples.
+        :rtype: Iterator[RawMessage]
+        """
+        for physical in range(self._head, len(self._key_index)):
+            yield self._raw(physical)
+
+    def iter_range(self, start: int, stop: int) -> Iterator[RSAMessage]:
+        """Iterate over the messages at positions ``start <= i < stop``.
+
+        :param start: The first position, ``0 <= start <= stop``.
+        :type start: int
+        :param stop: The position after the last, at most ``len(self)``.
+        :type stop: int
+
+        :return: An iterator over the messages.
+        :rtype: Iterator[RSAMessage]
+        """
+        for physical in range(self._head + start, self._head + stop):
+            yield self._message(self._raw(physical))
+
+    def __getitem__(self, key: SupportsIndex) -> RSAMessage:
+        """Return the message at ``key``.
+
+        :param key: The index of the message.
+        :type key: SupportsIndex
+
+        :return: The message.
+        :rtype: RSAMessage
+        """
+        return self._message(self._raw(self._physical(key)))
+
+    def _splice(self, physical: int, ciphertext: bytes) -> None:
+        """Replace the ciphertext of a record, moving the records after it.
+
+        :param physical: The physical index.
+        :type physical: int
+        :param ciphertext: The new ciphertext.
+        :type ciphertext: bytes
+        """
+        offsets = self._offsets
+        start, end = offsets[physical], offsets[physical + 1]
+        self._ciphertexts[start:end] = ciphertext
+        delta = len(ciphertext) - (end - start)
+        if delta:
+            offsets[physical + 1 :] = array(
+                "Q",
+                (offset + delta for offset in offsets[physical + 1 :]),
+            )
+
+    def __setitem__(self, key: SupportsIndex, value: RSAMessage) -> None:
+        """Replace the message at ``key``.
+
+        :param key: The index of the message.
+        :type key: SupportsIndex
+        :param value: The new message.
+        :type value: RSAMessage
+
+        :raises ValueError: If the nonce or tag is not 16 bytes.
+        """
+        physical = self._physical(key)
+        enc_session_key, record = value._raw()  # noqa: SLF001
+        self._check(record)
+        nonce, tag, ciphertext = record
+        self._key_index[physical] = self._key_id(enc_session_key)
+        start = physical * BLOCK
+        self._nonces[start : start + BLOCK] = nonce
+        self._tags[start : start + BLOCK] = tag
+        self._splice(physical, ciphertext)
+
+    def _compact(self) -> None:
+        """Drop the records removed from the left from every buffer."""
+        head = self._head
+        base = self._offsets[head]
+        del self._key_index[:head]
+        del self._nonces[: head * BLOCK]
+        del self._tags[: head * BLOCK]
+        del self._ciphertexts[:base]
+        self._offsets = array("Q", (offset - base for offset in self._offsets[head:]))
+        self._head = 0
+
+    def __delitem__(self, key: SupportsIndex) -> None:
+        """Remove the message at ``key``.
+
+        :param key: The index of the message.
+        :type key: SupportsIndex
+        """
+        physical = self._physical(key)
+        if physical == self._head:
+            # removing from the left only moves the logical start
+            self._head += 1
+            if self._head * 2 >= len(self._key_index):
+                self._compact()
+            return
+        self._splice(physical, b"")
+        del self._key_index[physical]
+        del self._nonces[physical * BLOCK : (physical + 1) * BLOCK]
+        del self._tags[physical * BLOCK : (physical + 1) * BLOCK]
+        del self._offsets[physical + 1]
+
+    def pop(self) -> RSAMessage:
+        """Remove and return the rightmost message.
+
+        :return: The removed message.
+        :rtype: RSAMessage
+        """
+        if not len(self):
+            msg = "pop from an empty deque"
+            raise IndexError(msg)
+        item = self[-1]
+        del self[-1]
+        return item
+
+    def popleft(self) -> RSAMessage:
+        """Remove and return the leftmost message.
+
+        :return: The removed message.
+        :rtype: RSAMessage
+        """
+        if not len(self):
+            msg = "pop from an empty deque"
+            raise IndexError(msg)
+        item = self[0]
+        del self[0]
+        return item
+
+    def __iter__(self) -> Iterator[RSAMessage]:
+        """Iterate over the messages from left to right.
+
+        :return: An iterator over the messages.
+        :rtype: Iterator[RSAMessage]
+        """
+        return map(self._message, self.iter_raw())
+
+    def __reversed__(self) -> Iterator[RSAMessage]:
+        """Iterate over the messages from right to left.
+
+        :return: A reverse iterator over the messages.
+        :rtype: Iterator[RSAMessage]
+        """
+        for physical in range(len(self._key_index) - 1, self._head - 1, -1):
+            yield self._message(self._raw(physical))
+
+    def __contains__(self, item: object) -> bool:
+        """Return True if a stored message equals ``item``.
+
+        Records are compared as raw bytes, no messages are materialized.
+
+        :param item: The value to look for.
+        :type item: object
+
+        :return: True if item is one of the messages.
+        :rtype: bool
+        """
+        if not isinstance(item, RSAMessage):
+            return False
+        return item._raw() in self.iter_raw()  # noqa: SLF001
+
+    def __repr__(self) -> str:
+        """Return a short description of the columns.
+
+        :return: The representation.
+        :rtype: str
+        """
+        return (
+            f"{type(self).__qualname__}(<{len(self)} messages, "
+            f"{len(self._keys)} session keys>)"
+        )
+
+
+@typechecked
 class EncryptedStringDeque(StringDataDeque[RSAMessage, Builtin_or_DefinesDunderStr]):
     """Read once write many buffer, using RSA and AES.
 
@@ -217,9 +740,21 @@ class EncryptedStringDeque(StringDataDeque[RSAMessage, Builtin_or_DefinesDunderS
     :type format_func: Callable[[RSAMessage], str]
     :param sep: The separator used when joining the strings.
     :type sep: str
+    :param storage: Factory for the container holding the messages.
+    :type storage: Callable[[], DequeLike[RSAMessage]]
     """
 
-    __slots__ = ("_data", "enc_session_key", "public_key", "session_key", "type")
+    __slots__ = (
+        "_data",
+        "_session",
+        "enc_session_key",
+        "public_key",
+        "session_key",
+        "type",
+    )
+
+    # format_func typically decrypts, never keep the plaintext rendering around
+    _cache_render: ClassVar[bool] = False
 
     @staticmethod
     def __keep_encrypted(msg: RSAMessage) -> str:  # pragma: no cover
@@ -239,6 +774,7 @@ class EncryptedStringDeque(StringDataDeque[RSAMessage, Builtin_or_DefinesDunderS
         data: SequenceNonstrOfStr | str | None = None,
         format_func: Callable[[RSAMessage], str] = __keep_encrypted,
         sep: str = "",
+        storage: Callable[[], DequeLike[RSAMessage]] = deque,
     ) -> None:
         """Initialize the object.
 
@@ -257,12 +793,17 @@ class EncryptedStringDeque(StringDataDeque[RSAMessage, Builtin_or_DefinesDunderS
             Defaults to ''.
         :type sep: str
 
+        :param storage: Factory for the container holding the messages, for
+            example :class:`EncryptedColumns`. Defaults to ``collections.deque``.
+        :type storage: Callable[[], DequeLike[RSAMessage]]
+
         :return: None
         :rtype: None
         """
         self.session_key: bytes
         self.enc_session_key: bytes
-        self._data: deque[RSAMessage] = deque()
+        # batch cipher and base64 encrypted session key, set on first encryption
+        self._session: tuple[EaxBatch, str] | None = None
         self.public_key = public_key
         if isinstance(data, str):
             data = (data,)
@@ -272,6 +813,7 @@ class EncryptedStringDeque(StringDataDeque[RSAMessage, Builtin_or_DefinesDunderS
             format_func=format_func,
             data=data,
             sep=sep,
+            storage=storage,
         )
 
     def _encrypt(
@@ -292,26 +834,99 @@ class EncryptedStringDeque(StringDataDeque[RSAMessage, Builtin_or_DefinesDunderS
         :return: An RSAMessage object containing the encrypted message.
         :rtype: RSAMessage
         """
-        msg = str(msg)
-        session_key = getattr(self, "session_key", None)
-        if session_key is None:
+        return self._encrypt_many((msg,), public_key)[0]
+
+    def _encrypt_raw(
+        self,
+        msgs: Iterable[Builtin_or_DefinesDunderStr],
+        public_key: RSA.RsaKey,
+    ) -> tuple[str, list[tuple[bytes, bytes, bytes]]]:
+        """Encrypt messages in one pass, each under its own nonce and tag.
+
+        The session key is created and wrapped with RSA on first use only; every
+        record is then an independent AES-EAX message under that key (see
+        :class:`~stringdatadeque.eax.EaxBatch`).
+
+        :param msgs: The messages to be encrypted.
+        :type msgs: Iterable[Builtin_or_DefinesDunderStr]
+
+        :param public_key: The public key used to wrap a new session key.
+        :type public_key: RSA.RsaKey
+
+        :return: The wrapped session key, base64 encoded, and a
+            ``(nonce, tag, ciphertext)`` tuple per message, in order.
+        :rtype: tuple[str, list[tuple[bytes, bytes, bytes]]]
+        """
+        if self._session is None:
             session_key = get_random_bytes(16)
             self.session_key = session_key
             # Encrypt the session key with the public RSA key
             cipher_rsa = PKCS1_OAEP.new(public_key)
             self.enc_session_key = cipher_rsa.encrypt(session_key)
-            # Encrypt the data with the AES session key
-        # cipher_aes is stateful, need to generate new one each time.
-        cipher_aes = AES.new(session_key, AES.MODE_EAX)  # pyright: ignore[reportUnknownMemberType]
-        ciphertext, tag = cipher_aes.encrypt_and_digest(msg.encode("utf-8"))
-
-        return RSAMessage(
-            self.enc_session_key,
-            cipher_aes.nonce,
-            tag,
-            ciphertext,
+            self._session = (EaxBatch(session_key), _b64(self.enc_session_key))
+        batch, enc_session_key = self._session
+        return enc_session_key, batch.encrypt(
+            [str(msg).encode("utf-8") for msg in msgs],
         )
 
+    def _encrypt_many(
+        self,
+        msgs: Iterable[Builtin_or_DefinesDunderStr],
+        public_key: RSA.RsaKey,
+    ) -> list[RSAMessage]:
+        """Encrypt messages in one pass, see :meth:`_encrypt_raw`.
+
+        :param msgs: The messages to be encrypted.
+        :type msgs: Iterable[Builtin_or_DefinesDunderStr]
+
+        :param public_key: The public key used to wrap a new session key.
+        :type public_key: RSA.RsaKey
+
+        :return: An RSAMessage per message, in order.
+        :rtype: list[RSAMessage]
+        """
+        enc_session_key, records = self._encrypt_raw(msgs, public_key)
+        return [
+            RSAMessage._from_base64(  # noqa: SLF001
+                enc_session_key,
+                _b64(nonce),
+                _b64(tag),
+                _b64(ciphertext),
+            )
+            for nonce, tag, ciphertext in records
+        ]
+
+    def _extend_converted(self, items: Iterable[Builtin_or_DefinesDunderStr]) -> None:
+        """Encrypt items in one batch and append them.
+
+        :class:`EncryptedColumns` storage receives the raw records, so no
+        :class:`RSAMessage` is built.
+
+        :param items: The items to encrypt and append.
+        :type items: Iterable[Builtin_or_DefinesDunderStr]
+        """
+        if isinstance(self._data, EncryptedColumns):
+            self._data.extend_raw(*self._encrypt_raw(items, self.public_key))
+        else:
+            self._data.extend(self._encrypt_many(items, self.public_key))
+
+    def insert_batch(self, items: Iterable[Builtin_or_DefinesDunderStr]) -> Self:
+        """Encrypt and append many items in one pass.
+
+        Much cheaper per record than appending items one at a time, while every
+        record keeps its own nonce and tag and decrypts on its own with
+        :meth:`decrypt`. :meth:`insert` and ``|=`` take the same path for
+        sequences; unlike them, this also accepts iterators and generators.
+
+        :param items: The items to encrypt and append, in order.
+        :type items: Iterable[Builtin_or_DefinesDunderStr]
+
+        :return: The EncryptedStringDeque.
+        :rtype: Self
+        """
+        self._extend_converted(items)
+        return self
+
     @staticmethod
     def decrypt(msg: RSAMessage, private_key: RSA.RsaKey) -> str:
         # """Decrypt to a str."""
@@ -340,3 +955,291 @@ class EncryptedStringDeque(StringDataDeque[RSAMessage, Builtin_or_DefinesDunderS
         data = cipher_aes.decrypt_and_verify(dec_ciphertext, dec_tag)
         # msg.decode = False
         return data.decode("utf-8")
+
+
+def _iter_raw(esd: EncryptedStringDeque) -> Iterator[RawMessage]:
+    """Iterate over the raw fields of the messages of a deque.
+
+    :param esd: The deque.
+    :type esd: EncryptedStringDeque
+
+    :return: An iterator of wrapped session keys and
+        ``(nonce, tag, ciphertext)`` tuples.
+    :rtype: Iterator[RawMessage]
+    """
+    data = esd._data  # noqa: SLF001
+    if isinstance(data, EncryptedColumns):
+        return data.iter_raw()
+    return (msg._raw() for msg in data)  # noqa: SLF001
+
+
+def _decrypt_slice(
+    session_keys: dict[str, bytes | None],
+    start: int,
+    raw: list[RawMessage],
+) -> list[str | DecryptionError]:
+    """Decrypt a slice of messages with unwrapped keys (runs in a pool worker).
+
+    :param session_keys: The AES key for each wrapped session key, None if it
+        could not be unwrapped.
+    :type session_keys: dict[str, bytes | None]
+
+    :param start: The position of the slice's first message.
+    :type start: int
+
+    :param raw: The raw fields of the messages.
+    :type raw: list[RawMessage]
+
+    :return: The plaintext or error of each message, in order.
+    :rtype: list[str | DecryptionError]
+    """
+    results: list[str | DecryptionError] = []
+    for enc_session_key, run in groupby(raw, key=lambda pair: pair[0]):
+        records = [record for _, record in run]
+        session_key = session_keys[enc_session_key]
+        if session_key is None:
+            # extend grows results while the generator runs, fix the base first
+            base = start + len(results)
+            results.extend(
+                DecryptionError(base + pos, "Cannot unwrap session key")
+                for pos in range(len(records))
+            )
+            continue
+        for plaintext in EaxBatch(session_key).decrypt(records):
+            results.append(
+                DecryptionError(start + len(results), "MAC check failed")
+                if plaintext is None
+                else plaintext.decode("utf-8"),
+            )
+    return results
+
+
+@typechecked
+class RSADecryptor:
+    """Decrypt RSAMessage records with one private key.
+
+    :meth:`EncryptedStringDeque.decrypt` unwraps the session key with RSA for
+    every message. A decryptor unwraps each distinct session key once and keeps
+    it in a bounded LRU cache, keyed by the wrapped key, then decrypts records in
+    batches (see :class:`~stringdatadeque.eax.EaxBatch`). It can also be used as
+    the ``format_func`` of an :class:`EncryptedStringDeque`.
+
+    :param private_key: The private key used to unwrap session keys.
+    :type private_key: RSA.RsaKey
+    :param cache_size: The number of unwrapped session keys to keep.
+    :type cache_size: int
+    """
+
+    __slots__ = ("_cipher_rsa", "_session", "private_key")
+
+    def __init__(
+        self,
+        private_key: RSA.RsaKey,
+        cache_size: int = DEFAULT_SESSION_CACHE_SIZE,
+    ) -> None:
+        """Initialize the decryptor.
+
+        :param private_key: The private key used to unwrap session keys.
+        :type private_key: RSA.RsaKey
+
+        :param cache_size: The number of unwrapped session keys to keep.
+            Defaults to DEFAULT_SESSION_CACHE_SIZE.
+        :type cache_size: int
+
+        :raises ValueError: If cache_size is less than 1.
+
+        :return: None
+        :rtype: None
+        """
+        if cache_size < 1:
+            msg = "cache_size must be at least 1"
+            raise ValueError(msg)
+        self.private_key = private_key
+        self._cipher_rsa = PKCS1_OAEP.new(private_key)
+        self._session: Callable[[str], EaxBatch] = lru_cache(maxsize=cache_size)(
+            self._unwrap,
+        )
+
+    def _unwrap(self, enc_session_key: str) -> EaxBatch:
+        """Unwrap a session key with RSA.
+
+        :param enc_session_key: The encrypted session key, base64 encoded.
+        :type enc_session_key: str
+
+        :return: A batch cipher for the session key.
+        :rtype: EaxBatch
+        """
+        session_key = self._cipher_rsa.decrypt(binascii.a2b_base64(enc_session_key))
+        return EaxBatch(session_key)
+
+    def decrypt_raw(self, raw: Iterable[RawMessage], start: int = 0) -> list[str]:
+        """Decrypt raw messages in batches, one per run of a shared session key.
+
+        :param raw: The wrapped session key, base64 encoded, and a
+            ``(nonce, tag, ciphertext)`` tuple of each message.
+        :type raw: Iterable[RawMessage]
+
+        :param start: The position of the first message, for error messages.
+            Defaults to 0.
+        :type start: int
+
+        :raises DecryptionError: If a session key cannot be unwrapped or a
+            message fails authentication.
+
+        :return: The decrypted messages, in order.
+        :rtype: list[str]
+        """
+        decrypted: list[str] = []
+        for enc_session_key, run in groupby(raw, key=lambda pair: pair[0]):
+            records = [record for _, record in run]
+            try:
+                batch = self._session(enc_session_key)
+            except ValueError as e:
+                position = start + len(decrypted)
+                raise DecryptionError(position, "Cannot unwrap session key") from e
+            for plaintext in batch.decrypt(records):
+                if plaintext is None:
+                    raise DecryptionError(start + len(decrypted), "MAC check failed")
+                decrypted.append(plaintext.decode("utf-8"))
+        return decrypted
+
+    def decrypt_many(self, msgs: Iterable[RSAMessage]) -> list[str]:
+        """Decrypt messages in batches, one per run of a shared session key.
+
+        :param msgs: The messages to decrypt.
+        :type msgs: Iterable[RSAMessage]
+
+        :raises DecryptionError: If a session key cannot be unwrapped or a
+            message fails authentication.
+
+        :return: The decrypted messages, in order.
+        :rtype: list[str]
+        """
+        return self.decrypt_raw(msg._raw() for msg in msgs)  # noqa: SLF001
+
+    def decrypt(self, msg: RSAMessage) -> str:
+        """Decrypt a single message.
+
+        :param msg: The message to decrypt.
+        :type msg: RSAMessage
+
+        :raises DecryptionError: If the session key cannot be unwrapped or
+            the message fails authentication.
+
+        :return: The decrypted message.
+        :rtype: str
+        """
+        return self.decrypt_many((msg,))[0]
+
+    def __call__(self, msg: RSAMessage) -> str:
+        """Decrypt a single message, so the decryptor can be a format_func.
+
+        :param msg: The message to decrypt.
+        :type msg: RSAMessage
+
+        :raises DecryptionError: If the session key cannot be unwrapped or
+            the message fails authentication.
+
+        :return: The decrypted message.
+        :rtype: str
+        """
+        return self.decrypt(msg)
+
+    def iter_decrypted(
+        self,
+        esd: EncryptedStringDeque,
+        chunk_size: int = DEFAULT_DECRYPT_CHUNK,
+    ) -> Iterator[str]:
+        """Yield every message of a deque decrypted, chunk_size at a time.
+
+        The deque must not be modified while the iterator is in use.
+
+        :param esd: The deque to decrypt.
+        :type esd: EncryptedStringDeque
+
+        :param chunk_size: The number of messages decrypted per batch.
+        :type chunk_size: int
+
+        :raises ValueError: If chunk_size is not positive.
+        :raises DecryptionError: If a session key cannot be unwrapped or a
+            message fails authentication.
+
+        :return: An iterator over the decrypted messages, in order.
+        :rtype: Iterator[str]
+        """
+        if chunk_size <= 0:
+            msg = "chunk_size must be positive"
+            raise ValueError(msg)
+        return self._iter_decrypted(esd, chunk_size)
+
+    def _iter_decrypted(
+        self,
+        esd: EncryptedStringDeque,
+        chunk_size: int,
+    ) -> Iterator[str]:
+        """Decrypt esd lazily, see :meth:`iter_decrypted`.
+
+        :param esd: The deque to decrypt.
+        :type esd: EncryptedStringDeque
+
+        :param chunk_size: The number of messages decrypted per batch.
+        :type chunk_size: int
+
+        :return: An iterator over the decrypted messages, in order.
+        :rtype: Iterator[str]
+        """
+        messages = _iter_raw(esd)
+        start = 0
+        while chunk := list(islice(messages, chunk_size)):
+            yield from self.decrypt_raw(chunk, start)
+            start += len(chunk)
+
+    def decrypt_parallel(
+        self,
+        esd: EncryptedStringDeque,
+        parallel: ParallelRender | None = None,
+    ) -> list[str | DecryptionError]:
+        """Decrypt every message of a deque on a thread or process pool.
+
+        Session keys are unwrapped here, once each; the messages are then split
+        into contiguous slices which the pool decrypts with AES only. Failures
+        do not stop the other messages: each one is reported in place.
+
+        :param esd: The deque to decrypt.
+        :type esd: EncryptedStringDeque
+
+        :param parallel: The pool settings, see
+            :class:`~stringdatadeque.parallel.ParallelRender`. Defaults to a
+            thread pool with one worker per CPU.
+        :type parallel: ParallelRender | None
+
+        :return: The plaintext of each message, in order, or a
+            :class:`DecryptionError` for a message that fails authentication or
+            whose session key cannot be unwrapped.
+        :rtype: list[str | DecryptionError]
+        """
+        if parallel is None:
+            parallel = ParallelRender()
+        raw = list(_iter_raw(esd))
+        session_keys: dict[str, bytes | None] = {}
+        for enc_session_key in dict.fromkeys(pair[0] for pair in raw):
+            try:
+                session_keys[enc_session_key] = self._session(enc_session_key).key
+            except ValueError:
+                session_keys[enc_session_key] = None
+        task = partial(_decrypt_slice, session_keys)
+        return list(chain.from_iterable(parallel.map_slices(task, raw, len(raw))))
+
+    def decrypt_all(self, esd: EncryptedStringDeque) -> list[str]:
+        """Decrypt every message of a deque.
+
+        :param esd: The deque to decrypt.
+        :type esd: EncryptedStringDeque
+
+        :raises DecryptionError: If a session key cannot be unwrapped or a
+            message fails authentication.
+
+        :return: The decrypted messages, in order.
+        :rtype: list[str]
+        """
+        return self.decrypt_raw(_iter_raw(esd))
@@ -0,0 +1,66 @@
+"""Optional NumPy fast path for ingesting arrays in bulk.
+
+NumPy is never imported here: an object can only be an ``ndarray`` if NumPy has
+already been imported by the caller, so the check is a ``sys.modules`` lookup and
+costs nothing when NumPy is not installed.
+"""
+
+import sys
+from typing import Any
+
+from .protocols import DequeLike
+
+# elements converted per step, bounds the temporary lists built by tolist()
+BULK_CHUNK = 64 * 1024
+
+# dtype kinds whose tolist() values have the same str() as the NumPy scalars
+# (bool, int, uint and unicode); float/complex only at double precision, where
+# Python's float repr and NumPy's shortest repr agree
+_EXACT_KINDS = frozenset("biuU")
+_EXACT_ITEMSIZE = {"f": 8, "c": 16}
+
+
+def is_ndarray(obj: object) -> bool:
+    """Return true if obj is a NumPy array of at least one dimension.
+
+    :param obj: The object to check.
+    :type obj: object
+
+    :return: True for ``numpy.ndarray`` instances with ``ndim >= 1``.
+    :rtype: bool
+    """
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(obj, numpy.ndarray) and obj.ndim > 0
+
+
+def extend_str(target: DequeLike[str], array: Any) -> bool:
+    """Extend target with ``str()`` of every element of a 1-D array, in bulk.
+
+    The array is converted ``BULK_CHUNK`` elements at a time with ``tolist()``,
+    which produces Python scalars in C, and ``str`` is mapped over those instead of
+    over NumPy scalars. The result is identical to ``map(str, array)``. Arrays for
+    which that cannot be guaranteed (other dtypes, more than one dimension or
+    ndarray subclasses such as masked arrays) are left alone.
+
+    :param target: The storage to extend.
+    :type target: DequeLike[str]
+    :param array: The array to convert.
+    :type array: numpy.ndarray
+
+    :return: True if target was extended, False if the caller must fall back to
+        converting element by element.
+    :rtype: bool
+    """
+    numpy = sys.modules["numpy"]
+    if type(array) is not numpy.ndarray or array.ndim != 1:
+        return False
+    dtype = array.dtype
+    if dtype.kind not in _EXACT_KINDS and _EXACT_ITEMSIZE.get(dtype.kind) != (
+        dtype.itemsize
+    ):
+        return False
+    unicode = dtype.kind == "U"
+    for start in range(0, len(array), BULK_CHUNK):
+        values = array[start : start + BULK_CHUNK].tolist()
+        target.extend(values if unicode else map(str, values))
+    return True
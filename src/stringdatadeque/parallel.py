@@ -0,0 +1,188 @@
+"""Parallel rendering of deques whose format_func is expensive.
+
+:class:`ParallelRender` also splits other per-element work across a pool, see
+:meth:`ParallelRender.map_slices`.
+"""
+
+import concurrent.futures
+import os
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from typing import Any
+from typing import Literal
+from typing import TypeVar
+
+from .typecheck import typechecked
+
+# elements per slice below which handing work to a pool costs more than it saves
+DEFAULT_MIN_SLICE = 4096
+# slices per worker, so one slow slice does not leave the other workers idle
+_SLICES_PER_WORKER = 4
+
+R = TypeVar("R")
+
+
+def _format_slice(
+    format_func: Callable[[Any], str],
+    sep: str,
+    _start: int,
+    items: list[Any],
+) -> str:
+    """Format and join one slice of elements (runs in a pool worker).
+
+    :param format_func: The function formatting each element.
+    :type format_func: Callable[[Any], str]
+    :param sep: The separator placed between elements.
+    :type sep: str
+    :param _start: The position of the slice's first element, unused.
+    :type _start: int
+    :param items: The elements of the slice, in order.
+    :type items: list[Any]
+
+    :return: The joined slice.
+    :rtype: str
+    """
+    return sep.join(map(format_func, items))
+
+
+def _slices(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Split items into consecutive lists of at most size elements.
+
+    :param items: The elements to split.
+    :type items: Iterable[Any]
+    :param size: Maximum number of elements per list.
+    :type size: int
+
+    :return: An iterator over the lists.
+    :rtype: Iterator[list[Any]]
+    """
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@typechecked
+@dataclass(frozen=True, slots=True)
+class ParallelRender:
+    """Settings for rendering a deque on a ``concurrent.futures`` pool.
+
+    Assign an instance to :attr:`StringDataDeque.parallel` to have ``str()`` split
+    the elements into contiguous slices, format the slices on the pool and join the
+    results in order. Deques with fewer than ``2 * min_slice`` elements, or a
+    single worker, are rendered serially.
+
+    A thread pool only speeds things up when ``format_func`` releases the GIL or on
+    the free-threaded build. A process pool works everywhere but ``format_func``
+    and the elements must be picklable, so lambdas and local functions cannot be
+    used.
+
+    :param executor: "thread", "process" or an existing Executor to reuse,
+        defaults to "thread". A pool created from a string lives only for one
+        rendering.
+    :type executor: Literal["thread", "process"] | Executor
+    :param max_workers: Number of workers, defaults to None (the CPU count)
+    :type max_workers: int | None
+    :param min_slice: Minimum number of elements per slice,
+        defaults to DEFAULT_MIN_SLICE
+    :type min_slice: int
+    """
+
+    executor: Literal["thread", "process"] | Executor = "thread"
+    max_workers: int | None = None
+    min_slice: int = DEFAULT_MIN_SLICE
+
+    def __post_init__(self) -> None:
+        """Validate the settings.
+
+        :raises ValueError: If max_workers or min_slice is not positive.
+        """
+        if self.max_workers is not None and self.max_workers <= 0:
+            msg = "max_workers must be positive"
+            raise ValueError(msg)
+        if self.min_slice <= 0:
+            msg = "min_slice must be positive"
+            raise ValueError(msg)
+
+    @property
+    def workers(self) -> int:
+        """Number of workers a rendering is split across.
+
+        :return: max_workers, or the number of usable CPUs.
+        :rtype: int
+        """
+        if self.max_workers is not None:
+            return self.max_workers
+        return os.process_cpu_count() or 1
+
+    def render(
+        self,
+        items: Iterable[Any],
+        count: int,
+        format_func: Callable[[Any], str],
+        sep: str,
+    ) -> str:
+        """Format items and join them with sep, in parallel when it pays off.
+
+        :param items: The elements, in order.
+        :type items: Iterable[Any]
+        :param count: The number of elements in items.
+        :type count: int
+        :param format_func: The function formatting each element.
+        :type format_func: Callable[[Any], str]
+        :param sep: The separator placed between elements.
+        :type sep: str
+
+        :return: The rendered string.
+        :rtype: str
+        """
+        workers = self.workers
+        if workers < 2 or count < 2 * self.min_slice:  # noqa: PLR2004
+            return sep.join(map(format_func, items))
+        task = partial(_format_slice, format_func, sep)
+        return sep.join(self.map_slices(task, items, count))
+
+    def map_slices(
+        self,
+        func: Callable[[int, list[Any]], R],
+        items: Iterable[Any],
+        count: int,
+    ) -> list[R]:
+        """Apply func to contiguous slices of items on the pool.
+
+        func is called with the position of the slice's first element and the
+        slice, and must be picklable for a process pool. With fewer than
+        ``2 * min_slice`` items or a single worker, func is called once, in this
+        thread, with all of them.
+
+        :param func: The function applied to each slice.
+        :type func: Callable[[int, list[Any]], R]
+        :param items: The elements, in order.
+        :type items: Iterable[Any]
+        :param count: The number of elements in items.
+        :type count: int
+
+        :return: The result of each slice, in order.
+        :rtype: list[R]
+        """
+        workers = self.workers
+        if workers < 2 or count < 2 * self.min_slice:  # noqa: PLR2004
+            return [func(0, list(items))]
+        slices = min(workers * _SLICES_PER_WORKER, count // self.min_slice)
+        size = -(-count // slices)
+        starts = range(0, count, size)
+        batches = _slices(items, size)
+        if isinstance(self.executor, Executor):
+            return list(self.executor.map(func, starts, batches))
+        # looked up here, concurrent.futures only imports the pool modules on use
+        pool_type = (
+            concurrent.futures.ThreadPoolExecutor
+            if self.executor == "thread"
+            else concurrent.futures.ProcessPoolExecutor
+        )
+        with pool_type(max_workers=workers) as pool:
+            return list(pool.map(func, starts, batches))
@@ -1,9 +1,14 @@
 """Holds Protocols and types."""
 
 import builtins
+from collections.abc import Iterable
+from collections.abc import Iterator
 from collections.abc import Sequence
+from functools import lru_cache
 from typing import Annotated
+from typing import Any
 from typing import Protocol
+from typing import SupportsIndex
 from typing import TypeVar
 from typing import runtime_checkable
 
@@ -20,6 +25,28 @@ class Printable(Protocol):  # pragma: no cover
         ...
 
 
+# names of everything in builtins, computed once instead of per validation
+_BUILTIN_NAMES = frozenset(dir(builtins))
+# number of distinct types whose _defines_str result is remembered
+TYPE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def _type_defines_str(cls: type) -> bool:
+    """Check if instances of a type are builtins or define a custom `__str__`.
+
+    The result is cached per type, call ``_type_defines_str.cache_clear()`` after
+    assigning ``__str__`` on an existing class.
+
+    :param cls: The type to check.
+    :type cls: type
+
+    :return: True if cls is named like a builtin or overrides `__str__`.
+    :rtype: bool
+    """
+    return cls.__name__ in _BUILTIN_NAMES or cls.__str__ != object.__str__
+
+
 def _defines_str(obj: object) -> bool:
     """Check if an object defines a custom `__str__` method.
 
@@ -29,14 +56,95 @@ def _defines_str(obj: object) -> bool:
     :return: True if the object defines a custom `__str__` method, False otherwise.
     :rtype: bool
     """
-    return type(obj).__name__ in dir(builtins) or type(obj).__str__ != object.__str__
+    return _type_defines_str(type(obj))  # type: ignore[arg-type]
 
 
 Builtin_or_DefinesDunderStr = Annotated[Printable, Is[_defines_str]]
 
 
 T = TypeVar("T")
+T_co = TypeVar("T_co", covariant=True)
+
+
+@runtime_checkable
+class DequeLike(Protocol[T]):  # pragma: no cover
+    """The subset of the ``collections.deque`` API used as StringDataDeque storage."""
+
+    def __len__(self) -> int:
+        """Return the number of stored elements."""
+        ...
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate from left to right."""
+        ...
+
+    def __reversed__(self) -> Iterator[T]:
+        """Iterate from right to left."""
+        ...
+
+    def __contains__(self, item: object) -> bool:
+        """Return True if an element equals item."""
+        ...
+
+    def __getitem__(self, key: SupportsIndex, /) -> T:
+        """Return the element at key."""
+        ...
+
+    def __setitem__(self, key: SupportsIndex, value: T, /) -> None:
+        """Replace the element at key."""
+        ...
+
+    def __delitem__(self, key: SupportsIndex, /) -> None:
+        """Remove the element at key."""
+        ...
+
+    def append(self, item: T, /) -> None:
+        """Add an element to the right side."""
+        ...
+
+    def extend(self, items: Iterable[T], /) -> None:
+        """Add elements to the right side."""
+        ...
+
+    def clear(self) -> None:
+        """Remove all elements."""
+        ...
+
+
+@runtime_checkable
+class SupportsRange(Protocol[T_co]):  # pragma: no cover
+    """Storage that reaches any position without walking in from an end."""
+
+    def iter_range(self, start: int, stop: int, /) -> Iterator[T_co]:
+        """Iterate over the elements at positions ``start <= i < stop``."""
+        ...
+
+
+@runtime_checkable
+class SupportsWrite(Protocol):  # pragma: no cover
+    """A text or binary file-like object with a ``write`` method."""
+
+    def write(self, data: Any, /) -> object:
+        """Write data to the underlying stream."""
+        ...
+
+
+@runtime_checkable
+class SupportsDrain(Protocol):  # pragma: no cover
+    """A stream with asyncio ``StreamWriter`` style flow control."""
+
+    def write(self, data: bytes, /) -> object:
+        """Buffer data for sending."""
+        ...
+
+    async def drain(self) -> None:
+        """Wait until the write buffer is below its high-water mark."""
+        ...
+
+
 # Type hint matching any non-string sequence *WHOSE ITEMS ARE ALL STRINGS.*
 SequenceNonstrOfStr = Annotated[Sequence[str], ~IsInstance[str]]
-# Type hint matching any non-string sequence
+# Type hint matching any non-string sequence. The str exclusion compiles to an inline
+# isinstance check and beartype samples a single item of the sequence, so validating
+# a sequence costs the same whatever its length.
 SequenceNonStr = Annotated[Sequence[T], ~IsInstance[str]]
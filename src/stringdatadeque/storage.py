@@ -0,0 +1,2140 @@
+"""Alternative storage backends for StringDataDeque.
+
+A StringDataDeque keeps its elements in ``collections.deque`` by default. Any object
+implementing the small :class:`~stringdatadeque.protocols.DequeLike` interface can be
+used instead by passing a factory as the ``storage`` argument.
+"""
+
+import heapq
+import mmap
+import operator
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from array import array
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import accumulate
+from itertools import chain
+from itertools import islice
+from itertools import repeat
+from pathlib import Path
+from typing import Any
+from typing import Generic
+from typing import Literal
+from typing import NoReturn
+from typing import SupportsIndex
+from typing import TypeVar
+
+from .protocols import DequeLike
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# elements per BlockStorage block
+DEFAULT_BLOCK_SIZE = 256
+# characters kept in memory by SpillStorage before older fragments go to disk
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# elements a PrefixView reads from its storage in one go
+_VIEW_BATCH = 1024
+
+# offsets are stored as uint32 unless a chunk is too large to address with them
+_UINT32_LIMIT = 2**32
+
+
+def _offset_array(fragments: list[str]) -> "array[int]":
+    """Build the offset table for a list of fragments.
+
+    :param fragments: The fragments making up a chunk, in order.
+    :type fragments: list[str]
+
+    :return: ``len(fragments) + 1`` offsets starting at 0.
+    :rtype: array[int]
+    """
+    offsets = accumulate(map(len, fragments), initial=0)
+    total = sum(map(len, fragments))
+    return array("I" if total < _UINT32_LIMIT else "Q", offsets)
+
+
+class RopeStorage:
+    """Deque-like storage that packs string fragments into large chunks.
+
+    Fragments are appended to an open tail list. Once the tail holds at least
+    ``chunk_size`` characters it is joined into a single ``str`` and an offset table,
+    so each stored fragment costs a few bytes of offset instead of a full ``str``
+    object. Indexing, iteration and membership slice fragments back out of the
+    chunks. Removing the first or last element is cheap; other removals and
+    assignments rebuild the affected chunk.
+
+    Only ``str`` elements can be stored, so this backend suits deques whose
+    ``convert_func`` already returns the formatted text, such as StringDeque.
+
+    :param data: Initial fragments, defaults to ()
+    :type data: Iterable[str]
+    :param chunk_size: Approximate number of characters per packed chunk.
+    :type chunk_size: int
+    """
+
+    __slots__ = (
+        "_chunk_size",
+        "_chunks",
+        "_head",
+        "_len",
+        "_offsets",
+        "_sealed",
+        "_starts",
+        "_tail",
+        "_tail_chars",
+    )
+
+    def __init__(
+        self,
+        data: Iterable[str] = (),
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Initialize an empty rope and extend it with ``data``.
+
+        :param data: Initial fragments, defaults to ()
+        :type data: Iterable[str]
+        :param chunk_size: Approximate number of characters per packed chunk.
+        :type chunk_size: int
+
+        :raises ValueError: If chunk_size is not positive.
+        """
+        if chunk_size <= 0:
+            msg = "chunk_size must be positive"
+            raise ValueError(msg)
+        self._chunk_size = chunk_size
+        # Elements are addressed by a "physical" index that only ever grows, so
+        # removing from the front just moves _head instead of renumbering chunks.
+        self._chunks: list[str] = []
+        self._offsets: list[array[int]] = []
+        self._starts: list[int] = []
+        self._sealed = 0
+        self._head = 0
+        self._tail: list[str] = []
+        self._tail_chars = 0
+        self._len = 0
+        self.extend(data)
+
+    def _seal(self) -> None:
+        """Pack the open tail into a new chunk."""
+        tail = self._tail
+        if not tail:
+            return
+        self._chunks.append("".join(tail))
+        self._offsets.append(_offset_array(tail))
+        self._starts.append(self._sealed)
+        self._sealed += len(tail)
+        self._tail = []
+        self._tail_chars = 0
+
+    def append(self, item: str) -> None:
+        """Add a fragment to the right side.
+
+        :param item: The fragment to add.
+        :type item: str
+
+        :raises TypeError: If item is not a str.
+        """
+        if not isinstance(item, str):
+            msg = f"{type(self).__qualname__} can only store str, not {type(item)!r}"
+            raise TypeError(msg)
+        self._tail.append(item)
+        self._tail_chars += len(item)
+        self._len += 1
+        if self._tail_chars >= self._chunk_size:
+            self._seal()
+
+    def extend(self, items: Iterable[str]) -> None:
+        """Add fragments to the right side.
+
+        :param items: The fragments to add.
+        :type items: Iterable[str]
+        """
+        append = self.append
+        for item in items:
+            append(item)
+
+    def clear(self) -> None:
+        """Remove all fragments."""
+        self._chunks.clear()
+        self._offsets.clear()
+        self._starts.clear()
+        self._tail = []
+        self._tail_chars = 0
+        self._head = self._sealed
+        self._len = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored fragments.
+
+        :return: The number of fragments.
+        :rtype: int
+        """
+        return self._len
+
+    def _physical(self, key: SupportsIndex) -> int:
+        """Translate a (possibly negative) index into a physical index.
+
+        :param key: The index to translate.
+        :type key: SupportsIndex
+
+        :return: The physical index of the element.
+        :rtype: int
+
+        :raises IndexError: If the index is out of range.
+        """
+        index = operator.index(key)
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            msg = "deque index out of range"
+            raise IndexError(msg)
+        return index + self._head
+
+    def _chunk_fragments(self, chunk: int) -> list[str]:
+        """Unpack the live fragments of a chunk.
+
+        :param chunk: The chunk index.
+        :type chunk: int
+
+        :return: The fragments, skipping any already removed from the front.
+        :rtype: list[str]
+        """
+        text = self._chunks[chunk]
+        offsets = self._offsets[chunk]
+        first = max(self._head - self._starts[chunk], 0)
+        return [
+            text[offsets[pos] : offsets[pos + 1]]
+            for pos in range(first, len(offsets) - 1)
+        ]
+
+    def _repack(self, chunk: int, fragments: list[str]) -> None:
+        """Replace the contents of a chunk, dropping it if empty.
+
+        :param chunk: The chunk index.
+        :type chunk: int
+        :param fragments: The new live fragments of the chunk.
+        :type fragments: list[str]
+        """
+        start = max(self._starts[chunk], self._head)
+        end = self._starts[chunk + 1] if chunk + 1 < len(self._starts) else self._sealed
+        delta = len(fragments) - (end - start)
+        if fragments:
+            self._chunks[chunk] = "".join(fragments)
+            self._offsets[chunk] = _offset_array(fragments)
+            self._starts[chunk] = start
+        else:
+            del self._chunks[chunk], self._offsets[chunk], self._starts[chunk]
+            chunk -= 1
+        for pos in range(chunk + 1, len(self._starts)):
+            self._starts[pos] += delta
+        self._sealed += delta
+
+    def _unseal_last(self) -> None:
+        """Move the last chunk back into the open tail."""
+        fragments = self._chunk_fragments(-1)
+        self._sealed = max(self._starts.pop(), self._head)
+        self._chunks.pop()
+        self._offsets.pop()
+        fragments.extend(self._tail)
+        self._tail = fragments
+        self._tail_chars = sum(map(len, fragments))
+
+    def __getitem__(self, key: SupportsIndex) -> str:
+        """Return the fragment at ``key``.
+
+        :param key: The index of the fragment.
+        :type key: SupportsIndex
+
+        :return: The fragment.
+        :rtype: str
+        """
+        physical = self._physical(key)
+        if physical >= self._sealed:
+            return self._tail[physical - self._sealed]
+        chunk = bisect_right(self._starts, physical) - 1
+        offsets = self._offsets[chunk]
+        pos = physical - self._starts[chunk]
+        return self._chunks[chunk][offsets[pos] : offsets[pos + 1]]
+
+    def __setitem__(self, key: SupportsIndex, value: str) -> None:
+        """Replace the fragment at ``key``.
+
+        :param key: The index of the fragment.
+        :type key: SupportsIndex
+        :param value: The new fragment.
+        :type value: str
+
+        :raises TypeError: If value is not a str.
+        """
+        if not isinstance(value, str):
+            msg = f"{type(self).__qualname__} can only store str, not {type(value)!r}"
+            raise TypeError(msg)
+        physical = self._physical(key)
+        if physical >= self._sealed:
+            pos = physical - self._sealed
+            self._tail_chars += len(value) - len(self._tail[pos])
+            self._tail[pos] = value
+            return
+        chunk = bisect_right(self._starts, physical) - 1
+        fragments = self._chunk_fragments(chunk)
+        fragments[physical - max(self._starts[chunk], self._head)] = value
+        self._repack(chunk, fragments)
+
+    def __delitem__(self, key: SupportsIndex) -> None:
+        """Remove the fragment at ``key``.
+
+        :param key: The index of the fragment.
+        :type key: SupportsIndex
+        """
+        physical = self._physical(key)
+        self._len -= 1
+        if physical == self._head and physical < self._sealed:
+            # removing from the left only moves the logical start
+            self._head += 1
+            if len(self._starts) > 1 and self._head >= self._starts[1]:
+                del self._chunks[0], self._offsets[0], self._starts[0]
+            elif len(self._starts) == 1 and self._head >= self._sealed:
+                self._chunks.clear()
+                self._offsets.clear()
+                self._starts.clear()
+            return
+        if physical < self._sealed and physical == self._sealed - 1 and not self._tail:
+            self._unseal_last()
+        if physical >= self._sealed:
+            self._tail_chars -= len(self._tail.pop(physical - self._sealed))
+            return
+        chunk = bisect_right(self._starts, physical) - 1
+        fragments = self._chunk_fragments(chunk)
+        del fragments[physical - max(self._starts[chunk], self._head)]
+        self._repack(chunk, fragments)
+
+    def pop(self) -> str:
+        """Remove and return the rightmost fragment.
+
+        :return: The removed fragment.
+        :rtype: str
+        """
+        if not self._len:
+            msg = "pop from an empty deque"
+            raise IndexError(msg)
+        item = self[-1]
+        del self[-1]
+        return item
+
+    def popleft(self) -> str:
+        """Remove and return the leftmost fragment.
+
+        :return: The removed fragment.
+        :rtype: str
+        """
+        if not self._len:
+            msg = "pop from an empty deque"
+            raise IndexError(msg)
+        item = self[0]
+        del self[0]
+        return item
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the fragments from left to right.
+
+        :return: An iterator over the fragments.
+        :rtype: Iterator[str]
+        """
+        for chunk, text in enumerate(self._chunks):
+            offsets = self._offsets[chunk]
+            first = max(self._head - self._starts[chunk], 0)
+            for pos in range(first, len(offsets) - 1):
+                yield text[offsets[pos] : offsets[pos + 1]]
+        yield from self._tail
+
+    def __reversed__(self) -> Iterator[str]:
+        """Iterate over the fragments from right to left.
+
+        :return: A reverse iterator over the fragments.
+        :rtype: Iterator[str]
+        """
+        yield from reversed(self._tail)
+        for chunk in range(len(self._chunks) - 1, -1, -1):
+            text = self._chunks[chunk]
+            offsets = self._offsets[chunk]
+            first = max(self._head - self._starts[chunk], 0)
+            for pos in range(len(offsets) - 2, first - 1, -1):
+                yield text[offsets[pos] : offsets[pos + 1]]
+
+    def iter_range(self, start: int, stop: int) -> Iterator[str]:
+        """Iterate over the fragments at positions ``start <= i < stop``.
+
+        The first chunk is found by bisection, so only the fragments in the range
+        are sliced out.
+
+        :param start: The first position, ``0 <= start <= stop``.
+        :type start: int
+        :param stop: The position after the last, at most ``len(self)``.
+        :type stop: int
+
+        :return: An iterator over the fragments.
+        :rtype: Iterator[str]
+        """
+        physical = self._head + start
+        end = self._head + stop
+        sealed_end = min(end, self._sealed)
+        if physical < sealed_end:
+            chunk = bisect_right(self._starts, physical) - 1
+            while physical < sealed_end:
+                text = self._chunks[chunk]
+                offsets = self._offsets[chunk]
+                base = self._starts[chunk]
+                last = min(sealed_end, base + len(offsets) - 1)
+                for pos in range(physical - base, last - base):
+                    yield text[offsets[pos] : offsets[pos + 1]]
+                physical = last
+                chunk += 1
+        if end > self._sealed:
+            yield from self._tail[
+                max(physical, self._sealed) - self._sealed : end - self._sealed
+            ]
+
+    def __contains__(self, item: object) -> bool:
+        """Return True if a stored fragment equals ``item``.
+
+        Matches are located with ``str.find`` on the packed chunks and then checked
+        against the offset table, so no fragments are materialized.
+
+        :param item: The value to look for.
+        :type item: object
+
+        :return: True if item is one of the fragments.
+        :rtype: bool
+        """
+        if not isinstance(item, str):
+            return False
+        if not item:
+            return any(not fragment for fragment in self)
+        for chunk, text in enumerate(self._chunks):
+            offsets = self._offsets[chunk]
+            first = offsets[max(self._head - self._starts[chunk], 0)]
+            found = text.find(item, first)
+            while found != -1:
+                pos = bisect_right(offsets, found) - 1
+                if offsets[pos] == found and offsets[pos + 1] - found == len(item):
+                    return True
+                found = text.find(item, found + 1)
+        return item in self._tail
+
+    def __repr__(self) -> str:
+        """Return a short description of the rope.
+
+        :return: The representation.
+        :rtype: str
+        """
+        return (
+            f"{type(self).__qualname__}(<{self._len} fragments in "
+            f"{len(self._chunks)} chunks>, chunk_size={self._chunk_size})"
+        )
+
+
+class _Segment:
+    """A write-once run of UTF-8 encoded fragments, read back through mmap.
+
+    :param path: The segment file, or None for an in-memory (empty) payload.
+    :type path: Path | None
+    :param buffer: The mapped file contents.
+    :type buffer: mmap.mmap | bytes
+    :param offsets: Byte offsets of the fragments, ``len + 1`` entries.
+    :type offsets: array[int]
+    """
+
+    __slots__ = ("buffer", "offsets", "path")
+
+    def __init__(
+        self,
+        path: Path | None,
+        buffer: mmap.mmap | bytes,
+        offsets: "array[int]",
+    ) -> None:
+        """Initialize the segment."""
+        self.path = path
+        self.buffer = buffer
+        self.offsets = offsets
+
+    @classmethod
+    def write(cls, path: Path, fragments: list[str]) -> "_Segment":
+        """Write fragments to a new segment file and map it.
+
+        :param path: Where to create the segment file.
+        :type path: Path
+        :param fragments: The fragments to store, in order.
+        :type fragments: list[str]
+
+        :return: The mapped segment.
+        :rtype: _Segment
+        """
+        encoded = [fragment.encode("utf-8") for fragment in fragments]
+        offsets = array("Q", accumulate(map(len, encoded), initial=0))
+        if not offsets[-1]:
+            # mmap cannot map an empty file
+            return cls(None, b"", offsets)
+        with path.open("xb") as file:
+            file.write(b"".join(encoded))
+        with path.open("rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(path, buffer, offsets)
+
+    def __len__(self) -> int:
+        """Return the number of fragments in the segment.
+
+        :return: The number of fragments.
+        :rtype: int
+        """
+        return len(self.offsets) - 1
+
+    def fragment(self, pos: int) -> str:
+        """Decode the fragment at ``pos``.
+
+        :param pos: Position of the fragment within the segment.
+        :type pos: int
+
+        :return: The fragment.
+        :rtype: str
+        """
+        offsets = self.offsets
+        return self.buffer[offsets[pos] : offsets[pos + 1]].decode("utf-8")
+
+    def close(self) -> None:
+        """Unmap the segment and delete its file."""
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+def _release_segments(segments: list[_Segment], directory: Path) -> None:
+    """Close all segments and remove the spill directory.
+
+    :param segments: The segments to close.
+    :type segments: list[_Segment]
+    :param directory: The spill directory.
+    :type directory: Path
+    """
+    for segment in segments:
+        segment.close()
+    segments.clear()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+class SpillStorage:
+    """Deque-like storage that spills older fragments to memory-mapped files.
+
+    New fragments are kept in an in-memory ``collections.deque``. Once it holds more
+    than ``memory_limit`` characters, the oldest fragments are written to an
+    append-only segment file in a temporary directory until half the limit
+    remains, and are read back through ``mmap`` when indexed or iterated. Only the
+    per-fragment byte offsets of spilled data stay in memory.
+
+    Removing the first or last element is cheap; other removals and assignments
+    that hit spilled data rewrite the affected segment. The directory is removed by
+    :meth:`close` or when the storage is garbage collected.
+
+    :param data: Initial fragments, defaults to ()
+    :type data: Iterable[str]
+    :param memory_limit: Characters held in memory before spilling to disk.
+    :type memory_limit: int
+    :param directory: Parent directory for the spill files, defaults to the system
+        temporary directory.
+    :type directory: str | Path | None
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "_counter",
+        "_directory",
+        "_finalizer",
+        "_head",
+        "_hot",
+        "_hot_chars",
+        "_len",
+        "_memory_limit",
+        "_parent",
+        "_sealed",
+        "_segments",
+        "_starts",
+    )
+
+    def __init__(
+        self,
+        data: Iterable[str] = (),
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        directory: str | Path | None = None,
+    ) -> None:
+        """Initialize an empty storage and extend it with ``data``.
+
+        :param data: Initial fragments, defaults to ()
+        :type data: Iterable[str]
+        :param memory_limit: Characters held in memory before spilling to disk.
+        :type memory_limit: int
+        :param directory: Parent directory for the spill files, defaults to the
+            system temporary directory.
+        :type directory: str | Path | None
+
+        :raises ValueError: If memory_limit is not positive.
+        """
+        if memory_limit <= 0:
+            msg = "memory_limit must be positive"
+            raise ValueError(msg)
+        self._memory_limit = memory_limit
+        self._parent = directory
+        self._directory: Path | None = None
+        self._finalizer: weakref.finalize[..., SpillStorage] | None = None
+        self._counter = 0
+        # same physical numbering scheme as RopeStorage, segments then hot data
+        self._segments: list[_Segment] = []
+        self._starts: list[int] = []
+        self._sealed = 0
+        self._head = 0
+        self._hot: deque[str] = deque()
+        self._hot_chars = 0
+        self._len = 0
+        self.extend(data)
+
+    @property
+    def directory(self) -> Path | None:
+        """Directory holding the segment files, None until the first spill.
+
+        :return: The spill directory.
+        :rtype: Path | None
+        """
+        return self._directory
+
+    @property
+    def spilled(self) -> int:
+        """Number of fragments currently stored on disk.
+
+        :return: The number of spilled fragments.
+        :rtype: int
+        """
+        return self._len - len(self._hot)
+
+    def _segment_path(self) -> Path:
+        """Return a fresh segment file path, creating the directory if needed.
+
+        :return: The path for a new segment.
+        :rtype: Path
+        """
+        if self._directory is None:
+            self._directory = Path(
+                tempfile.mkdtemp(prefix="stringdatadeque-", dir=self._parent)
+            )
+            self._finalizer = weakref.finalize(
+                self, _release_segments, self._segments, self._directory
+            )
+        self._counter += 1
+        return self._directory / f"segment-{self._counter:08d}.bin"
+
+    def _spill(self) -> None:
+        """Move the oldest in-memory fragments into a new segment."""
+        hot = self._hot
+        target = self._memory_limit // 2
+        fragments: list[str] = []
+        while hot and self._hot_chars > target:
+            fragment = hot.popleft()
+            self._hot_chars -= len(fragment)
+            fragments.append(fragment)
+        if not fragments:
+            return
+        self._segments.append(_Segment.write(self._segment_path(), fragments))
+        self._starts.append(self._sealed)
+        self._sealed += len(fragments)
+
+    def append(self, item: str) -> None:
+        """Add a fragment to the right side.
+
+        :param item: The fragment to add.
+        :type item: str
+
+        :raises TypeError: If item is not a str.
+        """
+        if not isinstance(item, str):
+            msg = f"{type(self).__qualname__} can only store str, not {type(item)!r}"
+            raise TypeError(msg)
+        self._hot.append(item)
+        self._hot_chars += len(item)
+        self._len += 1
+        if self._hot_chars > self._memory_limit:
+            self._spill()
+
+    def extend(self, items: Iterable[str]) -> None:
+        """Add fragments to the right side.
+
+        :param items: The fragments to add.
+        :type items: Iterable[str]
+        """
+        append = self.append
+        for item in items:
+            append(item)
+
+    def clear(self) -> None:
+        """Remove all fragments and delete the segment files."""
+        for segment in self._segments:
+            segment.close()
+        self._segments.clear()
+        self._starts.clear()
+        self._hot.clear()
+        self._hot_chars = 0
+        self._head = self._sealed
+        self._len = 0
+
+    def close(self) -> None:
+        """Remove all fragments and the spill directory."""
+        self.clear()
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+            self._directory = None
+
+    def __len__(self) -> int:
+        """Return the number of stored fragments.
+
+        :return: The number of fragments.
+        :rtype: int
+        """
+        return self._len
+
+    def _physical(self, key: SupportsIndex) -> int:
+        """Translate a (possibly negative) index into a physical index.
+
+        :param key: The index to translate.
+        :type key: SupportsIndex
+
+        :return: The physical index of the element.
+        :rtype: int
+
+        :raises IndexError: If the index is out of range.
+        """
+        index = operator.index(key)
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            msg = "deque index out of range"
+            raise IndexError(msg)
+        return index + self._head
+
+    def _live_range(self, segment: int) -> range:
+        """Return the positions of the live fragments of a segment.
+
+        :param segment: The segment index.
+        :type segment: int
+
+        :return: Positions within the segment that have not been removed.
+        :rtype: range
+        """
+        first = max(self._head - self._starts[segment], 0)
+        return range(first, len(self._segments[segment]))
+
+    def _replace_segment(self, segment: int, fragments: list[str]) -> None:
+        """Rewrite a segment with new live fragments, dropping it if empty.
+
+        :param segment: The segment index.
+        :type segment: int
+        :param fragments: The new live fragments of the segment.
+        :type fragments: list[str]
+        """
+        start = max(self._starts[segment], self._head)
+        delta = len(fragments) - len(self._live_range(segment))
+        self._segments[segment].close()
+        if fragments:
+            self._segments[segment] = _Segment.write(self._segment_path(), fragments)
+            self._starts[segment] = start
+        else:
+            del self._segments[segment], self._starts[segment]
+            segment -= 1
+        for pos in range(segment + 1, len(self._starts)):
+            self._starts[pos] += delta
+        self._sealed += delta
+
+    def _drop_exhausted_ends(self) -> None:
+        """Close segments at either end that no longer hold live fragments."""
+        while self._segments and not self._live_range(0):
+            self._segments.pop(0).close()
+            self._starts.pop(0)
+        while self._segments and not self._live_range(-1):
+            self._segments.pop().close()
+            self._starts.pop()
+
+    def __getitem__(self, key: SupportsIndex) -> str:
+        """Return the fragment at ``key``.
+
+        :param key: The index of the fragment.
+        :type key: SupportsIndex
+
+        :return: The fragment.
+        :rtype: str
+        """
+        physical = self._physical(key)
+        if physical >= self._sealed:
+            return self._hot[physical - self._sealed]
+        segment = bisect_right(self._starts, physical) - 1
+        return self._segments[segment].fragment(physical - self._starts[segment])
+
+    def __setitem__(self, key: SupportsIndex, value: str) -> None:
+        """Replace the fragment at ``key``.
+
+        :param key: The index of the fragment.
+        :type key: SupportsIndex
+        :param value: The new fragment.
+        :type value: str
+
+        :raises TypeError: If value is not a str.
+        """
+        if not isinstance(value, str):
+            msg = f"{type(self).__qualname__} can only store str, not {type(value)!r}"
+            raise TypeError(msg)
+        physical = self._physical(key)
+        if physical >= self._sealed:
+            pos = physical - self._sealed
+            self._hot_chars += len(value) - len(self._hot[pos])
+            self._hot[pos] = value
+            if self._hot_chars > self._memory_limit:
+                self._spill()
+            return
+        segment = bisect_right(self._starts, physical) - 1
+        fragments = [
+            self._segments[segment].fragment(pos) for pos in self._live_range(segment)
+        ]
+        fragments[physical - max(self._starts[segment], self._head)] = value
+        self._replace_segment(segment, fragments)
+
+    def __delitem__(self, key: SupportsIndex) -> None:
+        """Remove the fragment at ``key``.
+
+        :param key: The index of the fragment.
+        :type key: SupportsIndex
+        """
+        physical = self._physical(key)
+        self._len -= 1
+        if physical >= self._sealed:
+            pos = physical - self._sealed
+            self._hot_chars -= len(self._hot[pos])
+            del self._hot[pos]
+        elif physical == self._head:
+            self._head += 1
+        elif physical == self._sealed - 1:
+            self._segments[-1].offsets.pop()
+            self._sealed -= 1
+        else:
+            segment = bisect_right(self._starts, physical) - 1
+            fragments = [
+                self._segments[segment].fragment(pos)
+                for pos in self._live_range(segment)
+            ]
+            del fragments[physical - max(self._starts[segment], self._head)]
+            self._replace_segment(segment, fragments)
+        self._drop_exhausted_ends()
+
+    def pop(self) -> str:
+        """Remove and return the rightmost fragment.
+
+        :return: The removed fragment.
+        :rtype: str
+        """
+        if not self._len:
+            msg = "pop from an empty deque"
+            raise IndexError(msg)
+        item = self[-1]
+        del self[-1]
+        return item
+
+    def popleft(self) -> str:
+        """Remove and return the leftmost fragment.
+
+        :return: The removed fragment.
+        :rtype: str
+        """
+        if not self._len:
+            msg = "pop from an empty deque"
+            raise IndexError(msg)
+        item = self[0]
+        del self[0]
+        return item
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the fragments from left to right.
+
+        :return: An iterator over the fragments.
+        :rtype: Iterator[str]
+        """
+        for index, segment in enumerate(self._segments):
+            for pos in self._live_range(index):
+                yield segment.fragment(pos)
+        yield from self._hot
+
+    def __reversed__(self) -> Iterator[str]:
+        """Iterate over the fragments from right to left.
+
+        :return: A reverse iterator over the fragments.
+        :rtype: Iterator[str]
+        """
+        yield from reversed(self._hot)
+        for index in range(len(self._segments) - 1, -1, -1):
+            segment = self._segments[index]
+            for pos in reversed(self._live_range(index)):
+                yield segment.fragment(pos)
+
+    def __contains__(self, item: object) -> bool:
+        """Return True if a stored fragment equals ``item``.
+
+        Spilled segments are searched with ``find`` on the mapped bytes and matches
+        are checked against the offset table.
+
+        :param item: The value to look for.
+        :type item: object
+
+        :return: True if item is one of the fragments.
+        :rtype: bool
+        """
+        if not isinstance(item, str):
+            return False
+        if not item:
+            return any(not fragment for fragment in self)
+        needle = item.encode("utf-8")
+        for index, segment in enumerate(self._segments):
+            live = self._live_range(index)
+            offsets = segment.offsets
+            found = segment.buffer.find(needle, offsets[live.start], offsets[-1])
+            while found != -1:
+                pos = bisect_right(offsets, found) - 1
+                if offsets[pos] == found and offsets[pos + 1] - found == len(needle):
+                    return True
+                found = segment.buffer.find(needle, found + 1, offsets[-1])
+        return item in self._hot
+
+    def __repr__(self) -> str:
+        """Return a short description of the storage.
+
+        :return: The representation.
+        :rtype: str
+        """
+        return (
+            f"{type(self).__qualname__}(<{self._len} fragments, {self.spilled} in "
+            f"{len(self._segments)} segments>, memory_limit={self._memory_limit})"
+        )
+
+
+ShardOrder = Literal["thread", "arrival"]
+# the end of a deque that bulk removals take elements from
+Side = Literal["left", "right"]
+
+
+class ShardedStorage(Generic[T]):  # noqa: UP046
+    """Deque-like storage with one append shard per thread.
+
+    Each thread appends to its own ``collections.deque``, so concurrent appends
+    never contend on a shared container. Reads merge the shards:
+
+    - ``order="thread"`` yields each shard in turn, in the order the threads first
+      appended. The output is deterministic for a given assignment of work to
+      threads.
+    - ``order="arrival"`` stamps every element with ``time.monotonic_ns()`` and
+      merges the shards by stamp, approximating global arrival order. Elements
+      with equal stamps keep shard order.
+
+    Thread-safety guarantees:
+
+    - ``append``/``extend`` take no lock and are safe from any number of threads.
+    - Iteration, ``len()`` and membership work on a snapshot in which every shard
+      is copied atomically, so they never fail with "mutated during iteration".
+      The snapshot holds every element whose append finished before the call
+      started, and each thread's elements appear in order and without gaps.
+    - ``clear`` removes every element appended before it started. Elements
+      appended concurrently may survive.
+    - Indexed reads, assignments and deletions are serialized with each other and
+      with ``clear`` by an internal lock. They cost O(n).
+
+    Once a thread has exited, only its own appends could have reached its shard,
+    so an empty shard of an exited thread is dropped the next time a thread
+    registers or elements are removed under the lock. Thread pools that recycle
+    workers therefore keep about one shard per live thread, plus the shards of
+    exited threads still holding elements.
+
+    :param data: Initial elements, defaults to ()
+    :type data: Iterable[T]
+    :param order: How shards are merged, "thread" or "arrival", defaults to
+        "thread"
+    :type order: ShardOrder
+    """
+
+    __slots__ = ("_local", "_lock", "_order", "_owners", "_shards")
+
+    def __init__(self, data: Iterable[T] = (), order: ShardOrder = "thread") -> None:
+        """Initialize an empty storage and extend it with ``data``.
+
+        :param data: Initial elements, defaults to ()
+        :type data: Iterable[T]
+        :param order: How shards are merged, "thread" or "arrival".
+        :type order: ShardOrder
+
+        :raises ValueError: If order is not "thread" or "arrival".
+        """
+        if order not in {"thread", "arrival"}:
+            msg = f"order must be 'thread' or 'arrival', not {order!r}"
+            raise ValueError(msg)
+        self._order = order
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # replaced, never mutated, so readers can take it without the lock
+        self._shards: tuple[deque[Any], ...] = ()
+        # the thread appending to each shard, replaced together with _shards
+        self._owners: tuple[weakref.ref[threading.Thread], ...] = ()
+        # only register a shard for this thread if it actually stores something
+        items = list(data)
+        if items:
+            self.extend(items)
+
+    @property
+    def order(self) -> ShardOrder:
+        """How shards are merged when read.
+
+        :return: "thread" or "arrival".
+        :rtype: ShardOrder
+        """
+        return self._order
+
+    @property
+    def shards(self) -> int:
+        """Number of shards, one per live thread that has appended.
+
+        Exited threads keep their shard until it is empty and reclaimed.
+
+        :return: The number of shards.
+        :rtype: int
+        """
+        return len(self._shards)
+
+    def _shard(self) -> "deque[Any]":
+        """Return the calling thread's shard, creating it on first use.
+
+        :return: The shard.
+        :rtype: deque[Any]
+        """
+        try:
+            return self._local.shard  # type: ignore[no-any-return]
+        except AttributeError:
+            shard: deque[Any] = deque()
+            owner = weakref.ref(threading.current_thread())
+            with self._lock:
+                self._reclaim()
+                self._shards = (*self._shards, shard)
+                self._owners = (*self._owners, owner)
+            self._local.shard = shard
+            return shard
+
+    def _reclaim(self) -> None:
+        """Drop the empty shards of threads that have exited.
+
+        Must be called with the lock held. An exited thread never appends
+        again, so its shard stays empty once it is empty.
+        """
+        keep = [
+            number
+            for number, (shard, owner) in enumerate(
+                zip(self._shards, self._owners, strict=True)
+            )
+            if shard or ((thread := owner()) is not None and thread.is_alive())
+        ]
+        if len(keep) < len(self._shards):
+            self._shards = tuple(self._shards[number] for number in keep)
+            self._owners = tuple(self._owners[number] for number in keep)
+
+    def append(self, item: T) -> None:
+        """Append an element to the calling thread's shard.
+
+        :param item: The element.
+        :type item: T
+        """
+        if self._order == "thread":
+            self._shard().append(item)
+        else:
+            self._shard().append((time.monotonic_ns(), item))
+
+    def extend(self, items: Iterable[T]) -> None:
+        """Append several elements to the calling thread's shard.
+
+        :param items: The elements, in order.
+        :type items: Iterable[T]
+        """
+        if self._order == "thread":
+            self._shard().extend(items)
+        else:
+            self._shard().extend((time.monotonic_ns(), item) for item in items)
+
+    def clear(self) -> None:
+        """Remove every element appended before the call."""
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+            self._reclaim()
+
+    def _snapshot(self) -> list["deque[Any]"]:
+        """Copy every shard, each one atomically.
+
+        :return: The copies, in shard order.
+        :rtype: list[deque[Any]]
+        """
+        return [shard.copy() for shard in self._shards]
+
+    def _merge(self, snapshot: list["deque[Any]"]) -> Iterator[T]:
+        """Merge shard copies into a single sequence of elements.
+
+        :param snapshot: Shard copies from :meth:`_snapshot`.
+        :type snapshot: list[deque[Any]]
+
+        :return: An iterator over the elements.
+        :rtype: Iterator[T]
+        """
+        if self._order == "thread":
+            return chain.from_iterable(snapshot)
+        # each shard is already sorted, a stable sort of the concatenated runs
+        # merges them in C and keeps shard order for equal stamps
+        merged = sorted(chain.from_iterable(snapshot), key=operator.itemgetter(0))
+        return map(operator.itemgetter(1), merged)
+
+    def _locate(self, key: SupportsIndex) -> "tuple[deque[Any], int]":
+        """Find the shard and shard position of a merged index.
+
+        Must be called with the lock held.
+
+        :param key: The (possibly negative) index.
+        :type key: SupportsIndex
+
+        :return: The shard and the position of the element within it.
+        :rtype: tuple[deque[Any], int]
+
+        :raises IndexError: If the index is out of range.
+        """
+        shards = self._shards
+        snapshot = [shard.copy() for shard in shards]
+        total = sum(map(len, snapshot))
+        index = operator.index(key)
+        if index < 0:
+            index += total
+        if not 0 <= index < total:
+            msg = "deque index out of range"
+            raise IndexError(msg)
+        if self._order == "thread":
+            for shard, copy in zip(shards, snapshot, strict=True):
+                if index < len(copy):
+                    return shard, index
+                index -= len(copy)
+        positions = heapq.merge(
+            *(
+                ((stamp, number, pos) for pos, (stamp, _) in enumerate(copy))
+                for number, copy in enumerate(snapshot)
+            ),
+        )
+        _, number, pos = next(islice(positions, index, None))
+        return shards[number], pos
+
+    def __len__(self) -> int:
+        """Return the number of elements.
+
+        :return: The number of elements.
+        :rtype: int
+        """
+        return sum(map(len, self._shards))
+
+    def __getitem__(self, key: SupportsIndex) -> T:
+        """Return the element at key in merged order.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+
+        :return: The element.
+        :rtype: T
+        """
+        with self._lock:
+            shard, pos = self._locate(key)
+            value = shard[pos]
+        return value if self._order == "thread" else value[1]  # type: ignore[no-any-return]
+
+    def __setitem__(self, key: SupportsIndex, value: T) -> None:
+        """Replace the element at key, keeping its position.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+        :param value: The new element.
+        :type value: T
+        """
+        with self._lock:
+            shard, pos = self._locate(key)
+            shard[pos] = value if self._order == "thread" else (shard[pos][0], value)
+
+    def __delitem__(self, key: SupportsIndex) -> None:
+        """Remove the element at key.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+        """
+        self.take(key)
+
+    def take(self, key: SupportsIndex) -> T:
+        """Remove and return the element at key as one atomic step.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+
+        :return: The removed element.
+        :rtype: T
+        """
+        with self._lock:
+            shard, pos = self._locate(key)
+            value = shard[pos]
+            del shard[pos]
+            if not shard:
+                self._reclaim()
+        return value if self._order == "thread" else value[1]  # type: ignore[no-any-return]
+
+    def take_many(self, count: int, side: Side = "left") -> list[T]:
+        """Remove and return up to count elements from one end, atomically.
+
+        Only the ends of the shards are read and removed. Taking from the right
+        deletes by position, newest first, so it stays correct while the owning
+        threads keep appending.
+
+        :param count: The maximum number of elements, ``count >= 0``.
+        :type count: int
+        :param side: The end to take from, "left" or "right".
+        :type side: Side
+
+        :return: The removed elements, in merged order.
+        :rtype: list[T]
+        """
+        with self._lock:
+            shards = self._shards
+            # the candidates of each shard, oldest first; owners only append,
+            # so positions counted from the left stay valid
+            starts = [0] * len(shards)
+            if side == "right":
+                starts = [max(len(shard) - count, 0) for shard in shards]
+            ends = [
+                list(islice(shard, start, start + count))
+                for shard, start in zip(shards, starts, strict=True)
+            ]
+            taken = [0] * len(shards)
+            if self._order == "thread":
+                remaining = count
+                numbers = range(len(shards))
+                for number in numbers if side == "left" else reversed(numbers):
+                    taken[number] = min(remaining, len(ends[number]))
+                    remaining -= taken[number]
+            else:
+                stamp = operator.itemgetter(0)
+                merged = heapq.merge(
+                    *(
+                        zip(
+                            map(stamp, end if side == "left" else reversed(end)),
+                            repeat(number),
+                        )
+                        for number, end in enumerate(ends)
+                    ),
+                    reverse=side == "right",
+                )
+                for _, number in islice(merged, count):
+                    taken[number] += 1
+            pieces: list[deque[Any]] = []
+            for shard, start, end, size in zip(
+                shards, starts, ends, taken, strict=True
+            ):
+                if side == "left":
+                    for _ in range(size):
+                        shard.popleft()
+                    pieces.append(deque(end[:size]))
+                else:
+                    stop = start + len(end)
+                    for position in range(stop - 1, stop - size - 1, -1):
+                        del shard[position]
+                    pieces.append(deque(end[len(end) - size :]))
+            self._reclaim()
+        return list(self._merge(pieces))
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over a snapshot of the elements in merged order.
+
+        :return: An iterator over the elements.
+        :rtype: Iterator[T]
+        """
+        return self._merge(self._snapshot())
+
+    def __reversed__(self) -> Iterator[T]:
+        """Iterate over a snapshot of the elements in reverse merged order.
+
+        :return: An iterator over the elements.
+        :rtype: Iterator[T]
+        """
+        return reversed(list(self))
+
+    def __contains__(self, item: object) -> bool:
+        """Return true if item is an element of the current snapshot.
+
+        :param item: The element to look for.
+        :type item: object
+
+        :return: True if item is stored, False otherwise.
+        :rtype: bool
+        """
+        snapshot = self._snapshot()
+        if self._order == "thread":
+            return any(item in copy for copy in snapshot)
+        return item in map(operator.itemgetter(1), chain.from_iterable(snapshot))
+
+    def __repr__(self) -> str:
+        """Return a short description of the storage.
+
+        :return: The representation.
+        :rtype: str
+        """
+        return (
+            f"{type(self).__qualname__}(<{len(self)} elements in "
+            f"{len(self._shards)} shards>, order={self._order!r})"
+        )
+
+
+BudgetUnit = Literal["chars", "bytes"]
+
+
+def _utf8_len(text: str) -> int:
+    """Return the UTF-8 encoded size of text, without encoding ASCII text.
+
+    :param text: The fragment to measure.
+    :type text: str
+
+    :return: The size in bytes.
+    :rtype: int
+    """
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-8", "surrogatepass"))
+
+
+class BoundedStorage:
+    """Deque-like storage of str fragments that evicts the oldest to stay bounded.
+
+    ``maxlen`` bounds the number of fragments, like ``deque(maxlen=...)``.
+    ``budget`` bounds their total size, in characters or, with ``unit="bytes"``,
+    UTF-8 encoded bytes; separators are not counted. The running total is
+    updated on every append and removal, so enforcing the budget costs O(1) per
+    fragment added or evicted. The newest fragment is always kept, even when it
+    alone is over the budget.
+
+    ``ttl`` expires fragments that many seconds after they were appended. The
+    append time of each fragment is kept in a parallel ``array`` of monotonic
+    nanoseconds, which only grows on the right, so expired fragments are always
+    a prefix: every append and read drops it from the left, amortized O(1) per
+    expired fragment. Replacing a fragment keeps its
+    append time.
+
+    :param data: Initial fragments, defaults to ()
+    :type data: Iterable[str]
+    :param maxlen: Maximum number of fragments, None for no count limit.
+    :type maxlen: int | None
+    :param budget: Maximum total size of the fragments, None for no size limit.
+    :type budget: int | None
+    :param unit: What budget counts, "chars" or "bytes", defaults to "chars"
+    :type unit: BudgetUnit
+    :param ttl: Seconds a fragment lives, None to keep fragments until evicted.
+    :type ttl: float | None
+    :param clock: Monotonic clock in nanoseconds, defaults to
+        ``time.monotonic_ns``
+    :type clock: Callable[[], int]
+    """
+
+    __slots__ = (
+        "_budget",
+        "_clock",
+        "_count_limit",
+        "_data",
+        "_maxlen",
+        "_measure",
+        "_size_limit",
+        "_stamp_head",
+        "_stamps",
+        "_total",
+        "_ttl",
+        "_ttl_ns",
+        "_unit",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        data: Iterable[str] = (),
+        maxlen: int | None = None,
+        budget: int | None = None,
+        unit: BudgetUnit = "chars",
+        *,
+        ttl: float | None = None,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ) -> None:
+        """Initialize an empty storage and extend it with ``data``.
+
+        :param data: Initial fragments, defaults to ()
+        :type data: Iterable[str]
+        :param maxlen: Maximum number of fragments, None for no count limit.
+        :type maxlen: int | None
+        :param budget: Maximum total size of the fragments, None for no size
+            limit.
+        :type budget: int | None
+        :param unit: What budget counts, "chars" or "bytes".
+        :type unit: BudgetUnit
+        :param ttl: Seconds a fragment lives, None to keep fragments until
+            evicted.
+        :type ttl: float | None
+        :param clock: Monotonic clock in nanoseconds.
+        :type clock: Callable[[], int]
+
+        :raises ValueError: If maxlen or budget is negative, ttl is not
+            positive, or unit is not "chars" or "bytes".
+        """
+        if maxlen is not None and maxlen < 0:
+            msg = "maxlen must be non-negative"
+            raise ValueError(msg)
+        if budget is not None and budget < 0:
+            msg = "budget must be non-negative"
+            raise ValueError(msg)
+        if ttl is not None and ttl <= 0:
+            msg = "ttl must be positive"
+            raise ValueError(msg)
+        if unit not in {"chars", "bytes"}:
+            msg = f"unit must be 'chars' or 'bytes', not {unit!r}"
+            raise ValueError(msg)
+        self._maxlen = maxlen
+        self._budget = budget
+        # plain ints, so the limits are checked without None tests
+        self._count_limit = sys.maxsize if maxlen is None else maxlen
+        self._size_limit = sys.maxsize if budget is None else budget
+        self._unit = unit
+        self._measure = len if unit == "chars" else _utf8_len
+        self._ttl = ttl
+        # 0 when fragments do not expire
+        self._ttl_ns = 0 if ttl is None else max(round(ttl * 1e9), 1)
+        self._clock = clock
+        self._data: deque[str] = deque()
+        self._total = 0
+        # append times, the live ones start at _stamp_head
+        self._stamps = array("q")
+        self._stamp_head = 0
+        self.extend(data)
+
+    @property
+    def maxlen(self) -> int | None:
+        """Maximum number of fragments, None for no count limit.
+
+        :return: The count limit.
+        :rtype: int | None
+        """
+        return self._maxlen
+
+    @property
+    def budget(self) -> int | None:
+        """Maximum total size of the fragments, None for no size limit.
+
+        :return: The size limit.
+        :rtype: int | None
+        """
+        return self._budget
+
+    @property
+    def unit(self) -> BudgetUnit:
+        """What the budget counts, "chars" or "bytes".
+
+        :return: The unit.
+        :rtype: BudgetUnit
+        """
+        return self._unit
+
+    @property
+    def ttl(self) -> float | None:
+        """Seconds a fragment lives, None if fragments do not expire.
+
+        :return: The time to live.
+        :rtype: float | None
+        """
+        return self._ttl
+
+    @property
+    def total(self) -> int:
+        """Total size of the live fragments, in :attr:`unit`.
+
+        :return: The running total.
+        :rtype: int
+        """
+        if self._ttl_ns:
+            self._expire()
+        return self._total
+
+    def _drop_stamps(self, count: int) -> None:
+        """Forget the append times of fragments removed from the left.
+
+        The array is compacted once at least half of it is dead, so each
+        removal costs amortized O(1).
+
+        :param count: The number of fragments removed.
+        :type count: int
+        """
+        self._stamp_head += count
+        if self._stamp_head * 2 >= len(self._stamps):
+            del self._stamps[: self._stamp_head]
+            self._stamp_head = 0
+
+    def _expire(self) -> int:
+        """Drop the expired fragments from the left.
+
+        :return: The current time of the clock.
+        :rtype: int
+        """
+        now = self._clock()
+        stamps = self._stamps
+        head = self._stamp_head
+        cutoff = now - self._ttl_ns
+        if head < len(stamps) and stamps[head] <= cutoff:
+            # scanned rather than bisected, each expired fragment is visited once
+            end = head + 1
+            size = len(stamps)
+            while end < size and stamps[end] <= cutoff:
+                end += 1
+            data = self._data
+            measure = self._measure
+            total = self._total
+            for _ in range(end - head):
+                total -= measure(data.popleft())
+            self._total = total
+            self._drop_stamps(end - head)
+        return now
+
+    def _evict(self) -> None:
+        """Drop fragments from the left until both limits hold."""
+        data = self._data
+        count_limit = self._count_limit
+        size_limit = self._size_limit
+        measure = self._measure
+        total = self._total
+        evicted = 0
+        while len(data) > count_limit or (total > size_limit and len(data) > 1):
+            total -= measure(data.popleft())
+            evicted += 1
+        self._total = total
+        if evicted and self._ttl_ns:
+            self._drop_stamps(evicted)
+
+    def append(self, item: str) -> None:
+        """Add a fragment to the right side, evicting from the left if needed.
+
+        :param item: The fragment to add.
+        :type item: str
+
+        :raises TypeError: If item is not a str.
+        """
+        if not isinstance(item, str):
+            msg = f"{type(self).__qualname__} can only store str, not {type(item)!r}"
+            raise TypeError(msg)
+        if self._ttl_ns:
+            self._stamps.append(self._expire())
+        data = self._data
+        data.append(item)
+        self._total += self._measure(item)
+        if len(data) > self._count_limit or self._total > self._size_limit:
+            self._evict()
+
+    def extend(self, items: Iterable[str]) -> None:
+        """Add fragments to the right side, evicting from the left if needed.
+
+        :param items: The fragments to add.
+        :type items: Iterable[str]
+        """
+        append = self.append
+        for item in items:
+            append(item)
+
+    def clear(self) -> None:
+        """Remove all fragments."""
+        self._data.clear()
+        self._total = 0
+        self._stamps = array("q")
+        self._stamp_head = 0
+
+    def __len__(self) -> int:
+        """Return the number of live fragments.
+
+        :return: The number of fragments.
+        :rtype: int
+        """
+        if self._ttl_ns:
+            self._expire()
+        return len(self._data)
+
+    def __getitem__(self, key: SupportsIndex) -> str:
+        """Return the fragment at key.
+
+        :param key: The index of the fragment.
+        :type key: SupportsIndex
+
+        :return: The fragment.
+        :rtype: str
+        """
+        if self._ttl_ns:
+            self._expire()
+        return self._data[key]
+
+    def __setitem__(self, key: SupportsIndex, value: str) -> None:
+        """Replace the fragment at key, evicting from the left if needed.
+
+        :param key: The index of the fragment.
+        :type key: SupportsIndex
+        :param value: The new fragment.
+        :type value: str
+
+        :raises TypeError: If value is not a str.
+        """
+        if not isinstance(value, str):
+            msg = f"{type(self).__qualname__} can only store str, not {type(value)!r}"
+            raise TypeError(msg)
+        if self._ttl_ns:
+            self._expire()
+        old = self._data[key]
+        self._data[key] = value
+        self._total += self._measure(value) - self._measure(old)
+        self._evict()
+
+    def __delitem__(self, key: SupportsIndex) -> None:
+        """Remove the fragment at key.
+
+        :param key: The index of the fragment.
+        :type key: SupportsIndex
+        """
+        if self._ttl_ns:
+            self._expire()
+        data = self._data
+        index = operator.index(key)
+        if index < 0:
+            index += len(data)
+        self._total -= self._measure(data[index])
+        del data[index]
+        if self._ttl_ns:
+            del self._stamps[self._stamp_head + index]
+
+    def pop(self) -> str:
+        """Remove and return the rightmost live fragment.
+
+        :return: The removed fragment.
+        :rtype: str
+        """
+        if self._ttl_ns:
+            self._expire()
+        item = self._data.pop()
+        self._total -= self._measure(item)
+        if self._ttl_ns:
+            self._stamps.pop()
+        return item
+
+    def popleft(self) -> str:
+        """Remove and return the leftmost live fragment.
+
+        :return: The removed fragment.
+        :rtype: str
+        """
+        if self._ttl_ns:
+            self._expire()
+        item = self._data.popleft()
+        self._total -= self._measure(item)
+        if self._ttl_ns:
+            self._drop_stamps(1)
+        return item
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the live fragments from left to right.
+
+        :return: An iterator over the fragments.
+        :rtype: Iterator[str]
+        """
+        if self._ttl_ns:
+            self._expire()
+        return iter(self._data)
+
+    def __reversed__(self) -> Iterator[str]:
+        """Iterate over the live fragments from right to left.
+
+        :return: A reverse iterator over the fragments.
+        :rtype: Iterator[str]
+        """
+        if self._ttl_ns:
+            self._expire()
+        return reversed(self._data)
+
+    def __contains__(self, item: object) -> bool:
+        """Return true if item is a live fragment.
+
+        :param item: The value to look for.
+        :type item: object
+
+        :return: True if item is stored, False otherwise.
+        :rtype: bool
+        """
+        if self._ttl_ns:
+            self._expire()
+        return item in self._data
+
+    def __repr__(self) -> str:
+        """Return a short description of the storage.
+
+        :return: The representation.
+        :rtype: str
+        """
+        ttl = "" if self._ttl is None else f", ttl={self._ttl}"
+        return (
+            f"{type(self).__qualname__}(<{len(self._data)} fragments, "
+            f"{self._total} {self._unit}>, maxlen={self._maxlen}, "
+            f"budget={self._budget}{ttl})"
+        )
+
+
+class BlockStorage(Generic[T]):  # noqa: UP046
+    """Deque-like storage in fixed-size blocks, indexed in O(1).
+
+    Elements are kept in lists of ``block_size``. Only the first block has free
+    slots at its start (after removals from the left) and only the last at its
+    end, so the block and slot of any position are one ``divmod`` away, where
+    ``collections.deque`` walks its blocks in from the nearer end. Appends and
+    removals at either end are O(1); removing from the middle shifts the
+    elements on the shorter side, O(n) as for a deque.
+
+    :param data: Initial elements, defaults to ()
+    :type data: Iterable[T]
+    :param block_size: Number of elements per block, defaults to
+        DEFAULT_BLOCK_SIZE
+    :type block_size: int
+    """
+
+    __slots__ = ("_block_size", "_blocks", "_head", "_len")
+
+    def __init__(
+        self,
+        data: Iterable[T] = (),
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        """Initialize an empty storage and extend it with ``data``.
+
+        :param data: Initial elements, defaults to ()
+        :type data: Iterable[T]
+        :param block_size: Number of elements per block.
+        :type block_size: int
+
+        :raises ValueError: If block_size is not positive.
+        """
+        if block_size <= 0:
+            msg = "block_size must be positive"
+            raise ValueError(msg)
+        self._block_size = block_size
+        # slots of the first block before _head are removed elements, set to None
+        self._blocks: list[list[Any]] = []
+        self._head = 0
+        self._len = 0
+        self.extend(data)
+
+    def _locate(self, key: SupportsIndex) -> tuple[list[Any], int]:
+        """Find the block and slot of a (possibly negative) index.
+
+        :param key: The index.
+        :type key: SupportsIndex
+
+        :return: The block and the position of the element within it.
+        :rtype: tuple[list[Any], int]
+
+        :raises IndexError: If the index is out of range.
+        """
+        index = operator.index(key)
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            msg = "deque index out of range"
+            raise IndexError(msg)
+        block, slot = divmod(index + self._head, self._block_size)
+        return self._blocks[block], slot
+
+    def append(self, item: T) -> None:
+        """Add an element to the right side.
+
+        :param item: The element to add.
+        :type item: T
+        """
+        blocks = self._blocks
+        if blocks and len(blocks[-1]) < self._block_size:
+            blocks[-1].append(item)
+        else:
+            blocks.append([item])
+        self._len += 1
+
+    def extend(self, items: Iterable[T]) -> None:
+        """Add elements to the right side, a block at a time.
+
+        :param items: The elements to add.
+        :type items: Iterable[T]
+        """
+        iterator = iter(items)
+        blocks = self._blocks
+        size = self._block_size
+        if blocks and len(blocks[-1]) < size:
+            fill = list(islice(iterator, size - len(blocks[-1])))
+            blocks[-1].extend(fill)
+            self._len += len(fill)
+        while block := list(islice(iterator, size)):
+            blocks.append(block)
+            self._len += len(block)
+
+    def clear(self) -> None:
+        """Remove all elements."""
+        self._blocks = []
+        self._head = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        """Return the number of elements.
+
+        :return: The number of elements.
+        :rtype: int
+        """
+        return self._len
+
+    def __getitem__(self, key: SupportsIndex) -> T:
+        """Return the element at key.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+
+        :return: The element.
+        :rtype: T
+        """
+        block, slot = self._locate(key)
+        return block[slot]  # type: ignore[no-any-return]
+
+    def __setitem__(self, key: SupportsIndex, value: T) -> None:
+        """Replace the element at key.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+        :param value: The new element.
+        :type value: T
+        """
+        block, slot = self._locate(key)
+        block[slot] = value
+
+    def __delitem__(self, key: SupportsIndex) -> None:
+        """Remove the element at key, shifting the shorter side by one.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+        """
+        index = operator.index(key)
+        if index < 0:
+            index += self._len
+        self._locate(index)
+        if index < self._len // 2:
+            for pos in range(index, 0, -1):
+                self[pos] = self[pos - 1]
+            self.popleft()
+        else:
+            for pos in range(index, self._len - 1):
+                self[pos] = self[pos + 1]
+            self.pop()
+
+    def pop(self) -> T:
+        """Remove and return the rightmost element.
+
+        :return: The removed element.
+        :rtype: T
+        """
+        if not self._len:
+            msg = "pop from an empty deque"
+            raise IndexError(msg)
+        last = self._blocks[-1]
+        item = last.pop()
+        self._len -= 1
+        if not self._len:
+            self.clear()
+        elif not last:
+            self._blocks.pop()
+        return item  # type: ignore[no-any-return]
+
+    def popleft(self) -> T:
+        """Remove and return the leftmost element.
+
+        :return: The removed element.
+        :rtype: T
+        """
+        if not self._len:
+            msg = "pop from an empty deque"
+            raise IndexError(msg)
+        first = self._blocks[0]
+        item = first[self._head]
+        first[self._head] = None
+        self._head += 1
+        self._len -= 1
+        if not self._len:
+            self.clear()
+        elif self._head == len(first):
+            del self._blocks[0]
+            self._head = 0
+        return item  # type: ignore[no-any-return]
+
+    def iter_range(self, start: int, stop: int) -> Iterator[T]:
+        """Iterate over the elements at positions ``start <= i < stop``.
+
+        :param start: The first position, ``0 <= start <= stop``.
+        :type start: int
+        :param stop: The position after the last, at most ``len(self)``.
+        :type stop: int
+
+        :return: An iterator over the elements.
+        :rtype: Iterator[T]
+        """
+        block, slot = divmod(self._head + start, self._block_size)
+        remaining = stop - start
+        while remaining > 0:
+            elements = self._blocks[block][slot : slot + remaining]
+            yield from elements
+            remaining -= len(elements)
+            block += 1
+            slot = 0
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over the elements from left to right.
+
+        :return: An iterator over the elements.
+        :rtype: Iterator[T]
+        """
+        return self.iter_range(0, self._len)
+
+    def __reversed__(self) -> Iterator[T]:
+        """Iterate over the elements from right to left.
+
+        :return: A reverse iterator over the elements.
+        :rtype: Iterator[T]
+        """
+        blocks = self._blocks
+        for block in range(len(blocks) - 1, 0, -1):
+            yield from reversed(blocks[block])
+        if blocks:
+            yield from reversed(blocks[0][self._head :])
+
+    def __contains__(self, item: object) -> bool:
+        """Return True if an element equals item.
+
+        :param item: The value to look for.
+        :type item: object
+
+        :return: True if item is stored, False otherwise.
+        :rtype: bool
+        """
+        blocks = self._blocks
+        if not blocks:
+            return False
+        return item in blocks[0][self._head :] or any(
+            item in block for block in islice(blocks, 1, None)
+        )
+
+    def __repr__(self) -> str:
+        """Return a short description of the storage.
+
+        :return: The representation.
+        :rtype: str
+        """
+        return (
+            f"{type(self).__qualname__}(<{self._len} elements in "
+            f"{len(self._blocks)} blocks>, block_size={self._block_size})"
+        )
+
+
+class PrefixView(Generic[T]):  # noqa: UP046
+    """Read-only view of the first ``count`` elements of another storage.
+
+    The view shares the storage, so creating it is O(1), and stays valid while
+    elements are appended to the storage. Elements are read in batches taken by
+    ``itertools.islice`` in a single call, so an append from another thread can
+    only land between batches; if it invalidates the storage's iterator (as it
+    does for ``collections.deque``), iteration resumes at the same position.
+    Before any element inside the prefix is removed from the storage, call
+    :meth:`detach` to give the view its own copy.
+
+    :param data: The storage to view.
+    :type data: DequeLike[T]
+    :param count: The number of leading elements covered by the view.
+    :type count: int
+    """
+
+    __slots__ = ("__weakref__", "_count", "_data")
+
+    def __init__(self, data: DequeLike[T], count: int) -> None:
+        """Initialize the view.
+
+        :param data: The storage to view.
+        :type data: DequeLike[T]
+        :param count: The number of leading elements covered by the view.
+        :type count: int
+
+        :raises ValueError: If count is negative or larger than the storage.
+        """
+        if not 0 <= count <= len(data):
+            msg = f"count must be between 0 and {len(data)}, not {count}"
+            raise ValueError(msg)
+        self._data: DequeLike[T] | tuple[T, ...] = data
+        self._count = count
+
+    @property
+    def shared(self) -> bool:
+        """Whether the view still reads from the storage it was created on.
+
+        :return: False once :meth:`detach` has copied the prefix.
+        :rtype: bool
+        """
+        return not isinstance(self._data, tuple)
+
+    def detach(self) -> None:
+        """Copy the prefix, so the storage may be changed without affecting it."""
+        if self.shared:
+            self._data = tuple(islice(self._data, self._count))
+
+    def _read_only(self) -> NoReturn:
+        """Reject a mutation.
+
+        :raises NotImplementedError: Always.
+        """
+        msg = f"{type(self).__qualname__} is read-only"
+        raise NotImplementedError(msg)
+
+    def append(self, item: T) -> None:  # noqa: ARG002
+        """Reject appends, the view is read-only.
+
+        :param item: The element that would be appended.
+        :type item: T
+        """
+        self._read_only()
+
+    def extend(self, items: Iterable[T]) -> None:  # noqa: ARG002
+        """Reject appends, the view is read-only.
+
+        :param items: The elements that would be appended.
+        :type items: Iterable[T]
+        """
+        self._read_only()
+
+    def clear(self) -> None:
+        """Reject clearing, the view is read-only."""
+        self._read_only()
+
+    def __setitem__(self, key: SupportsIndex, value: T) -> None:
+        """Reject replacing an element, the view is read-only.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+        :param value: The new element.
+        :type value: T
+        """
+        self._read_only()
+
+    def __delitem__(self, key: SupportsIndex) -> None:
+        """Reject removing an element, the view is read-only.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+        """
+        self._read_only()
+
+    def __len__(self) -> int:
+        """Return the number of elements in the view.
+
+        :return: The number of elements.
+        :rtype: int
+        """
+        return self._count
+
+    def __getitem__(self, key: SupportsIndex) -> T:
+        """Return the element at key.
+
+        :param key: The index of the element.
+        :type key: SupportsIndex
+
+        :raises IndexError: If key is outside the view.
+
+        :return: The element.
+        :rtype: T
+        """
+        index = operator.index(key)
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            msg = f"{type(self).__qualname__} index out of range"
+            raise IndexError(msg)
+        return self._data[index]
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over the elements from left to right.
+
+        :raises RuntimeError: If the storage's iterator keeps failing without
+            yielding anything, or the storage lost elements of the view.
+
+        :return: An iterator over the elements.
+        :rtype: Iterator[T]
+        """
+        position = 0
+        count = self._count
+        stalled = False
+        while position < count:
+            elements = islice(self._data, position, count)
+            try:
+                while batch := list(islice(elements, _VIEW_BATCH)):
+                    position += len(batch)
+                    stalled = False
+                    yield from batch
+            except RuntimeError:
+                # a second failure in a row without progress is not a mutation
+                if stalled:
+                    raise
+                stalled = True
+            else:
+                if position < count:
+                    msg = "storage is shorter than the view, elements were removed"
+                    raise RuntimeError(msg)
+
+    def __reversed__(self) -> Iterator[T]:
+        """Iterate over the elements from right to left.
+
+        :return: A reverse iterator over the elements.
+        :rtype: Iterator[T]
+        """
+        return reversed(list(self))
+
+    def __contains__(self, item: object) -> bool:
+        """Return true if an element of the view equals item.
+
+        :param item: The value to look for.
+        :type item: object
+
+        :return: True if item is in the view, False otherwise.
+        :rtype: bool
+        """
+        return any(element == item for element in self)
+
+    def __repr__(self) -> str:
+        """Return a short description of the view.
+
+        :return: The representation.
+        :rtype: str
+        """
+        state = "shared" if self.shared else "detached"
+        return f"{type(self).__qualname__}(<{self._count} elements, {state}>)"
@@ -1,10 +1,23 @@
 """Holds StringDeque class as well as several implementations of it."""
 
+import codecs
+import io
+import socket
 import sys
+import types
+import weakref
 from collections import deque
 from collections.abc import Callable
+from collections.abc import Generator
+from collections.abc import Iterable
+from collections.abc import Iterator
 from collections.abc import Sequence
+from functools import partial
+from itertools import islice
+from pathlib import Path
 from typing import Any
+from typing import AnyStr
+from typing import ClassVar
 from typing import Generic
 from typing import Self
 from typing import SupportsIndex
@@ -16,8 +29,28 @@ from beartype import BeartypeConf  # pyright: ignore[reportUnknownVariableType]
 from beartype import BeartypeStrategy  # pyright: ignore[reportUnknownVariableType]
 from beartype import beartype  # pyright: ignore[reportUnknownVariableType]
 
+from .ndarray import extend_str
+from .ndarray import is_ndarray
+from .parallel import ParallelRender
 from .protocols import Builtin_or_DefinesDunderStr
+from .protocols import DequeLike
 from .protocols import SequenceNonStr
+from .protocols import SupportsDrain
+from .protocols import SupportsRange
+from .protocols import SupportsWrite
+from .storage import DEFAULT_MEMORY_LIMIT
+from .storage import BoundedStorage
+from .storage import BudgetUnit
+from .storage import PrefixView
+from .storage import ShardedStorage
+from .storage import ShardOrder
+from .storage import Side
+from .storage import SpillStorage
+from .typecheck import typechecked
+from .vectorio import COALESCE_BELOW
+from .vectorio import SupportsFileno
+from .vectorio import interleave
+from .vectorio import writev_all
 
 T = TypeVar("T")
 DataType = TypeVar("DataType")
@@ -27,6 +60,97 @@ ConvertibleToDataType = TypeVar("ConvertibleToDataType")
 # for name of caller of caller of current func, specify 2. etc.
 current_func_name = lambda n=0: sys._getframe(n + 1).f_code.co_name  # pyright: ignore[reportPrivateUsage]  # noqa: E731, SLF001
 nobeartype: Any = beartype(conf=BeartypeConf(strategy=BeartypeStrategy.O0))  # pyright: ignore[reportUnknownVariableType]
+# characters per piece when walking the rendered output without joining it whole
+DEFAULT_RENDER_CHUNK_SIZE = 64 * 1024
+# codecs whose output for a fragment does not depend on what was encoded before it
+_STATELESS_ENCODINGS = frozenset({"ascii", "iso8859-1", "utf-8"})
+# elements formatted and encoded per step by flush_to
+_ENCODE_BATCH = 1024
+# tails kept by a CircularStringDeque, one per distinct request
+_TAIL_CACHE_SIZE = 8
+
+# a tail request: mode ("items" or "chars"), count, separator, format function
+TailKey = tuple[str, int, str, Callable[[str], str]]
+# elements covered (right to left), lowest and highest ring length, result
+TailEntry = tuple[tuple[str, ...], int, int, str]
+
+
+@types.coroutine
+def _yield_to_loop() -> Generator[None]:
+    """Suspend once so the event loop can run other tasks.
+
+    This is what ``asyncio.sleep(0)`` does, without importing asyncio.
+
+    :return: A generator-based coroutine.
+    :rtype: Generator[None]
+    """
+    yield
+
+
+def _is_single(data: object) -> bool:
+    """Return true if data is one item rather than a collection of items.
+
+    Strings count as one item; sequences and NumPy arrays are collections.
+
+    :param data: The data passed to ``__init__`` or ``insert``.
+    :type data: object
+
+    :return: True if data should be stored as a single element.
+    :rtype: bool
+    """
+    if isinstance(data, str):
+        return True
+    return not isinstance(data, Sequence) and not is_ndarray(data)
+
+
+def search_rendered(  # noqa: UP047
+    render: Callable[[int], Iterable[AnyStr]],
+    needle: AnyStr,
+    empty: AnyStr,
+) -> bool:
+    """Return true if needle occurs in the output of a piecewise renderer.
+
+    The pieces are searched carrying the last ``len(needle) - 1`` characters (or
+    bytes) across piece boundaries, so the joined output is never built.
+
+    :param render: Yields the output in pieces of at most the given size.
+    :type render: Callable[[int], Iterable[AnyStr]]
+    :param needle: The text or bytes to look for.
+    :type needle: AnyStr
+    :param empty: The empty value of the needle's type, ``""`` or ``b""``.
+    :type empty: AnyStr
+
+    :return: True if needle is found, False otherwise.
+    :rtype: bool
+    """
+    if not needle:
+        return True
+    overlap = len(needle) - 1
+    carry = empty
+    for piece in render(max(DEFAULT_RENDER_CHUNK_SIZE, 2 * len(needle))):
+        window = carry + piece
+        if needle in window:
+            return True
+        carry = window[len(window) - overlap :]
+    return False
+
+
+def _is_binary_writable(file: object) -> bool:
+    """Guess whether a writable expects bytes rather than str.
+
+    :param file: The file-like object.
+    :type file: object
+
+    :return: True if data written to file should be bytes.
+    :rtype: bool
+    """
+    if isinstance(file, io.TextIOBase):
+        return False
+    if isinstance(file, io.RawIOBase | io.BufferedIOBase):
+        return True
+    mode = getattr(file, "mode", "")
+    return isinstance(mode, str) and "b" in mode
+
 
 # import re
 
@@ -58,7 +182,7 @@ class InMatch(str):
 
 
 # NOTE skip type checking on _add and _or for speed
-@beartype
+@typechecked
 class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
     """A generic class representing a deque of data that can be formatted as a string.
 
@@ -71,9 +195,29 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
     :param sep: The separator to join elements when converting to a string.
         defaults to ''
     :type sep: str
+    :param storage: Factory for the container holding the elements,
+        defaults to collections.deque
+    :type storage: Callable[[], DequeLike[DataType]]
     """
 
-    __slots__ = ("_data", "convert_func", "format_func", "sep")
+    __slots__ = (
+        "_data",
+        "_format_func",
+        "_parallel",
+        "_rendered",
+        "_rendered_count",
+        "_sep",
+        "convert_func",
+    )
+
+    # Whether str() may reuse and extend the previously rendered string. Subclasses
+    # whose storage can drop elements on its own (e.g. a bounded deque) or whose
+    # rendered output must not linger in memory should disable this.
+    _cache_render: ClassVar[bool] = True
+
+    # makes NumPy operators return NotImplemented, so ``array | deque`` reaches
+    # __ror__ instead of being broadcast over the array
+    __array_ufunc__: ClassVar[None] = None
 
     @overload
     def __init__(
@@ -82,6 +226,7 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         format_func: Callable[[DataType], str],
         data: SequenceNonStr[ConvertibleToDataType] | None = None,
         sep: str = "",
+        storage: Callable[[], DequeLike[DataType]] = deque,
     ) -> None: ...
 
     @overload
@@ -91,6 +236,7 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         format_func: Callable[[DataType], str],
         data: ConvertibleToDataType | None = None,
         sep: str = "",
+        storage: Callable[[], DequeLike[DataType]] = deque,
     ) -> None: ...
 
     def __init__(
@@ -101,6 +247,7 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         | ConvertibleToDataType
         | None = None,
         sep: str = "",
+        storage: Callable[[], DequeLike[DataType]] = deque,
     ) -> None:
         """Initialize the StringDataDeque.
 
@@ -119,33 +266,153 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         :param sep: A separator to be used when displaying the data.
         :type sep: str
 
+        :param storage: Factory for the container holding the elements, for example
+            RopeStorage to pack str fragments. Defaults to collections.deque.
+        :type storage: Callable[[], DequeLike[DataType]]
+
         :return: None
         :rtype: None
         """
-        self._data: deque[DataType] = deque()
+        self._data: DequeLike[DataType] = storage()
+        self._rendered: str | None = None
+        self._rendered_count = 0
+        self._parallel: ParallelRender | None = None
         self.convert_func = convert_func
-        self.format_func = format_func
+        self._format_func = format_func
         if data is not None:
-            if isinstance(data, str) or not isinstance(data, Sequence):
+            if _is_single(data):
                 self._data.append(
                     self.convert_func(cast("ConvertibleToDataType", data))
                 )
             else:
-                data_mapped = map(
-                    self.convert_func,
+                self._extend_converted(
                     cast("Sequence[ConvertibleToDataType]", data),
                 )
-                self._data.extend(data_mapped)
-        self.sep = sep
+        self._sep = sep
+
+    @property
+    def sep(self) -> str:
+        """Separator used to join elements when converting to a string.
+
+        :return: The separator.
+        :rtype: str
+        """
+        return self._sep
+
+    @sep.setter
+    def sep(self, value: str) -> None:
+        """Set the separator, discarding the render cache if it changed.
+
+        :param value: The new separator.
+        :type value: str
+        """
+        if value != self._sep:
+            self._rendered = None
+        self._sep = value
+
+    @property
+    def format_func(self) -> Callable[[DataType], str]:
+        """Function used to format each element as a string.
+
+        :return: The format function.
+        :rtype: Callable[[DataType], str]
+        """
+        return self._format_func
+
+    @format_func.setter
+    def format_func(self, value: Callable[[DataType], str]) -> None:
+        """Set the format function and discard the render cache.
+
+        :param value: The new format function.
+        :type value: Callable[[DataType], str]
+        """
+        self._rendered = None
+        self._format_func = value
+
+    @property
+    def parallel(self) -> ParallelRender | None:
+        """Settings for rendering on a worker pool, None renders serially.
+
+        :return: The parallel render settings.
+        :rtype: ParallelRender | None
+        """
+        return self._parallel
+
+    @parallel.setter
+    def parallel(self, value: ParallelRender | None) -> None:
+        """Enable or disable parallel rendering.
+
+        :param value: The settings, or None to render serially.
+        :type value: ParallelRender | None
+        """
+        self._parallel = value
+
+    def _join(self, items: Iterable[DataType], count: int, sep: str) -> str:
+        """Format items and join them with sep, on a pool if parallel is set.
+
+        :param items: The elements to render, in order.
+        :type items: Iterable[DataType]
+        :param count: The number of elements in items.
+        :type count: int
+        :param sep: The separator placed between elements.
+        :type sep: str
+
+        :return: The rendered string.
+        :rtype: str
+        """
+        parallel = self._parallel
+        if parallel is None:
+            return sep.join(map(self._format_func, items))
+        return parallel.render(items, count, self._format_func, sep)
+
+    def _extend_converted(self, items: Iterable[ConvertibleToDataType]) -> None:
+        """Convert items with convert_func and append them.
+
+        NumPy arrays are converted in bulk when convert_func is ``str`` (see
+        :func:`~stringdatadeque.ndarray.extend_str`).
+
+        :param items: The items to convert and append.
+        :type items: Iterable[ConvertibleToDataType]
+        """
+        if (
+            self.convert_func is str
+            and is_ndarray(items)
+            and extend_str(cast("DequeLike[str]", self._data), items)
+        ):
+            return
+        self._data.extend(map(self.convert_func, items))
+
+    def _invalidate(self) -> None:
+        """Discard the cached rendering after a non-append mutation."""
+        self._rendered = None
 
     @nobeartype
     def __str__(self) -> str:
         """Return string joined by sep.
 
+        Appends only extend the cached rendering, so repeatedly rendering a growing
+        deque formats each element once.
+
         :return: A string representation of the object.
         :rtype: str
         """
-        return self.sep.join(map(self.format_func, self._data))
+        data = self._data
+        count = len(data)
+        if not self._cache_render:
+            return self._join(data, count, self._sep)
+        rendered = self._rendered
+        new_count = count - self._rendered_count
+        if rendered is None or new_count < 0:
+            rendered = self._join(data, count, self._sep)
+        elif new_count:
+            # walk in from the right so only the new elements are visited
+            tail = list(islice(reversed(data), new_count))
+            tail.reverse()
+            joined = self._join(tail, new_count, self._sep)
+            rendered = f"{rendered}{self._sep}{joined}" if new_count < count else joined
+        self._rendered = rendered
+        self._rendered_count = count
+        return rendered
 
     def __format__(self, format_spec: str) -> str:
         """Format string with sep override.
@@ -158,13 +425,8 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         """
         match InMatch(format_spec):
             case "sep=":
-                old_sep, self.sep = (
-                    self.sep,
-                    format_spec.partition("sep=")[2].strip("'\""),
-                )
-                ret = str(self)
-                self.sep = old_sep
-                return ret
+                sep = format_spec.partition("sep=")[2].strip("'\"")
+                return self._join(self._data, len(self._data), sep)
             case _:
                 return str(self).__format__(format_spec)
 
@@ -174,10 +436,293 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         :param key: The key to check for in the data structure.
         :type key: DataType
 
+        The string representation is searched piece by piece, carrying the last
+        ``len(needle) - 1`` characters across piece boundaries, so the joined string
+        is never built.
+
         :return: True if the key is found in the data structure, False otherwise.
         :rtype: bool
         """
-        return True if (key in self._data) else (self.format_func(key) in str(self))
+        if key in self._data:
+            return True
+        needle = self._format_func(key)
+        rendered = self._rendered
+        if rendered is not None and self._rendered_count == len(self._data):
+            return needle in rendered
+        return search_rendered(partial(self._iter_rendered, self._sep), needle, "")
+
+    def _iter_rendered(self, sep: str, chunk_size: int) -> Iterator[str]:
+        """Yield the sep-joined output in pieces of at most ``chunk_size`` characters.
+
+        Concatenating the pieces gives the same text as ``sep.join`` over the
+        formatted elements, while only about one piece is held at a time.
+
+        :param sep: The separator placed between formatted elements.
+        :type sep: str
+        :param chunk_size: Maximum number of characters per piece.
+        :type chunk_size: int
+
+        :return: An iterator over the pieces.
+        :rtype: Iterator[str]
+        """
+        format_func = self._format_func
+        buffer: list[str] = []
+        size = 0
+        first = True
+        for item in self._data:
+            text = format_func(item)
+            if first:
+                first = False
+            elif sep:
+                buffer.append(sep)
+                size += len(sep)
+            buffer.append(text)
+            size += len(text)
+            if size >= chunk_size:
+                joined = "".join(buffer)
+                end = size - size % chunk_size
+                for start in range(0, end, chunk_size):
+                    yield joined[start : start + chunk_size]
+                rest = joined[end:]
+                buffer = [rest]
+                size = len(rest)
+        if size:
+            yield "".join(buffer)
+
+    def iter_chunks(
+        self,
+        chunk_size: int = DEFAULT_RENDER_CHUNK_SIZE,
+        sep: str | None = None,
+    ) -> Iterator[str]:
+        """Yield the string representation in bounded-size pieces.
+
+        Joining the pieces gives ``str(self)``, but only about one piece is held
+        in memory at a time.
+
+        :param chunk_size: Maximum number of characters per piece,
+            defaults to DEFAULT_RENDER_CHUNK_SIZE
+        :type chunk_size: int
+        :param sep: Separator override, defaults to None (use self.sep)
+        :type sep: str | None
+
+        :return: An iterator over the pieces.
+        :rtype: Iterator[str]
+
+        :raises ValueError: If chunk_size is not positive.
+        """
+        if chunk_size <= 0:
+            msg = "chunk_size must be positive"
+            raise ValueError(msg)
+        return self._iter_rendered(self._sep if sep is None else sep, chunk_size)
+
+    def write_to(
+        self,
+        file: SupportsWrite,
+        chunk_size: int = DEFAULT_RENDER_CHUNK_SIZE,
+        encoding: str = "utf-8",
+        sep: str | None = None,
+    ) -> int:
+        """Stream the string representation into a text or binary writable.
+
+        Binary targets (``io.RawIOBase``/``io.BufferedIOBase`` or a ``mode``
+        containing ``"b"``) receive the pieces encoded with an incremental encoder.
+
+        :param file: The writable to send the output to.
+        :type file: SupportsWrite
+        :param chunk_size: Maximum number of characters per write,
+            defaults to DEFAULT_RENDER_CHUNK_SIZE
+        :type chunk_size: int
+        :param encoding: Encoding used for binary targets, defaults to 'utf-8'
+        :type encoding: str
+        :param sep: Separator override, defaults to None (use self.sep)
+        :type sep: str | None
+
+        :return: The number of characters (text) or bytes (binary) written.
+        :rtype: int
+        """
+        chunks = self.iter_chunks(chunk_size, sep)
+        written = 0
+        if not _is_binary_writable(file):
+            for chunk in chunks:
+                file.write(chunk)
+                written += len(chunk)
+            return written
+        encoder = codecs.getincrementalencoder(encoding)()
+        for chunk in chunks:
+            data = encoder.encode(chunk)
+            file.write(data)
+            written += len(data)
+        data = encoder.encode("", final=True)
+        if data:
+            file.write(data)
+            written += len(data)
+        return written
+
+    def _iter_encoded(self, encoding: str) -> Iterator[bytes]:
+        """Yield the encoded output as buffers suitable for vectored writes.
+
+        Elements are taken in batches; a batch of only small elements is joined and
+        encoded in one go, otherwise every element and separator is encoded on its
+        own so large fragments are not copied into a joined string first.
+
+        :param encoding: A stateless encoding.
+        :type encoding: str
+
+        :return: An iterator over the encoded buffers.
+        :rtype: Iterator[bytes]
+        """
+        sep = self._sep
+        encoded_sep = sep.encode(encoding)
+        texts = map(self._format_func, self._data)
+        first = True
+        while batch := list(islice(texts, _ENCODE_BATCH)):
+            if first:
+                first = False
+            elif encoded_sep:
+                yield encoded_sep
+            if max(map(len, batch)) < COALESCE_BELOW:
+                yield sep.join(batch).encode(encoding)
+                continue
+            for piece in interleave(batch, sep):
+                yield encoded_sep if piece is sep else piece.encode(encoding)
+
+    def flush_to(
+        self,
+        target: int | socket.socket | SupportsFileno,
+        encoding: str = "utf-8",
+        clear: bool = False,
+    ) -> int:
+        """Encode the output and write it to a descriptor or socket with vectored I/O.
+
+        Each formatted element is encoded on its own and the encoded separator is
+        reused, and the resulting buffers go straight to ``os.writev`` or
+        ``socket.sendmsg`` in IOV_MAX sized batches, so the output is never joined.
+        Stateful encodings (e.g. utf-16) are encoded in bounded chunks instead.
+
+        A non-blocking target, or a socket with a timeout, may stop partway: the
+        BlockingIOError or TimeoutError carries the bytes already written in
+        ``characters_written`` (see :func:`~stringdatadeque.vectorio.writev_all`)
+        and no element is removed, even with ``clear``.
+
+        :param target: A file descriptor, socket or object with ``fileno()``.
+        :type target: int | socket.socket | SupportsFileno
+        :param encoding: The encoding to use, defaults to 'utf-8'
+        :type encoding: str
+        :param clear: Remove all elements after a successful write,
+            defaults to False
+        :type clear: bool
+
+        :return: The number of bytes written.
+        :rtype: int
+
+        :raises BlockingIOError: If a non-blocking target would block.
+        :raises TimeoutError: If a target with a timeout timed out.
+        """
+        buffers: Iterator[bytes]
+        if codecs.lookup(encoding).name in _STATELESS_ENCODINGS:
+            buffers = self._iter_encoded(encoding)
+        else:
+            encoder = codecs.getincrementalencoder(encoding)()
+            buffers = map(encoder.encode, self.iter_chunks())
+        written = writev_all(target, buffers)
+        if clear:
+            # through draw_many, so subclasses that forbid clear() still work
+            self.draw_many(len(self._data))
+        return written
+
+    def _format_head(self, chunk_size: int) -> list[str]:
+        """Format elements from the front until about chunk_size characters.
+
+        :param chunk_size: Approximate number of characters to format.
+        :type chunk_size: int
+
+        :return: The formatted elements, at least one unless the deque is empty.
+        :rtype: list[str]
+        """
+        sep_len = len(self._sep)
+        format_func = self._format_func
+        batch: list[str] = []
+        size = 0
+        for item in self._data:
+            text = format_func(item)
+            batch.append(text)
+            size += len(text) + sep_len
+            if size >= chunk_size:
+                break
+        return batch
+
+    async def drain_to(
+        self,
+        writer: SupportsDrain,
+        chunk_size: int = DEFAULT_RENDER_CHUNK_SIZE,
+        encoding: str = "utf-8",
+        consume: bool = False,
+    ) -> int:
+        """Write the output to an asyncio stream, honouring its flow control.
+
+        The output is written in batches of about ``chunk_size`` characters and
+        ``await writer.drain()`` runs after each batch, so a slow peer pauses the
+        producer instead of growing the transport buffer. Control is also handed
+        back to the event loop after every batch, even when the transport is not
+        paused, so a large deque never monopolises the loop.
+
+        With ``consume`` the elements of each batch are removed from the front of
+        the deque once the batch has been drained, releasing memory as the write
+        progresses; elements appended by other tasks meanwhile are drained as
+        well. Without ``consume`` the deque must not be modified until the
+        coroutine returns.
+
+        :param writer: The stream to write to, e.g. an asyncio.StreamWriter.
+        :type writer: SupportsDrain
+        :param chunk_size: Approximate number of characters per batch,
+            defaults to DEFAULT_RENDER_CHUNK_SIZE
+        :type chunk_size: int
+        :param encoding: The encoding to use, defaults to 'utf-8'
+        :type encoding: str
+        :param consume: Remove elements once they have been written,
+            defaults to False
+        :type consume: bool
+
+        :return: The number of bytes written.
+        :rtype: int
+
+        :raises ValueError: If chunk_size is not positive.
+        """
+        if chunk_size <= 0:
+            msg = "chunk_size must be positive"
+            raise ValueError(msg)
+        encoder = codecs.getincrementalencoder(encoding)()
+        written = 0
+        if not consume:
+            for chunk in self._iter_rendered(self._sep, chunk_size):
+                data = encoder.encode(chunk)
+                writer.write(data)
+                written += len(data)
+                await writer.drain()
+                await _yield_to_loop()
+        else:
+            sep = self._sep
+            first = True
+            while self._data:
+                batch = self._format_head(chunk_size)
+                text = sep.join(batch)
+                if first:
+                    first = False
+                elif sep:
+                    text = sep + text
+                data = encoder.encode(text)
+                writer.write(data)
+                written += len(data)
+                await writer.drain()
+                # through draw_many, so subclasses see every removal
+                self.draw_many(len(batch))
+                await _yield_to_loop()
+        data = encoder.encode("", final=True)
+        if data:
+            writer.write(data)
+            written += len(data)
+            await writer.drain()
+        return written
 
     @nobeartype
     def __add__(self, other: ConvertibleToDataType) -> Self:
@@ -239,8 +784,7 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         :return: Updated instance with the mapped values added to the internal data.
         :rtype: Self
         """
-        data_mapped = map(self.convert_func, other)
-        self._data.extend(data_mapped)
+        self._extend_converted(other)
         return self
 
     @nobeartype
@@ -254,8 +798,7 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         :return: The updated object after the union operation.
         :rtype: Self
         """
-        data_mapped = map(self.convert_func, other)
-        self._data.extend(data_mapped)
+        self._extend_converted(other)
         return self
 
     @nobeartype
@@ -267,18 +810,77 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         """
         return len(self._data)
 
+    @overload
+    def __getitem__(self, key: SupportsIndex) -> DataType: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "SliceView[DataType]": ...
+
     @nobeartype
-    def __getitem__(self, key: SupportsIndex) -> DataType:
+    def __getitem__(
+        self, key: SupportsIndex | slice
+    ) -> "DataType | SliceView[DataType]":
         """Get an item from the data using the specified key.
 
-        :param key: The key for retrieving the item from the data.
-        :type key: SupportsIndex
+        A slice returns a :class:`SliceView` of the positions it selects, nothing
+        is copied.
 
-        :return: The item corresponding to the key in the data.
-        :rtype: DataType
+        :param key: The index of the item, or a slice of indices.
+        :type key: SupportsIndex | slice
+
+        :return: The item corresponding to the key in the data, or a view of the
+            items in the slice.
+        :rtype: DataType | SliceView[DataType]
         """
+        if isinstance(key, slice):
+            return SliceView(self, range(len(self._data))[key])
         return self._data[key]
 
+    def _iter_range(self, start: int, stop: int) -> Iterator[DataType]:
+        """Iterate over the elements at positions ``start <= i < stop``.
+
+        Storage implementing :class:`~stringdatadeque.protocols.SupportsRange`
+        (BlockStorage, RopeStorage, EncryptedColumns) goes straight to start;
+        any other storage is walked in from the nearer end.
+
+        :param start: The first position, ``0 <= start <= stop``.
+        :type start: int
+        :param stop: The position after the last, at most ``len(self)``.
+        :type stop: int
+
+        :return: An iterator over the elements.
+        :rtype: Iterator[DataType]
+        """
+        data = self._data
+        if isinstance(data, SupportsRange):
+            return cast("Iterator[DataType]", data.iter_range(start, stop))
+        size = len(data)
+        if start <= size - stop:
+            return islice(data, start, stop)
+        elements = list(islice(reversed(data), size - stop, size - start))
+        elements.reverse()
+        return iter(elements)
+
+    def render(self, start: int | None = None, stop: int | None = None) -> str:
+        """Return the elements from start to stop joined by sep.
+
+        Only the elements in the range are visited and formatted; ``start`` and
+        ``stop`` follow slice semantics, so ``render(a, b)`` equals
+        ``sep.join`` over ``self[a:b]``.
+
+        :param start: The first position, defaults to the first element.
+        :type start: int | None
+        :param stop: The position after the last, defaults to the end.
+        :type stop: int | None
+
+        :return: The rendered range.
+        :rtype: str
+        """
+        start, stop, _ = slice(start, stop).indices(len(self._data))
+        if start >= stop:
+            return ""
+        return self._join(self._iter_range(start, stop), stop - start, self._sep)
+
     @nobeartype
     def __setitem__(self, key: SupportsIndex, value: ConvertibleToDataType) -> None:
         """Set the value of a key in the data dictionary.
@@ -293,6 +895,7 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         :rtype: None
         """
         self._data[key] = self.convert_func(value)
+        self._invalidate()
 
     @overload
     def insert(
@@ -321,14 +924,15 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
     ) -> Self:
         """Insert item(s) into the stringDequeue.
 
-        :param other: Item(s) to insert.
+        :param other: Item(s) to insert. A string is one item, sequences and NumPy
+            arrays are collections of items.
         :param pre_process_func: Function that will preprocess the data,
             defaults to None
         :param skip_conversion: Flag to skip conversion of items, defaults to False
         :return: The StringDeque.
         """
         data: Sequence[object] | object = other
-        if isinstance(data, str) or not isinstance(data, Sequence):
+        if _is_single(data):
             data = (other,)
         if pre_process_func is None:
             if skip_conversion:
@@ -336,13 +940,9 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
                 self._data.extend(cast("Sequence[DataType]", data))
             else:
                 # if not preprocessing data must be of type convertabletodatatype
-                data_mapped: map[Any] = map(
-                    self.convert_func,
-                    cast("Sequence[ConvertibleToDataType]", data),
-                )
-                self._data.extend(data_mapped)
+                self._extend_converted(cast("Sequence[ConvertibleToDataType]", data))
         else:
-            data_mapped = map(pre_process_func, cast("Sequence[T]", data))
+            data_mapped: map[Any] = map(pre_process_func, cast("Sequence[T]", data))
             data_mapped = map(self.convert_func, data_mapped)
             self._data.extend(data_mapped)
         return self
@@ -356,6 +956,7 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         :rtype: None
         """
         self._data.clear()
+        self._invalidate()
 
     def draw(self, index: int = -1) -> DataType:
         """Draw and remove an element from the object at the specified index.
@@ -369,10 +970,193 @@ class StringDataDeque(Generic[DataType, ConvertibleToDataType]):  # noqa: UP046
         """
         ret = self._data[index]
         del self._data[index]
+        self._invalidate()
         return ret
 
+    def draw_many(self, count: int, side: Side = "left") -> list[DataType]:
+        """Remove and return up to count elements from one end, in one pass.
+
+        Storage with ``popleft``/``pop`` (``collections.deque`` and every
+        storage in :mod:`~stringdatadeque.storage` but ShardedStorage) is popped
+        directly; other storage is read once and then trimmed from that end.
+
+        :param count: The maximum number of elements to remove.
+        :type count: int
+        :param side: The end to remove from, "left" or "right", defaults to
+            "left"
+        :type side: Side
+
+        :raises ValueError: If count is negative or side is not "left" or
+            "right".
+
+        :return: The removed elements, in their order in the deque, fewer than
+            count if the deque is shorter.
+        :rtype: list[DataType]
+        """
+        if count < 0:
+            msg = "count must be non-negative"
+            raise ValueError(msg)
+        if side not in {"left", "right"}:
+            msg = f"side must be 'left' or 'right', not {side!r}"
+            raise ValueError(msg)
+        data = self._data
+        size = len(data)
+        count = min(count, size)
+        if not count:
+            return []
+        if side == "left":
+            start, end = 0, 0
+            pop = getattr(data, "popleft", None)
+        else:
+            start, end = size - count, -1
+            pop = getattr(data, "pop", None)
+        if pop is not None:
+            elements = [pop() for _ in range(count)]
+            if side == "right":
+                elements.reverse()
+        else:
+            elements = list(self._iter_range(start, start + count))
+            for _ in range(count):
+                del data[end]
+        self._invalidate()
+        return elements
+
+    def draw_joined(
+        self,
+        count: int,
+        side: Side = "left",
+        sep: str | None = None,
+    ) -> str:
+        """Remove up to count elements from one end and return them rendered.
+
+        :param count: The maximum number of elements to remove.
+        :type count: int
+        :param side: The end to remove from, "left" or "right", defaults to
+            "left"
+        :type side: Side
+        :param sep: Separator override, defaults to None (use self.sep)
+        :type sep: str | None
+
+        :return: The removed elements formatted and joined, as ``str()`` would
+            have rendered them.
+        :rtype: str
+        """
+        elements = self.draw_many(count, side)
+        return self._join(elements, len(elements), self._sep if sep is None else sep)
+
+
+@typechecked
+class SliceView(Generic[DataType]):  # noqa: UP046
+    """A view of some positions of a StringDataDeque, returned by slicing it.
+
+    The view stores only the deque and a ``range`` of positions, so slicing is
+    O(1) and slicing a view again composes the ranges. Elements are read when
+    accessed, so a view shows whatever is at its positions at that time. With a
+    storage implementing :class:`~stringdatadeque.protocols.SupportsRange`,
+    reaching the first position costs O(1) or O(log n) instead of walking the
+    storage.
+
+    :param source: The sliced deque.
+    :type source: StringDataDeque[DataType, Any]
+    :param positions: The selected positions.
+    :type positions: range
+    """
+
+    __slots__ = ("_positions", "_source")
+
+    def __init__(
+        self, source: StringDataDeque[DataType, Any], positions: range
+    ) -> None:
+        """Initialize the view.
+
+        :param source: The sliced deque.
+        :type source: StringDataDeque[DataType, Any]
+        :param positions: The selected positions.
+        :type positions: range
+        """
+        self._source = source
+        self._positions = positions
 
-@beartype
+    @property
+    def positions(self) -> range:
+        """The positions of the deque shown by the view.
+
+        :return: The positions.
+        :rtype: range
+        """
+        return self._positions
+
+    def __len__(self) -> int:
+        """Return the number of positions in the view.
+
+        :return: The number of elements.
+        :rtype: int
+        """
+        return len(self._positions)
+
+    @overload
+    def __getitem__(self, key: SupportsIndex) -> DataType: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "SliceView[DataType]": ...
+
+    def __getitem__(
+        self, key: SupportsIndex | slice
+    ) -> "DataType | SliceView[DataType]":
+        """Return an element of the view, or a view of a slice of it.
+
+        :param key: The index within the view, or a slice of indices.
+        :type key: SupportsIndex | slice
+
+        :return: The element, or a view of the selected positions.
+        :rtype: DataType | SliceView[DataType]
+        """
+        if isinstance(key, slice):
+            return SliceView(self._source, self._positions[key])
+        return self._source[self._positions[key]]
+
+    @nobeartype
+    def __iter__(self) -> Iterator[DataType]:
+        """Iterate over the elements in the order of the positions.
+
+        :return: An iterator over the elements.
+        :rtype: Iterator[DataType]
+        """
+        positions = self._positions
+        if not positions:
+            return iter(())
+        low = min(positions[0], positions[-1])
+        high = max(positions[0], positions[-1]) + 1
+        elements = self._source._iter_range(low, high)  # noqa: SLF001
+        if positions.step == 1:
+            return elements
+        if positions.step > 0:
+            return islice(elements, 0, None, positions.step)
+        return iter(list(elements)[:: positions.step])
+
+    def __str__(self) -> str:
+        """Return the elements formatted and joined by the deque's sep.
+
+        :return: The rendered view.
+        :rtype: str
+        """
+        source = self._source
+        return source._join(self, len(self), source.sep)  # noqa: SLF001
+
+    def __repr__(self) -> str:
+        """Return a short description of the view.
+
+        :return: The representation.
+        :rtype: str
+        """
+        positions = self._positions
+        return (
+            f"{type(self).__qualname__}({type(self._source).__qualname__}"
+            f"[{positions.start}:{positions.stop}:{positions.step}])"
+        )
+
+
+@typechecked
 class StringDeque(StringDataDeque[str, Builtin_or_DefinesDunderStr]):
     """A class representing a StringDeque."""
 
@@ -383,6 +1167,7 @@ class StringDeque(StringDataDeque[str, Builtin_or_DefinesDunderStr]):
         self,
         data: SequenceNonStr[Builtin_or_DefinesDunderStr] | None = None,
         sep: str = "",
+        storage: Callable[[], DequeLike[str]] = deque,
     ) -> None: ...
 
     @overload
@@ -390,6 +1175,7 @@ class StringDeque(StringDataDeque[str, Builtin_or_DefinesDunderStr]):
         self,
         data: Builtin_or_DefinesDunderStr | None = None,
         sep: str = "",
+        storage: Callable[[], DequeLike[str]] = deque,
     ) -> None: ...
 
     def __init__(
@@ -398,6 +1184,7 @@ class StringDeque(StringDataDeque[str, Builtin_or_DefinesDunderStr]):
         | Builtin_or_DefinesDunderStr
         | None = None,
         sep: str = "",
+        storage: Callable[[], DequeLike[str]] = deque,
     ) -> None:
         """Initialize the object with the given data and separator.
 
@@ -407,61 +1194,258 @@ class StringDeque(StringDataDeque[str, Builtin_or_DefinesDunderStr]):
         :param sep: Separator to use when joining the data elements.
         :type sep: str
 
+        :param storage: Factory for the container holding the elements,
+            defaults to collections.deque
+        :type storage: Callable[[], DequeLike[str]]
+
         :return: None
         :rtype: None
         """
-        super().__init__(convert_func=str, format_func=str, data=data, sep=sep)
+        super().__init__(
+            convert_func=str,
+            format_func=str,
+            data=data,
+            sep=sep,
+            storage=storage,
+        )
 
 
-@beartype
+@typechecked
 class CircularStringDeque(StringDeque):
-    """A circular StringBuffer, overwrites once maxlen reached."""
+    """A circular StringBuffer, overwrites once maxlen reached.
 
-    __slots__ = ("_size",)
+    The ring is bounded by a number of elements (``size``), by the total size of
+    the elements (``budget``, see :class:`~stringdatadeque.storage.BoundedStorage`),
+    by their age (``ttl``) or by any combination; the oldest elements are evicted
+    first.
+    """
+
+    __slots__ = ("_size", "_tail_cache")
+
+    # appends silently evict from the left, so a cached rendering goes stale
+    _cache_render: ClassVar[bool] = False
 
     @overload
     def __init__(
         self,
-        size: int,
+        size: int | None = None,
         data: SequenceNonStr[Builtin_or_DefinesDunderStr] | None = None,
         sep: str = "",
+        budget: int | None = None,
+        unit: BudgetUnit = "chars",
+        *,
+        ttl: int | float | None = None,  # noqa: PYI041 - beartype needs the int
     ) -> None: ...
 
     @overload
     def __init__(
         self,
-        size: int,
+        size: int | None = None,
         data: Builtin_or_DefinesDunderStr | None = None,
         sep: str = "",
+        budget: int | None = None,
+        unit: BudgetUnit = "chars",
+        *,
+        ttl: int | float | None = None,  # noqa: PYI041 - beartype needs the int
     ) -> None: ...
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
-        size: int,
+        size: int | None = None,
         data: SequenceNonStr[Builtin_or_DefinesDunderStr]
         | Builtin_or_DefinesDunderStr
         | None = None,
         sep: str = "",
+        budget: int | None = None,
+        unit: BudgetUnit = "chars",
+        *,
+        ttl: int | float | None = None,  # noqa: PYI041 - beartype needs the int
     ) -> None:
         """Initialize CircularStringDeque with a limited size.
 
-        :param size: The maximum size of the data structure.
-        :type size: int
+        :param size: The maximum number of elements, None for no count limit.
+        :type size: int | None
         :param data: Initial data to populate the structure (optional).
         :type data: SequenceNonStr[Builtin_or_DefinesDunderStr] |
             Builtin_or_DefinesDunderStr | None
         :param sep: Separator for data elements when initializing (optional).
         :type sep: str
+        :param budget: The maximum total size of the elements, separators not
+            included, None for no size limit.
+        :type budget: int | None
+        :param unit: What budget counts, "chars" or "bytes" (UTF-8 encoded),
+            defaults to "chars"
+        :type unit: BudgetUnit
+        :param ttl: Seconds an element lives, None to keep elements until they
+            are evicted.
+        :type ttl: int | float | None
+
+        :raises ValueError: If none of size, budget and ttl is given.
 
         :return: None
         :rtype: None
         """
-        super().__init__(data=data, sep=sep)
+        if size is None and budget is None and ttl is None:
+            msg = "CircularStringDeque needs a size, a budget or a ttl"
+            raise ValueError(msg)
+        storage: Callable[[], DequeLike[str]]
+        if budget is None and ttl is None:
+            storage = partial(deque[str], maxlen=size)
+        else:
+            storage = partial(
+                BoundedStorage, maxlen=size, budget=budget, unit=unit, ttl=ttl
+            )
+        super().__init__(data=data, sep=sep, storage=storage)
         self._size = size
-        self._data = deque(self._data, maxlen=self._size)
+        self._tail_cache: dict[TailKey, TailEntry] = {}
+
+    @property
+    def total_size(self) -> int | None:
+        """Total size of the elements in the budget's unit, None without a budget.
+
+        :return: The running total.
+        :rtype: int | None
+        """
+        if isinstance(self._data, BoundedStorage):
+            return self._data.total
+        return None
+
+    def _walk_tail(self, key: TailKey) -> TailEntry:
+        """Format elements from the right until the requested tail is covered.
+
+        :param key: The request, see :meth:`_tail`.
+        :type key: TailKey
+
+        :return: The cache entry for the request.
+        :rtype: TailEntry
+        """
+        mode, count, sep, format_func = key
+        data = self._data
+        items: list[str] = []
+        # right to left: text, separator, text, ...
+        pieces: list[str] = []
+        size = 0
+        # lowest ring length for which the result holds
+        minimum = 0
+        for item in reversed(data):
+            if mode == "items" and len(items) == count:
+                break
+            if pieces and sep:
+                pieces.append(sep)
+                size += len(sep)
+                if mode == "chars" and size >= count:
+                    # cut inside the separator, which needs an element before it
+                    minimum = len(items) + 1
+                    break
+            text = format_func(item)
+            items.append(item)
+            pieces.append(text)
+            size += len(text)
+            if mode == "chars" and size >= count:
+                break
+        else:
+            # the walk reached the left end, so a longer ring changes the result
+            return tuple(items), len(items), len(items), self._join_tail(pieces, key)
+        return (
+            tuple(items),
+            max(minimum, len(items)),
+            sys.maxsize,
+            self._join_tail(pieces, key),
+        )
+
+    @staticmethod
+    def _join_tail(pieces: list[str], key: TailKey) -> str:
+        """Join the pieces collected right to left, trimming to a character count.
+
+        :param pieces: Formatted elements and separators, right to left.
+        :type pieces: list[str]
+        :param key: The request, see :meth:`_tail`.
+        :type key: TailKey
+
+        :return: The tail.
+        :rtype: str
+        """
+        pieces.reverse()
+        joined = "".join(pieces)
+        mode, count, _, _ = key
+        if mode == "chars" and len(joined) > count:
+            return joined[len(joined) - count :]
+        return joined
+
+    def _tail(self, key: TailKey) -> str:
+        """Return a tail, from the cache if the elements it covers are unchanged.
+
+        A cached tail stores the elements it was built from and the ring
+        lengths it holds for. It is reused when the rightmost elements still
+        compare equal, whatever was appended, evicted or replaced further left.
+
+        :param key: The mode ("items" or "chars"), the count, the separator and
+            the format function.
+        :type key: TailKey
+
+        :return: The tail.
+        :rtype: str
+        """
+        data = self._data
+        cached = self._tail_cache.get(key)
+        if cached is not None:
+            items, minimum, maximum, result = cached
+            if minimum <= len(data) <= maximum and items == tuple(
+                islice(reversed(data), len(items)),
+            ):
+                return result
+        entry = self._walk_tail(key)
+        if len(self._tail_cache) >= _TAIL_CACHE_SIZE:
+            self._tail_cache.clear()
+        self._tail_cache[key] = entry
+        return entry[3]
+
+    def tail(self, count: int) -> str:
+        """Return the last count elements joined with sep.
+
+        Only those elements are visited, walking the ring from the right, and
+        repeated calls on an unchanged ring are served from a cache.
+
+        :param count: The number of elements.
+        :type count: int
+
+        :raises ValueError: If count is negative.
+
+        :return: The same as ``sep.join`` over the last count elements.
+        :rtype: str
+        """
+        if count < 0:
+            msg = "count must be non-negative"
+            raise ValueError(msg)
+        if not count:
+            return ""
+        return self._tail(("items", count, self._sep, self._format_func))
+
+    def tail_chars(self, count: int) -> str:
+        """Return the last count characters of the rendered ring.
 
+        Separators are included. Only the elements needed to fill count
+        characters are formatted, walking the ring from the right, and repeated
+        calls on an unchanged ring are served from a cache.
+
+        :param count: The number of characters.
+        :type count: int
+
+        :raises ValueError: If count is negative.
+
+        :return: The same as ``str(self)[-count:]``, or the whole rendering if it
+            is shorter.
+        :rtype: str
+        """
+        if count < 0:
+            msg = "count must be non-negative"
+            raise ValueError(msg)
+        if not count:
+            return ""
+        return self._tail(("chars", count, self._sep, self._format_func))
 
-@beartype
+
+@typechecked
 class WORMStringDeque(StringDeque):
     """A class representing a WORM (Write Once Read Many) String Deque.
 
@@ -475,17 +1459,21 @@ class WORMStringDeque(StringDeque):
     - clear: Clearing all items from the deque is not allowed.
     - __delitem__: Deleting items from the deque is not allowed.
 
+    Since existing elements never change, :meth:`snapshot` can hand out a
+    read-only view of the current elements in O(1).
+
     :raises NotImplementedError: When trying to perform unsupported operations on
         WORMStringDeque.
     """
 
-    __slots__ = ()
+    __slots__ = ("_views",)
 
     @overload
     def __init__(
         self,
         data: SequenceNonStr[Builtin_or_DefinesDunderStr] | None = None,
         sep: str = "",
+        storage: Callable[[], DequeLike[str]] = deque,
     ) -> None: ...
 
     @overload
@@ -493,6 +1481,7 @@ class WORMStringDeque(StringDeque):
         self,
         data: Builtin_or_DefinesDunderStr | None = None,
         sep: str = "",
+        storage: Callable[[], DequeLike[str]] = deque,
     ) -> None: ...
 
     def __init__(
@@ -501,6 +1490,7 @@ class WORMStringDeque(StringDeque):
         | Builtin_or_DefinesDunderStr
         | None = None,
         sep: str = "",
+        storage: Callable[[], DequeLike[str]] = deque,
     ) -> None:
         """Initialize the object with optional data and separator.
 
@@ -511,10 +1501,81 @@ class WORMStringDeque(StringDeque):
         :param sep: Optional separator for the data.
         :type sep: str
 
+        :param storage: Factory for the container holding the elements,
+            defaults to collections.deque
+        :type storage: Callable[[], DequeLike[str]]
+
         :return: None
         :rtype: None
         """
-        super().__init__(data=data, sep=sep)
+        super().__init__(data=data, sep=sep, storage=storage)
+        # views sharing the storage, detached before draw removes their elements
+        self._views: weakref.WeakSet[PrefixView[str]] = weakref.WeakSet()
+
+    def snapshot(self, count: int | None = None) -> "WORMSnapshot":
+        """Return a read-only view of the first count elements, in O(1).
+
+        The view shares this deque's storage instead of copying it, and keeps
+        showing the same elements while more are appended. Only :meth:`draw`
+        can change existing elements; it first gives the views that cover the
+        drawn element their own copy.
+
+        :param count: The number of leading elements, defaults to all of them.
+        :type count: int | None
+
+        :raises ValueError: If count is negative or larger than the deque.
+
+        :return: The snapshot, rendered with this deque's separator and format
+            function.
+        :rtype: WORMSnapshot
+        """
+        view = PrefixView(self._data, len(self._data) if count is None else count)
+        self._views.add(view)
+        snapshot = WORMSnapshot(sep=self._sep, storage=lambda: view)
+        snapshot.format_func = self._format_func
+        snapshot.parallel = self._parallel
+        return snapshot
+
+    def draw(self, index: int = -1) -> str:
+        """Draw and remove an element, copying it into the snapshots that show it.
+
+        :param index: The index of the element to be drawn and removed.
+            Default is -1 (last element).
+        :type index: int
+
+        :return: The drawn element.
+        :rtype: str
+        """
+        self._detach_views(index + len(self._data) if index < 0 else index)
+        return super().draw(index)
+
+    def draw_many(self, count: int, side: Side = "left") -> list[str]:
+        """Remove up to count elements from one end, copying them into snapshots.
+
+        :param count: The maximum number of elements to remove.
+        :type count: int
+        :param side: The end to remove from, "left" or "right", defaults to
+            "left"
+        :type side: Side
+
+        :return: The removed elements, in their order in the deque.
+        :rtype: list[str]
+        """
+        # only calls that remove something pay for copying the snapshots
+        if count > 0 and side in {"left", "right"}:
+            self._detach_views(0 if side == "left" else len(self._data) - count)
+        return super().draw_many(count, side)
+
+    def _detach_views(self, position: int) -> None:
+        """Give the snapshots showing position or later their own copy.
+
+        :param position: The first position about to be removed.
+        :type position: int
+        """
+        for view in list(self._views):
+            if position < len(view):
+                view.detach()
+                self._views.discard(view)
 
     def __setitem__(
         self,
@@ -563,6 +1624,204 @@ class WORMStringDeque(StringDeque):
         )
 
 
+@typechecked
+class WORMSnapshot(StringDeque):
+    """A read-only view of the first elements of a WORMStringDeque.
+
+    Created by :meth:`WORMStringDeque.snapshot`. It renders, indexes, iterates
+    and streams like any StringDeque, while the deque it was taken from keeps
+    growing; appending to or removing from the snapshot raises
+    NotImplementedError. The rendered string is cached, as the elements never
+    change.
+    """
+
+    __slots__ = ()
+
+
+@typechecked
+class SpillingStringDeque(StringDeque):
+    """A StringDeque that spills older fragments to disk once it grows too large.
+
+    Recent fragments stay in an in-memory deque; once they exceed ``memory_limit``
+    characters the oldest are moved to append-only segment files that are read back
+    through ``mmap`` (see :class:`~stringdatadeque.storage.SpillStorage`). The
+    rendered string is not cached, use :meth:`write_to` or :meth:`iter_chunks` to
+    output buffers larger than memory.
+    """
+
+    __slots__ = ()
+
+    # a cached rendering would keep the whole buffer in memory again
+    _cache_render: ClassVar[bool] = False
+
+    @overload
+    def __init__(
+        self,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        data: SequenceNonStr[Builtin_or_DefinesDunderStr] | None = None,
+        sep: str = "",
+        directory: str | Path | None = None,
+    ) -> None: ...
+
+    @overload
+    def __init__(
+        self,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        data: Builtin_or_DefinesDunderStr | None = None,
+        sep: str = "",
+        directory: str | Path | None = None,
+    ) -> None: ...
+
+    def __init__(
+        self,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        data: SequenceNonStr[Builtin_or_DefinesDunderStr]
+        | Builtin_or_DefinesDunderStr
+        | None = None,
+        sep: str = "",
+        directory: str | Path | None = None,
+    ) -> None:
+        """Initialize the deque with an in-memory budget.
+
+        :param memory_limit: Characters kept in memory before older fragments are
+            spilled to disk, defaults to DEFAULT_MEMORY_LIMIT
+        :type memory_limit: int
+        :param data: Initial data to populate the structure (optional).
+        :type data: SequenceNonStr[Builtin_or_DefinesDunderStr] |
+            Builtin_or_DefinesDunderStr | None
+        :param sep: Separator for data elements (optional).
+        :type sep: str
+        :param directory: Parent directory for the temporary segment directory,
+            defaults to the system temporary directory.
+        :type directory: str | Path | None
+
+        :return: None
+        :rtype: None
+        """
+        super().__init__(
+            data=data,
+            sep=sep,
+            storage=partial(
+                SpillStorage, memory_limit=memory_limit, directory=directory
+            ),
+        )
+
+    def close(self) -> None:
+        """Discard all data and delete the segment files.
+
+        :return: None
+        :rtype: None
+        """
+        cast("SpillStorage", self._data).close()
+        self._invalidate()
+
+
+@typechecked
+class ShardedStringDeque(StringDeque):
+    """A StringDeque for many threads appending at once.
+
+    Every thread appends to its own shard (see
+    :class:`~stringdatadeque.storage.ShardedStorage`), so ``+=``, ``|=`` and
+    :meth:`insert` need no lock and do not contend with each other, which matters
+    most on the free-threaded build. The shards are merged when the deque is read,
+    per thread (``order="thread"``) or by arrival time (``order="arrival"``).
+
+    Thread-safety guarantees:
+
+    - ``str()``, iteration and :meth:`iter_chunks` render a snapshot holding
+      every element appended before the call, with each thread's elements in
+      order. Concurrent appends may or may not be included.
+    - ``len()`` counts the same kind of snapshot.
+    - :meth:`clear` removes every element appended before it started. Elements
+      appended concurrently may survive.
+    - :meth:`draw` and indexed access are serialized and cost O(n).
+    - :meth:`draw_many` removes its elements in one atomic step.
+    """
+
+    __slots__ = ()
+
+    # other threads append without going through this object's bookkeeping
+    _cache_render: ClassVar[bool] = False
+
+    @overload
+    def __init__(
+        self,
+        data: SequenceNonStr[Builtin_or_DefinesDunderStr] | None = None,
+        sep: str = "",
+        order: ShardOrder = "thread",
+    ) -> None: ...
+
+    @overload
+    def __init__(
+        self,
+        data: Builtin_or_DefinesDunderStr | None = None,
+        sep: str = "",
+        order: ShardOrder = "thread",
+    ) -> None: ...
+
+    def __init__(
+        self,
+        data: SequenceNonStr[Builtin_or_DefinesDunderStr]
+        | Builtin_or_DefinesDunderStr
+        | None = None,
+        sep: str = "",
+        order: ShardOrder = "thread",
+    ) -> None:
+        """Initialize the deque.
+
+        :param data: Initial data, stored in the calling thread's shard.
+        :type data: SequenceNonStr[Builtin_or_DefinesDunderStr] |
+            Builtin_or_DefinesDunderStr | None
+        :param sep: Separator for data elements (optional).
+        :type sep: str
+        :param order: How shards are merged, "thread" or "arrival",
+            defaults to "thread"
+        :type order: ShardOrder
+
+        :return: None
+        :rtype: None
+        """
+        super().__init__(
+            data=data,
+            sep=sep,
+            storage=partial(ShardedStorage, order=order),
+        )
+
+    def draw(self, index: int = -1) -> str:
+        """Remove and return the element at index, atomically.
+
+        :param index: The index of the element, defaults to -1 (last element).
+        :type index: int
+
+        :return: The removed element.
+        :rtype: str
+        """
+        return cast("ShardedStorage[str]", self._data).take(index)
+
+    def draw_many(self, count: int, side: Side = "left") -> list[str]:
+        """Remove and return up to count elements from one end, atomically.
+
+        :param count: The maximum number of elements to remove.
+        :type count: int
+        :param side: The end to remove from, "left" or "right", defaults to
+            "left"
+        :type side: Side
+
+        :raises ValueError: If count is negative or side is not "left" or
+            "right".
+
+        :return: The removed elements, in merged order.
+        :rtype: list[str]
+        """
+        if count < 0:
+            msg = "count must be non-negative"
+            raise ValueError(msg)
+        if side not in {"left", "right"}:
+            msg = f"side must be 'left' or 'right', not {side!r}"
+            raise ValueError(msg)
+        return cast("ShardedStorage[str]", self._data).take_many(count, side)
+
+
 # def lazy_import_module(module_name: str) -> ModuleType:
 #     """Lazy import module."""
 #     if module_name not in sys.modules:
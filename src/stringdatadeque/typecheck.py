@@ -0,0 +1,160 @@
+"""Runtime type-checking level for the package's classes.
+
+The level is read once, when the package is imported, from the
+``STRINGDATADEQUE_TYPECHECK`` environment variable:
+
+- ``full`` (default): every method is checked by beartype, except the hot dunders
+  marked with ``nobeartype``.
+- ``boundary``: only the methods where outside data enters are checked:
+  constructors, :meth:`insert`, ``__setitem__`` and the configuration setters.
+- ``off``: nothing is checked; the classes run undecorated.
+
+Set the variable before the first ``import stringdatadeque``; changing it later
+has no effect on classes that are already defined. To keep imports fast, classes
+are only decorated when they are first instantiated.
+"""
+
+import os
+import threading
+import warnings
+from collections.abc import Callable
+from functools import wraps
+from typing import Final
+from typing import Literal
+from typing import TypeVar
+
+from beartype import beartype  # pyright: ignore[reportUnknownVariableType]
+
+TypeCheckLevel = Literal["full", "boundary", "off"]
+
+ENV_VAR: Final = "STRINGDATADEQUE_TYPECHECK"
+LEVELS: Final[tuple[TypeCheckLevel, ...]] = ("full", "boundary", "off")
+# members still checked at the "boundary" level
+BOUNDARY_MEMBERS: Final = frozenset(
+    {"__init__", "__setitem__", "format_func", "insert", "parallel", "sep"},
+)
+
+Decorated = TypeVar("Decorated", bound=Callable[..., object])
+
+
+def _read_level() -> TypeCheckLevel:
+    """Return the level requested by the environment.
+
+    :return: The type-checking level, "full" if unset or unrecognised.
+    :rtype: TypeCheckLevel
+    """
+    value = os.environ.get(ENV_VAR, "full").strip().lower()
+    for level in LEVELS:
+        if value == level:
+            return level
+    warnings.warn(
+        f"{ENV_VAR}={value!r} is not one of {', '.join(LEVELS)}; using 'full'",
+        RuntimeWarning,
+        stacklevel=2,
+    )
+    return "full"
+
+
+LEVEL: Final[TypeCheckLevel] = _read_level()
+
+
+def _decorate(cls: type) -> None:
+    """Decorate a class in place according to :data:`LEVEL`.
+
+    At the "boundary" level the class is decorated as usual and every member not
+    named in :data:`BOUNDARY_MEMBERS` is then put back undecorated, so checked
+    members still resolve ``Self`` and forward references against the class.
+
+    :param cls: The class to decorate.
+    :type cls: type
+    """
+    if LEVEL == "full":
+        beartype(cls)
+        return
+    originals = dict(vars(cls))
+    beartype(cls)
+    for name, original in originals.items():
+        if name not in BOUNDARY_MEMBERS and vars(cls).get(name) is not original:
+            setattr(cls, name, original)
+
+
+# classes whose decoration waits for their first instantiation, mapped to the
+# __init__ replaced by the trigger
+_pending: dict[type, Callable[..., None]] = {}
+_pending_lock = threading.RLock()
+
+
+def _decorate_pending(cls: type) -> None:
+    """Decorate cls and every pending class in its MRO, bases first.
+
+    :param cls: The class about to be instantiated.
+    :type cls: type
+    """
+    with _pending_lock:
+        for klass in reversed(cls.__mro__):
+            init = _pending.pop(klass, None)
+            if init is not None:
+                type.__setattr__(klass, "__init__", init)
+                _decorate(klass)
+
+
+def decorate_pending() -> None:
+    """Decorate every class still waiting for its first instantiation.
+
+    Call this at startup to pay the decoration cost up front, or to make sure
+    static and class methods are checked before any instance exists.
+
+    :return: None
+    :rtype: None
+    """
+    with _pending_lock:
+        pending = list(_pending)
+    for cls in pending:
+        _decorate_pending(cls)
+
+
+def _defer(cls: type) -> None:
+    """Postpone decorating cls until it is first instantiated.
+
+    Decorating a class means compiling a wrapper for each of its methods, which
+    dominates ``import stringdatadeque``. Processes that never create a given
+    class never pay for it.
+
+    :param cls: The class to decorate later.
+    :type cls: type
+    """
+    init = vars(cls).get("__init__")
+    if init is None:
+        _decorate(cls)
+        return
+
+    @wraps(init)
+    def __init__(self: object, *args: object, **kwargs: object) -> None:  # noqa: N807
+        _decorate_pending(cls)
+        cls.__init__(self, *args, **kwargs)  # type: ignore[misc]
+
+    _pending[cls] = init
+    type.__setattr__(cls, "__init__", __init__)
+
+
+def typechecked(obj: Decorated) -> Decorated:  # noqa: UP047
+    """Apply beartype to a class or function according to :data:`LEVEL`.
+
+    Classes are decorated on their first instantiation rather than at import
+    time (see :func:`decorate_pending`). Functions are decorated immediately; at
+    the "boundary" level only if named in :data:`BOUNDARY_MEMBERS`.
+
+    :param obj: The class or function to decorate.
+    :type obj: Decorated
+
+    :return: The decorated (or unchanged) object.
+    :rtype: Decorated
+    """
+    if LEVEL == "off":
+        return obj
+    if isinstance(obj, type):
+        _defer(obj)
+        return obj
+    if LEVEL == "full" or obj.__name__ in BOUNDARY_MEMBERS:
+        return beartype(obj)  # type: ignore[no-any-return]
+    return obj
@@ -0,0 +1,231 @@
+"""Vectored (scatter/gather) output helpers used by the deque flush methods."""
+
+import os
+import socket
+from collections.abc import Buffer
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import Protocol
+from typing import TypeVar
+from typing import runtime_checkable
+
+T = TypeVar("T")
+
+
+def _iov_max() -> int:
+    """Return the maximum number of buffers accepted by one writev call.
+
+    :return: The platform IOV_MAX, or 1024 if it cannot be determined.
+    :rtype: int
+    """
+    try:
+        value = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, ValueError, OSError):  # pragma: no cover - non POSIX
+        return 1024
+    return value if value > 0 else 1024
+
+
+IOV_MAX = _iov_max()
+# buffers smaller than this are merged with their neighbours before writev, a
+# syscall per few bytes of payload costs far more than copying them once
+COALESCE_BELOW = 4 * 1024
+# target size of a merged run of small buffers
+COALESCE_BLOCK = 64 * 1024
+
+
+@runtime_checkable
+class SupportsFileno(Protocol):  # pragma: no cover
+    """An object backed by an OS file descriptor."""
+
+    def fileno(self) -> int:
+        """Return the underlying file descriptor."""
+        ...
+
+
+def nbytes(buffer: Buffer) -> int:
+    """Return the size of a buffer in bytes.
+
+    :param buffer: A buffer-protocol object.
+    :type buffer: Buffer
+
+    :return: The number of bytes exposed by the buffer.
+    :rtype: int
+    """
+    return len(buffer) if type(buffer) is bytes else memoryview(buffer).nbytes
+
+
+def interleave(items: Iterable[T], sep: T) -> Iterator[T]:  # noqa: UP047
+    """Yield items with sep between consecutive ones.
+
+    :param items: The items to yield.
+    :type items: Iterable[T]
+    :param sep: The separator yielded between items, skipped when falsy.
+    :type sep: T
+
+    :return: An iterator over items and separators.
+    :rtype: Iterator[T]
+    """
+    iterator = iter(items)
+    for first in iterator:
+        yield first
+        break
+    if not sep:
+        yield from iterator
+        return
+    for item in iterator:
+        yield sep
+        yield item
+
+
+def _sender(
+    target: int | socket.socket | SupportsFileno,
+) -> Callable[[list[Buffer]], int]:
+    """Return a callable that writes a list of buffers to target in one call.
+
+    :param target: A file descriptor, socket or object with a ``fileno`` method.
+    :type target: int | socket.socket | SupportsFileno
+
+    :return: A function taking a list of buffers and returning bytes written.
+    :rtype: Callable[[list[Buffer]], int]
+    """
+    if isinstance(target, socket.socket):
+        sock = target
+        if hasattr(sock, "sendmsg"):
+            return sock.sendmsg
+        return lambda buffers: sock.send(b"".join(buffers))  # pragma: no cover
+    if not isinstance(target, int):
+        flush = getattr(target, "flush", None)
+        if flush is not None:
+            # don't overtake data still sitting in a Python-level buffer
+            flush()
+        target = target.fileno()
+    fd = target
+    if hasattr(os, "writev"):
+        return lambda buffers: os.writev(fd, buffers)
+    return lambda buffers: os.write(fd, b"".join(buffers))  # pragma: no cover
+
+
+def _send_batch(send: Callable[[list[Buffer]], int], batch: list[Buffer]) -> int:
+    """Write every byte of a batch, resubmitting the remainder after short writes.
+
+    :param send: The vectored write function.
+    :type send: Callable[[list[Buffer]], int]
+    :param batch: The buffers to write, at most IOV_MAX of them.
+    :type batch: list[Buffer]
+
+    :return: The number of bytes written.
+    :rtype: int
+
+    :raises BlockingIOError: If a non-blocking target would block, with
+        ``characters_written`` set to the bytes of the batch already written.
+    :raises TimeoutError: If a target with a timeout timed out, with
+        ``characters_written`` set like for BlockingIOError.
+    """
+    total = 0
+    start = 0
+    while start < len(batch):
+        try:
+            written = send(batch[start:] if start else batch)
+        except (BlockingIOError, TimeoutError) as e:
+            # defined on every OSError at runtime, typeshed only declares it on
+            # BlockingIOError
+            e.characters_written = total  # type: ignore[union-attr]
+            raise
+        total += written
+        while start < len(batch):
+            size = nbytes(batch[start])
+            if written < size:
+                break
+            written -= size
+            start += 1
+        if written:
+            batch[start] = memoryview(batch[start]).cast("B")[written:]
+    return total
+
+
+def _send_partial(
+    send: Callable[[list[Buffer]], int],
+    batch: list[Buffer],
+    before: int,
+) -> int:
+    """Write a batch, counting earlier batches in ``characters_written``.
+
+    :param send: The vectored write function.
+    :type send: Callable[[list[Buffer]], int]
+    :param batch: The buffers to write, at most IOV_MAX of them.
+    :type batch: list[Buffer]
+    :param before: The bytes written by earlier batches.
+    :type before: int
+
+    :return: The number of bytes written.
+    :rtype: int
+    """
+    try:
+        return _send_batch(send, batch)
+    except (BlockingIOError, TimeoutError) as e:
+        e.characters_written += before  # type: ignore[union-attr]
+        raise
+
+
+def writev_all(
+    target: int | socket.socket | SupportsFileno,
+    buffers: Iterable[Buffer],
+) -> int:
+    """Write buffers to a file descriptor or socket using vectored I/O.
+
+    Buffers are handed to ``os.writev`` (or ``socket.sendmsg``) in batches of at
+    most :data:`IOV_MAX`, so large buffers are never copied into one intermediate
+    object. Runs of buffers smaller than :data:`COALESCE_BELOW` bytes are merged
+    into blocks of about :data:`COALESCE_BLOCK` bytes first. Partial writes are
+    resumed until every byte has been written.
+
+    Non-blocking targets and sockets with a timeout may stop partway. The
+    BlockingIOError or TimeoutError then carries the number of bytes written
+    before it in ``characters_written``, counted from the start of the output,
+    so the caller can resume with the rest of the output instead of resending
+    it.
+
+    :param target: A file descriptor, a socket, or an object with ``fileno()``
+        (flushed first if it has a ``flush`` method).
+    :type target: int | socket.socket | SupportsFileno
+    :param buffers: The buffers to write, in order.
+    :type buffers: Iterable[Buffer]
+
+    :return: The number of bytes written.
+    :rtype: int
+
+    :raises BlockingIOError: If a non-blocking target would block, with
+        ``characters_written`` set to the bytes already written.
+    :raises TimeoutError: If a target with a timeout timed out, with
+        ``characters_written`` set to the bytes already written.
+    """
+    send = _sender(target)
+    total = 0
+    batch: list[Buffer] = []
+    small: list[Buffer] = []
+    small_size = 0
+    for buffer in buffers:
+        size = nbytes(buffer)
+        if size < COALESCE_BELOW:
+            small.append(buffer)
+            small_size += size
+            if small_size < COALESCE_BLOCK:
+                continue
+            batch.append(b"".join(small))
+            small = []
+            small_size = 0
+        else:
+            if small:
+                batch.append(b"".join(small))
+                small = []
+                small_size = 0
+            batch.append(buffer)
+        if len(batch) >= IOV_MAX - 1:
+            total += _send_partial(send, batch, total)
+            batch = []
+    if small_size:
+        batch.append(b"".join(small))
+    if batch:
+        total += _send_partial(send, batch, total)
+    return total
@@ -0,0 +1,110 @@
+# ruff: noqa: ANN001, ANN201, D103, PLR2004, S101
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for BytesDataDeque."""
+
+import io
+from array import array
+
+import pytest
+from beartype.roar import BeartypeCallHintParamViolation
+
+from stringdatadeque import BytesDataDeque
+
+
+def test_init_and_render():
+    assert bytes(BytesDataDeque()) == b""
+    single = BytesDataDeque(b"abc")
+    assert len(single) == 1
+    many = BytesDataDeque([b"ab", bytearray(b"cd"), memoryview(b"xef")[1:]], sep=b",")
+    assert bytes(many) == b"ab,cd,ef"
+    assert many.nbytes == 8
+
+
+def test_zero_copy_storage():
+    payload = bytearray(b"hello")
+    view = memoryview(payload)
+    bd = BytesDataDeque()
+    bd += view
+    assert bd[0] is view
+
+
+def test_operators_insert_draw():
+    bd = BytesDataDeque(sep=b"\n")
+    bd += b"one"
+    bd = bd + b"two"
+    bd = b"three" + bd
+    bd |= [b"four", b"five"]
+    bd = [b"six"] | bd
+    bd.insert([1, 2], pre_process_func=lambda n: str(n).encode())
+    bd.insert(b"end")
+    assert bytes(bd) == b"one\ntwo\nthree\nfour\nfive\nsix\n1\n2\nend"
+    assert bd.draw() == b"end"
+    assert bd.draw(0) == b"one"
+    bd[0] = b"TWO"
+    assert bytes(bd).startswith(b"TWO\nthree")
+    with pytest.raises(TypeError):
+        bd += "text"
+    with pytest.raises(TypeError):
+        bd.insert(["text"])
+    bd.clear()
+    assert len(bd) == 0
+
+
+def test_rejects_non_contiguous_buffers():
+    strided = memoryview(b"abcdef")[::2]
+    with pytest.raises(TypeError, match="C-contiguous"):
+        BytesDataDeque(strided)
+    bd = BytesDataDeque([b"ab"])
+    with pytest.raises(TypeError, match="C-contiguous"):
+        bd += strided
+    with pytest.raises(TypeError, match="C-contiguous"):
+        bd.insert([strided, b"cd"])
+    with pytest.raises(TypeError, match="C-contiguous"):
+        bd[0] = strided
+    bd += bytes(strided)
+    assert bytes(bd) == b"abace"
+    assert b"ace" in bd
+
+
+def test_contains_rejects_non_buffers():
+    bd = BytesDataDeque([b"a\x00\x00\x00b"])
+    # beartype rejects the key first unless type checking is off
+    for key in (3, 0):
+        with pytest.raises((TypeError, BeartypeCallHintParamViolation)):
+            key in bd  # noqa: B015
+    assert memoryview(b"a\x00\x00")[::2] in bd  # b"a\x00"
+    assert memoryview(b"ab")[::-1] not in bd
+
+
+def test_render_into():
+    bd = BytesDataDeque([b"ab", array("H", [1, 2]), b""], sep=b"--")
+    target = bytearray(bd.nbytes + 3)
+    written = bd.render_into(target, offset=3)
+    assert written == bd.nbytes
+    assert bytes(target[3:]) == bytes(bd)
+    with pytest.raises(ValueError, match="too small"):
+        bd.render_into(bytearray(2))
+    with pytest.raises(TypeError):
+        bd.render_into(b"\x00" * 100)
+
+
+def test_contains_and_chunks(monkeypatch):
+    # the overlap search shared with StringDataDeque reads its piece size there
+    import stringdatadeque.stringdatadeque as module  # noqa: PLC0415
+
+    monkeypatch.setattr(module, "DEFAULT_RENDER_CHUNK_SIZE", 2)
+    parts = [b"alpha", b"be", b"", b"gamma"]
+    expected = b"::".join(parts)
+    bd = BytesDataDeque(parts, sep=b"::")
+    for start in range(len(expected)):
+        for stop in range(start, len(expected) + 1):
+            assert expected[start:stop] in bd
+    assert b"delta" not in bd
+    assert b"be" in bd
+    pieces = list(bd.iter_chunks(3))
+    assert b"".join(pieces) == expected
+    assert all(len(piece) <= 3 for piece in pieces)
+    out = io.BytesIO()
+    assert bd.write_to(out, chunk_size=4) == len(expected)
+    assert out.getvalue() == expected
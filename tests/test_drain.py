@@ -0,0 +1,107 @@
+# ruff: noqa: ANN001, ANN003, ANN201, ANN202, D103, PLR2004, S101
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for draining deques into asyncio streams."""
+
+import asyncio
+import socket
+
+import pytest
+
+from stringdatadeque import StringDeque
+from stringdatadeque import WORMStringDeque
+
+
+async def _pipe(data, **kwargs):
+    """Drain data through a socket pair and return (bytes read, bytes written)."""
+    left, right = socket.socketpair()
+    # keep both ends' writers alive, a collected StreamWriter closes its socket
+    reader, reader_writer = await asyncio.open_connection(sock=right)
+    _, writer = await asyncio.open_connection(sock=left)
+    # a tiny high-water mark forces the writer to wait on the reader
+    writer.transport.set_write_buffer_limits(high=256)
+    read_task = asyncio.create_task(reader.read())
+    try:
+        written = await data.drain_to(writer, **kwargs)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+        received = await read_task
+        reader_writer.close()
+    return received, written
+
+
+def test_drain_to():
+    data = StringDeque([f"line{i}" for i in range(5000)], sep="\n")
+    expected = str(data)
+    received, written = asyncio.run(_pipe(data, chunk_size=100))
+    assert received == expected.encode()
+    assert written == len(received)
+    assert len(data) == 5000
+
+
+def test_drain_to_consume():
+    data = StringDeque([f"line{i}" for i in range(5000)], sep="|")
+    expected = str(data)
+    received, written = asyncio.run(_pipe(data, chunk_size=100, consume=True))
+    assert received == expected.encode()
+    assert written == len(received)
+    assert len(data) == 0
+    assert str(data) == ""
+
+
+def test_drain_to_stateful_encoding():
+    data = StringDeque(["héllo", "wörld"], sep=" ")
+    received, _ = asyncio.run(_pipe(data, chunk_size=3, encoding="utf-16"))
+    assert received.decode("utf-16") == "héllo wörld"
+
+
+def test_drain_to_yields_to_loop():
+    data = StringDeque([str(i) for i in range(1000)], sep=",")
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        await _pipe(data, chunk_size=50, consume=True)
+        task.cancel()
+
+    asyncio.run(main())
+    assert len(ticks) > 10
+
+
+def test_drain_to_consume_picks_up_appends():
+    data = StringDeque(["a", "b"], sep=",")
+
+    async def main():
+        async def producer():
+            await asyncio.sleep(0)
+            data.insert("c")
+
+        task = asyncio.create_task(producer())
+        received, _ = await _pipe(data, chunk_size=1, consume=True)
+        await task
+        return received
+
+    assert asyncio.run(main()) == b"a,b,c"
+
+
+def test_drain_to_consume_keeps_worm_snapshots():
+    data = WORMStringDeque(["a", "b", "c"], sep=",")
+    snapshot = data.snapshot()
+    received, _ = asyncio.run(_pipe(data, chunk_size=1, consume=True))
+    assert received == b"a,b,c"
+    data += "z"
+    assert len(snapshot) == 3
+    assert snapshot[0] == "a"
+    assert list(snapshot) == ["a", "b", "c"]
+    assert str(snapshot) == "a,b,c"
+
+
+def test_drain_to_invalid_chunk_size():
+    with pytest.raises(ValueError, match="chunk_size"):
+        asyncio.run(_pipe(StringDeque("x"), chunk_size=0))
@@ -0,0 +1,421 @@
+# ruff: noqa: ANN001, ANN201, D103, PLR2004, S101, S301, SLF001
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for batched AES-EAX, EncryptedStringDeque.insert_batch and RSADecryptor."""
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+try:
+    from Crypto.Cipher import AES  # nosec: B413
+    from Crypto.Hash import CMAC  # nosec: B413
+    from Crypto.PublicKey import RSA  # nosec: B413
+    from Crypto.Random import get_random_bytes  # nosec: B413
+except ModuleNotFoundError:
+    pytest.skip(allow_module_level=True)
+from stringdatadeque import DecryptionError
+from stringdatadeque import EncryptedColumns
+from stringdatadeque import EncryptedStringDeque
+from stringdatadeque import ParallelRender
+from stringdatadeque import RSADecryptor
+from stringdatadeque import RSAMessage
+from stringdatadeque import eax
+from stringdatadeque.eax import BLOCK
+from stringdatadeque.eax import LOCKSTEP_BLOCKS
+from stringdatadeque.eax import EaxBatch
+
+ROOT = Path(__file__).parent.resolve()
+# around every block boundary and both sides of the lockstep limit
+SIZES = sorted(
+    {0, 1, BLOCK - 1, BLOCK, BLOCK + 1, 3 * BLOCK}
+    | {LOCKSTEP_BLOCKS * BLOCK + delta for delta in (-1, 0, 1)}
+    | {5000},
+)
+
+
+@pytest.fixture(scope="module")
+def public_key():
+    return RSA.import_key((ROOT / "default.pem").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return RSA.import_key((ROOT / "private.pem").read_text(encoding="utf-8"))
+
+
+def test_matches_pycryptodome_eax():
+    key = get_random_bytes(16)
+    plaintexts = [get_random_bytes(size) for size in SIZES]
+    records = EaxBatch(key).encrypt(plaintexts)
+    assert len(records) == len(plaintexts)
+    for plaintext, (nonce, tag, ciphertext) in zip(plaintexts, records, strict=True):
+        expected = AES.new(key, AES.MODE_EAX, nonce=nonce)
+        assert expected.encrypt_and_digest(plaintext) == (ciphertext, tag)
+
+
+# Bellare, Rogaway and Wagner, "The EAX Mode of Operation", FSE 2004, appendix:
+# message, key, nonce, header, ciphertext || tag
+EAX_VECTORS = [
+    (
+        "",
+        "233952DEE4D5ED5F9B9C6D6FF80FF478",
+        "62EC67F9C3A4A407FCB2A8C49031A8B3",
+        "6BFB914FD07EAE6B",
+        "E037830E8389F27B025A2D6527E79D01",
+    ),
+    (
+        "F7FB",
+        "91945D3F4DCBEE0BF45EF52255F095A4",
+        "BECAF043B0A23D843194BA972C66DEBD",
+        "FA3BFD4806EB53FA",
+        "19DD5C4C9331049D0BDAB0277408F67967E5",
+    ),
+    (
+        "1A47CB4933",
+        "01F74AD64077F2E704C0F60ADA3DD523",
+        "70C3DB4F0D26368400A10ED05D2BFF5E",
+        "234A3463C1264AC6",
+        "D851D5BAE03A59F238A23E39199DC9266626C40F80",
+    ),
+    (
+        "481C9E39B1",
+        "D07CF6CBB7F313BDDE66B727AFD3C5E8",
+        "8408DFFF3C1A2B1292DC199E46B7D617",
+        "33CCE2EABFF5A79D",
+        "632A9D131AD4C168A4225D8E1FF755939974A7BEDE",
+    ),
+    (
+        "40D0C07DA5E4",
+        "35B6D0580005BBC12B0587124557D2C2",
+        "FDB6B06676EEDC5C61D74276E1F8E816",
+        "AEB96EAEBE2970E9",
+        "071DFE16C675CB0677E536F73AFE6A14B74EE49844DD",
+    ),
+    (
+        "4DE3B35C3FC039245BD1FB7D",
+        "BD8E6E11475E60B268784C38C62FEB22",
+        "6EAC5C93072D8E8513F750935E46DA1B",
+        "D4482D1CA78DCE0F",
+        "835BB4F15D743E350E728414ABB8644FD6CCB86947C5E10590210A4F",
+    ),
+    (
+        "8B0A79306C9CE7ED99DAE4F87F8DD61636",
+        "7C77D6E813BED5AC98BAA417477A2E7D",
+        "1A8C98DCD73D38393B2BF1569DEEFC19",
+        "65D2017990D62528",
+        "02083E3979DA014812F59F11D52630DA30137327D10649B0AA6E1C181DB617D7F2",
+    ),
+    (
+        "1BDA122BCE8A8DBAF1877D962B8592DD2D56",
+        "5FFF20CAFAB119CA2FC73549E20F5B0D",
+        "DDE59B97D722156D4D9AFF2BC7559826",
+        "54B9F04E6A09189A",
+        "2EC47B2C4954A489AFC7BA4897EDCDAE8CC33B60450599BD02C96382902AEF7F832A",
+    ),
+    (
+        "6CF36720872B8513F6EAB1A8A44438D5EF11",
+        "A4A4782BCFFD3EC5E7EF6D8C34A56123",
+        "B781FCF2F75FA5A8DE97A9CA48E522EC",
+        "899A175897561D7E",
+        "0DE18FD0FDD91E7AF19F1D8EE8733938B1E8E7F6D2231618102FDB7FE55FF1991700",
+    ),
+    (
+        "CA40D7446E545FFAED3BD12A740A659FFBBB3CEAB7",
+        "8395FCF1E95BEBD697BD010BC766AAC3",
+        "22E7ADD93CFC6393C57EC0B3C17D6B44",
+        "126735FCC320D25A",
+        "CB8920F87A6C75CFF39627B56E3ED197C552D295A7CFC46AFC253B4652B1AF3795B124AB6E",
+    ),
+]
+
+
+def _omac(key, tweak, data) -> int:
+    return int.from_bytes(
+        CMAC.new(key, tweak.to_bytes(BLOCK) + data, ciphermod=AES).digest()
+    )
+
+
+@pytest.mark.parametrize("lockstep", [True, False], ids=["lockstep", "per-record"])
+@pytest.mark.parametrize(
+    "vector",
+    EAX_VECTORS,
+    ids=[f"vector{n}" for n in range(1, len(EAX_VECTORS) + 1)],
+)
+def test_eax_paper_vectors(monkeypatch, lockstep, vector):
+    message, key, nonce, header, expected = map(bytes.fromhex, vector)
+    ciphertext, tag = expected[:-BLOCK], expected[-BLOCK:]
+    batch = EaxBatch(key)
+    # derived from the hand-doubled CMAC subkeys
+    assert batch._header_mac == _omac(key, 1, b"")
+    # EaxBatch never passes a header, every vector has one: swap in its OMAC^1
+    batch._header_mac = _omac(key, 1, header)
+    if not lockstep:
+        monkeypatch.setattr(eax, "LOCKSTEP_BLOCKS", 0)
+    monkeypatch.setattr(eax, "get_random_bytes", lambda size: nonce * (size // BLOCK))
+    assert batch.encrypt([message]) == [(nonce, tag, ciphertext)]
+    assert batch.decrypt([(nonce, tag, ciphertext)]) == [message]
+    forged = bytes([tag[0] ^ 1]) + tag[1:]
+    assert batch.decrypt([(nonce, forged, ciphertext)]) == [None]
+
+
+@pytest.mark.parametrize("delta", [-1, 0, 1])
+def test_lockstep_boundary_matches_pycryptodome(delta):
+    size = LOCKSTEP_BLOCKS * BLOCK + delta
+    key = get_random_bytes(16)
+    batch = EaxBatch(key)
+    plaintexts = [get_random_bytes(size) for _ in range(3)] + [b"short"]
+    # encrypted here, verified by PyCryptodome
+    for plaintext, (nonce, tag, ciphertext) in zip(
+        plaintexts, batch.encrypt(plaintexts), strict=True
+    ):
+        cipher = AES.new(key, AES.MODE_EAX, nonce=nonce)
+        assert cipher.decrypt_and_verify(ciphertext, tag) == plaintext
+    # encrypted by PyCryptodome, verified here
+    records = []
+    for plaintext in plaintexts:
+        nonce = get_random_bytes(16)
+        cipher = AES.new(key, AES.MODE_EAX, nonce=nonce)
+        ciphertext, tag = cipher.encrypt_and_digest(plaintext)
+        records.append((nonce, tag, ciphertext))
+    assert batch.decrypt(records) == plaintexts
+    nonce, tag, ciphertext = records[0]
+    tampered = ciphertext[:-1] + bytes([ciphertext[-1] ^ 1])
+    assert batch.decrypt([(nonce, tag, tampered)]) == [None]
+
+
+def test_truncated_tags_rejected_like_pycryptodome(public_key, private_key):
+    esd = EncryptedStringDeque(public_key, data=["record"])
+    msg = esd[0]
+    tag = msg.attribute_as_bytes("tag")[:12]
+    short = RSAMessage(msg.enc_session_key, msg.nonce, tag, msg.ciphertext)
+    with pytest.raises(ValueError, match="MAC check failed"):
+        EncryptedStringDeque.decrypt(short, private_key)
+    with pytest.raises(DecryptionError, match="MAC check failed"):
+        RSADecryptor(private_key)(short)
+
+
+def test_fresh_nonce_per_record():
+    records = EaxBatch(get_random_bytes(16)).encrypt([b"same"] * 100)
+    assert len({nonce for nonce, _, _ in records}) == 100
+    assert len({ciphertext for _, _, ciphertext in records}) == 100
+
+
+@pytest.mark.parametrize("size", [0, 5, BLOCK, 5000])
+def test_records_authenticated_independently(size):
+    key = get_random_bytes(16)
+    records = EaxBatch(key).encrypt([b"a" * size, b"b" * size])
+    (nonce, tag, ciphertext), (_, other_tag, _) = records
+    with pytest.raises(ValueError, match="MAC check failed"):
+        AES.new(key, AES.MODE_EAX, nonce=nonce).decrypt_and_verify(
+            ciphertext,
+            other_tag,
+        )
+    if ciphertext:
+        tampered = bytes([ciphertext[0] ^ 1]) + ciphertext[1:]
+        with pytest.raises(ValueError, match="MAC check failed"):
+            AES.new(key, AES.MODE_EAX, nonce=nonce).decrypt_and_verify(tampered, tag)
+
+
+def test_empty_batch():
+    assert EaxBatch(get_random_bytes(16)).encrypt([]) == []
+
+
+def test_insert_batch_decrypts_per_record(public_key, private_key):
+    esd = EncryptedStringDeque(public_key, sep="\n")
+    items = ["line 1", 2, "é" * 40, ""]
+    assert esd.insert_batch(iter(items)) is esd
+    assert len(esd) == 4
+    assert [EncryptedStringDeque.decrypt(msg, private_key) for msg in esd._data] == [
+        str(item) for item in items
+    ]
+    assert len({msg.nonce for msg in esd._data}) == 4
+
+
+def test_single_and_batch_share_session_key(public_key, private_key):
+    esd = EncryptedStringDeque(public_key, data=["a", "b"])
+    esd += "c"
+    esd.insert(["d", "e"])
+    esd |= ["f"]
+    esd.insert_batch(x for x in "gh")
+    assert len({msg.enc_session_key for msg in esd._data}) == 1
+    esd.format_func = partial(EncryptedStringDeque.decrypt, private_key=private_key)
+    assert str(esd) == "abcdefgh"
+
+
+def test_batch_messages_match_constructor(public_key):
+    msg = EncryptedStringDeque(public_key, data="x")[0]
+    rebuilt = RSAMessage(msg.enc_session_key, msg.nonce, msg.tag, msg.ciphertext)
+    assert rebuilt == msg
+    assert rebuilt.attribute_as_bytes("nonce") == msg.attribute_as_bytes("nonce")
+    assert len(msg.attribute_as_bytes("tag")) == BLOCK
+
+
+def test_batch_decrypt_matches_pycryptodome():
+    key = get_random_bytes(16)
+    records = []
+    for size in SIZES:
+        nonce = get_random_bytes(16)
+        ciphertext, tag = AES.new(key, AES.MODE_EAX, nonce=nonce).encrypt_and_digest(
+            b"p" * size
+        )
+        records.append((nonce, tag, ciphertext))
+    assert EaxBatch(key).decrypt(records) == [b"p" * size for size in SIZES]
+
+
+def test_batch_decrypt_other_nonce_sizes():
+    key = get_random_bytes(16)
+    records = []
+    for nonce in (b"n", get_random_bytes(12), get_random_bytes(40)):
+        ciphertext, tag = AES.new(key, AES.MODE_EAX, nonce=nonce).encrypt_and_digest(
+            b"text"
+        )
+        records.append((nonce, tag, ciphertext))
+    assert EaxBatch(key).decrypt(records) == [b"text"] * 3
+    with pytest.raises(ValueError, match="empty"):
+        EaxBatch(key).decrypt([(b"", bytes(16), b"")])
+
+
+@pytest.mark.parametrize("size", [3, 5000])
+def test_batch_decrypt_reports_failures_per_record(size):
+    batch = EaxBatch(get_random_bytes(16))
+    records = batch.encrypt([b"a" * size, b"b" * size, b"c" * size])
+    nonce, tag, ciphertext = records[1]
+    records[1] = (nonce, tag, bytes([ciphertext[0] ^ 1]) + ciphertext[1:])
+    assert batch.decrypt(records) == [b"a" * size, None, b"c" * size]
+    assert batch.decrypt([]) == []
+
+
+class _CountingRSA:
+    def __init__(self, cipher) -> None:
+        self.cipher = cipher
+        self.calls = 0
+
+    def decrypt(self, data) -> bytes:
+        self.calls += 1
+        return self.cipher.decrypt(data)
+
+
+def test_decryptor_unwraps_session_key_once(public_key, private_key):
+    decryptor = RSADecryptor(private_key)
+    decryptor._cipher_rsa = counting = _CountingRSA(decryptor._cipher_rsa)
+    esd = EncryptedStringDeque(public_key, data=[f"line {n}" for n in range(50)])
+    esd += "single"
+    expected = [f"line {n}" for n in range(50)] + ["single"]
+    assert decryptor.decrypt_all(esd) == expected
+    assert list(decryptor.iter_decrypted(esd, chunk_size=7)) == expected
+    assert decryptor(esd[0]) == decryptor.decrypt(esd[0]) == "line 0"
+    assert counting.calls == 1
+
+
+def test_decryptor_lru_is_bounded(public_key, private_key):
+    decryptor = RSADecryptor(private_key, cache_size=1)
+    decryptor._cipher_rsa = counting = _CountingRSA(decryptor._cipher_rsa)
+    first = EncryptedStringDeque(public_key, data=["a", "b"])
+    second = EncryptedStringDeque(public_key, data=["c"])
+    mixed = [first[0], first[1], second[0], first[0]]
+    assert decryptor.decrypt_many(mixed) == ["a", "b", "c", "a"]
+    assert counting.calls == 3
+    with pytest.raises(ValueError, match="cache_size"):
+        RSADecryptor(private_key, cache_size=0)
+
+
+def test_decryptor_as_format_func(public_key, private_key):
+    esd = EncryptedStringDeque(
+        public_key, data=["x", "y"], format_func=RSADecryptor(private_key), sep="-"
+    )
+    assert str(esd) == "x-y"
+
+
+def test_decryptor_reports_tampered_message(public_key, private_key):
+    esd = EncryptedStringDeque(public_key, data=["a", "b", "c"])
+    good = esd[1]
+    esd[1] = "replaced"
+    esd.insert(
+        RSAMessage(good.enc_session_key, good.nonce, esd[0].tag, good.ciphertext),
+        skip_conversion=True,
+    )
+    decryptor = RSADecryptor(private_key)
+    with pytest.raises(ValueError, match="message 3"):
+        decryptor.decrypt_all(esd)
+    with pytest.raises(ValueError, match="message 3"):
+        list(decryptor.iter_decrypted(esd, chunk_size=2))
+    with pytest.raises(ValueError, match="chunk_size"):
+        decryptor.iter_decrypted(esd, chunk_size=0)
+
+
+@pytest.mark.parametrize(
+    "parallel",
+    [
+        None,
+        ParallelRender(max_workers=3, min_slice=4),
+        ParallelRender("process", max_workers=2, min_slice=8),
+    ],
+    ids=["default", "thread", "process"],
+)
+@pytest.mark.parametrize("storage", [None, EncryptedColumns], ids=["deque", "columns"])
+def test_decrypt_parallel_in_order(public_key, private_key, parallel, storage):
+    kwargs = {} if storage is None else {"storage": storage}
+    expected = [f"record {n}" * (n % 7) for n in range(60)]
+    esd = EncryptedStringDeque(public_key, data=expected, **kwargs)
+    assert RSADecryptor(private_key).decrypt_parallel(esd, parallel) == expected
+
+
+def test_decrypt_parallel_reports_failures_per_record(public_key, private_key):
+    esd = EncryptedStringDeque(public_key, data=[str(n) for n in range(40)])
+    good = esd[5]
+    esd[5] = "placeholder"
+    esd._data[5] = RSAMessage(
+        good.enc_session_key, good.nonce, esd[6].tag, good.ciphertext
+    )
+    other = EncryptedStringDeque(public_key, data=["x"])[0]
+    esd.insert(
+        RSAMessage(bytes(256), other.nonce, other.tag, other.ciphertext),
+        skip_conversion=True,
+    )
+    with ThreadPoolExecutor(2) as pool:
+        results = RSADecryptor(private_key).decrypt_parallel(
+            esd, ParallelRender(pool, max_workers=2, min_slice=4)
+        )
+    errors = {n: r for n, r in enumerate(results) if isinstance(r, DecryptionError)}
+    assert sorted(errors) == [5, 40]
+    assert str(errors[5]) == "MAC check failed for message 5"
+    assert errors[40].reason == "Cannot unwrap session key"
+    assert [r for n, r in enumerate(results) if n not in errors] == [
+        str(n) for n in range(40) if n != 5
+    ]
+
+
+def test_unwrap_failures_report_their_own_positions(public_key, private_key):
+    esd = EncryptedStringDeque(public_key, data=[str(n) for n in range(40)])
+    other = EncryptedStringDeque(public_key, data=["x"])[0]
+    # one run of records sharing an unwrappable key, inside the first slice
+    for n in (10, 11, 12):
+        esd._data[n] = RSAMessage(bytes(256), other.nonce, other.tag, other.ciphertext)
+    decryptor = RSADecryptor(private_key)
+    with ThreadPoolExecutor(2) as pool:
+        results = decryptor.decrypt_parallel(
+            esd, ParallelRender(pool, max_workers=2, min_slice=4)
+        )
+    errors = {n: r for n, r in enumerate(results) if isinstance(r, DecryptionError)}
+    assert sorted(errors) == [10, 11, 12]
+    assert [error.index for error in errors.values()] == [10, 11, 12]
+    assert {error.reason for error in errors.values()} == {"Cannot unwrap session key"}
+    # the serial paths raise the same error instead of PyCryptodome's ValueError
+    with pytest.raises(DecryptionError, match="unwrap session key for message 10"):
+        decryptor.decrypt_all(esd)
+    with pytest.raises(DecryptionError, match="unwrap session key for message 10"):
+        list(decryptor.iter_decrypted(esd, chunk_size=3))
+    with pytest.raises(DecryptionError, match="message 0"):
+        decryptor(esd[11])
+    assert decryptor.decrypt_many([esd[13], esd[14]]) == ["13", "14"]
+
+
+def test_decryption_error_pickles():
+    error = pickle.loads(pickle.dumps(DecryptionError(3, "MAC check failed")))
+    assert isinstance(error, ValueError)
+    assert (error.index, error.reason) == (3, "MAC check failed")
+    assert str(error) == "MAC check failed for message 3"
@@ -0,0 +1,146 @@
+# ruff: noqa: ANN001, ANN201, D103, PLR2004, S101, S311, SLF001
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for the EncryptedColumns storage of EncryptedStringDeque."""
+
+import random
+import sys
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+try:
+    from Crypto.PublicKey import RSA  # nosec: B413
+except ModuleNotFoundError:
+    pytest.skip(allow_module_level=True)
+from stringdatadeque import EncryptedColumns
+from stringdatadeque import EncryptedStringDeque
+from stringdatadeque import RSADecryptor
+from stringdatadeque import RSAMessage
+
+ROOT = Path(__file__).parent.resolve()
+
+
+@pytest.fixture(scope="module")
+def public_key():
+    return RSA.import_key((ROOT / "default.pem").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return RSA.import_key((ROOT / "private.pem").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def messages(public_key):
+    first = EncryptedStringDeque(public_key, data=[f"m{n}" * n for n in range(40)])
+    second = EncryptedStringDeque(public_key, data=["other key"])
+    return [first[n] for n in range(40)] + [second[0]]
+
+
+def test_columns_match_deque(messages):
+    rng = random.Random(1234)
+    columns = EncryptedColumns()
+    reference = deque()
+    for _ in range(400):
+        roll = rng.random()
+        if roll < 0.4:
+            item = rng.choice(messages)
+            columns.append(item)
+            reference.append(item)
+        elif roll < 0.5:
+            items = rng.sample(messages, rng.randint(0, 5))
+            columns.extend(items)
+            reference.extend(items)
+        elif roll < 0.6 and reference:
+            index = rng.randrange(-len(reference), len(reference))
+            del columns[index]
+            del reference[index]
+        elif roll < 0.7 and reference:
+            assert columns.popleft() == reference.popleft()
+        elif roll < 0.8 and reference:
+            assert columns.pop() == reference.pop()
+        elif roll < 0.9 and reference:
+            index = rng.randrange(-len(reference), len(reference))
+            item = rng.choice(messages)
+            columns[index] = item
+            reference[index] = item
+        else:
+            needle = rng.choice(messages)
+            assert (needle in columns) == (needle in reference)
+        assert len(columns) == len(reference)
+        assert list(columns) == list(reference)
+        assert list(reversed(columns)) == list(reversed(reference))
+        start = rng.randint(0, len(reference))
+        stop = rng.randint(start, len(reference))
+        assert list(columns.iter_range(start, stop)) == list(reference)[start:stop]
+    assert "text" not in columns
+    columns.clear()
+    assert len(columns) == 0
+    assert list(columns) == []
+    with pytest.raises(IndexError):
+        columns.pop()
+
+
+def test_session_key_stored_once(public_key):
+    esd = EncryptedStringDeque(public_key, data=["a", "b"], storage=EncryptedColumns)
+    esd += "c"
+    esd.insert_batch(str(n) for n in range(100))
+    assert esd._data.session_keys == 1
+    assert esd._data.nbytes < 103 * 64
+    assert repr(esd._data) == "EncryptedColumns(<103 messages, 1 session keys>)"
+
+
+def test_columns_decrypt(public_key, private_key):
+    esd = EncryptedStringDeque(
+        public_key,
+        data=["x", "é" * 300],
+        format_func=RSADecryptor(private_key),
+        sep="|",
+        storage=EncryptedColumns,
+    )
+    esd |= ["", "z"]
+    assert str(esd) == "|".join(["x", "é" * 300, "", "z"])
+    assert EncryptedStringDeque.decrypt(esd[1], private_key) == "é" * 300
+    decryptor = RSADecryptor(private_key)
+    assert decryptor.decrypt_all(esd) == ["x", "é" * 300, "", "z"]
+    assert list(decryptor.iter_decrypted(esd, chunk_size=3)) == [
+        "x",
+        "é" * 300,
+        "",
+        "z",
+    ]
+    assert decryptor(esd.draw(0)) == "x"
+    assert decryptor.decrypt_all(esd) == ["é" * 300, "", "z"]
+    assert esd.render(1) == "|z"
+    assert str(esd[::2]) == "é" * 300 + "|z"
+
+
+def test_lazy_messages_compare_equal(public_key):
+    plain = EncryptedStringDeque(public_key, data=["a", "b"])
+    columns = EncryptedColumns([plain[0], plain[1]])
+    assert columns[0] == plain[0]
+    assert columns[-1] == plain[1]
+    assert plain[1] in columns
+    assert isinstance(columns[0], RSAMessage)
+
+
+def test_rejects_other_nonce_sizes(public_key):
+    msg = EncryptedStringDeque(public_key, data="a")[0]
+    odd = RSAMessage(msg.enc_session_key, b"short", msg.tag, msg.ciphertext)
+    columns = EncryptedColumns()
+    with pytest.raises(ValueError, match="16 byte"):
+        columns.append(odd)
+    assert len(columns) == 0
+
+
+def test_columns_use_less_memory(public_key):
+    plain = EncryptedStringDeque(public_key, data=[f"{n:06d}" for n in range(200)])
+    columns = EncryptedColumns(plain._data)
+    per_message = sum(
+        sys.getsizeof(getattr(msg, name))
+        for msg in plain._data
+        for name in ("_nonce", "_tag", "_ciphertext")
+    )
+    assert columns.nbytes * 3 < per_message
@@ -0,0 +1,247 @@
+# ruff: noqa: ANN001, ANN201, D103, PLR2004, S101, SLF001
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for the append-only encrypted log."""
+
+from pathlib import Path
+
+import pytest
+
+try:
+    from Crypto.Cipher import AES  # nosec: B413
+    from Crypto.PublicKey import RSA  # nosec: B413
+except ModuleNotFoundError:
+    pytest.skip(allow_module_level=True)
+from stringdatadeque import DecryptionError
+from stringdatadeque import EncryptedColumns
+from stringdatadeque import EncryptedLogReader
+from stringdatadeque import EncryptedLogWriter
+from stringdatadeque import EncryptedStringDeque
+from stringdatadeque import RSADecryptor
+from stringdatadeque.encryptedlog import _FRAME
+from stringdatadeque.encryptedlog import _index_path
+
+ROOT = Path(__file__).parent.resolve()
+RECORDS = [f"record {n} " + "x" * (n % 40) for n in range(100)]
+
+
+@pytest.fixture(scope="module")
+def public_key():
+    return RSA.import_key((ROOT / "default.pem").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return RSA.import_key((ROOT / "private.pem").read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def log_path(tmp_path, public_key):
+    path = tmp_path / "records.log"
+    with EncryptedLogWriter(path, public_key, index_interval=8) as writer:
+        writer.extend(RECORDS[:60])
+        for record in RECORDS[60:]:
+            writer.append(record)
+    return path
+
+
+def test_round_trip(log_path, private_key):
+    decryptor = RSADecryptor(private_key)
+    with EncryptedLogReader(log_path) as reader:
+        assert len(reader) == len(RECORDS)
+        assert reader.index_interval == 8
+        assert list(reader.decrypt(decryptor, chunk_size=7)) == RECORDS
+        assert [decryptor(msg) for msg in reader] == RECORDS
+
+
+def _offsets(path) -> list[int]:
+    with EncryptedLogReader(path) as reader:
+        return list(reader._offsets)
+
+
+def test_frames_are_compact(log_path, private_key):
+    with EncryptedLogReader(log_path) as reader:
+        header = len(reader.enc_session_key) + 10
+        assert log_path.stat().st_size == header + sum(
+            _FRAME.size + len(record.encode()) for record in RECORDS
+        )
+        # every frame is a plain EAX message under the session key in the header
+        session_key = RSADecryptor(private_key)._unwrap(reader._b64_key).key
+        _, (nonce, tag, ciphertext) = next(reader.iter_raw(5))
+    cipher = AES.new(session_key, AES.MODE_EAX, nonce=nonce)
+    assert cipher.decrypt_and_verify(ciphertext, tag).decode() == RECORDS[5]
+
+
+@pytest.mark.parametrize("start", [0, 1, 7, 8, 9, 63, 64, 99, 100, -3])
+def test_seek(log_path, private_key, start):
+    decryptor = RSADecryptor(private_key)
+    with EncryptedLogReader(log_path) as reader:
+        assert (
+            list(reader.decrypt(decryptor, start, start + 5 or None))
+            == (RECORDS[start : start + 5 or None])
+        )
+        if start < len(RECORDS):
+            assert decryptor(reader[start]) == RECORDS[start]
+
+
+class _CountingFile:
+    def __init__(self, file) -> None:
+        self.file = file
+        self.reads = 0
+
+    def read(self, size) -> bytes:
+        self.reads += 1
+        return self.file.read(size)
+
+    def seek(self, offset, whence=0) -> int:
+        return self.file.seek(offset, whence)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def test_seek_reads_few_frame_headers(log_path, private_key):
+    with EncryptedLogReader(log_path) as reader:
+        reader._file = counting = _CountingFile(reader._file)
+        assert RSADecryptor(private_key)(reader[95]) == RECORDS[95]
+        # 7 lengths skipped from the entry of record 88, then one frame
+        assert counting.reads == 9
+        with pytest.raises(IndexError):
+            reader[100]
+
+
+def test_index_offsets(log_path):
+    with EncryptedLogReader(log_path) as reader:
+        assert len(reader._offsets) == 13  # records 0, 8, ..., 96
+        for slot, offset in enumerate(reader._offsets):
+            assert reader._frame_offset(slot * 8) == offset
+        assert reader._frame_offset(len(reader)) == log_path.stat().st_size
+
+
+def test_missing_or_stale_index_is_rebuilt(log_path, private_key):
+    expected = _offsets(log_path)
+    index = _index_path(log_path)
+    index.unlink()
+    with EncryptedLogReader(log_path) as reader:
+        assert len(reader) == len(RECORDS)
+        assert reader.index_interval == 1024
+        assert list(reader._offsets) == expected[:1]
+    # the writer writes a new index for its own interval
+    with EncryptedLogWriter(log_path, private_key, index_interval=8):
+        pass
+    assert _offsets(log_path) == expected
+    # entries past the end of the log are dropped
+    index.write_bytes(index.read_bytes()[:-3] + b"\xff" * 3)
+    assert _offsets(log_path) == expected
+
+
+def test_continue_log(log_path, public_key, private_key):
+    with EncryptedLogWriter(log_path, private_key, index_interval=8) as writer:
+        assert len(writer) == len(RECORDS)
+        writer.extend(["more", "records"])
+    decryptor = RSADecryptor(private_key)
+    reader = EncryptedLogReader(log_path)
+    assert list(reader.decrypt(decryptor, -3)) == [RECORDS[-1], "more", "records"]
+    reader.close()
+    with pytest.raises(TypeError, match="private"):
+        EncryptedLogWriter(log_path, public_key)
+
+
+def test_torn_frame_is_ignored_then_truncated(log_path, private_key):
+    size = log_path.stat().st_size
+    with log_path.open("ab") as file:
+        file.write(_FRAME.pack(100, bytes(16), bytes(16)) + b"partial")
+    with EncryptedLogReader(log_path) as reader:
+        assert len(reader) == len(RECORDS)
+    with EncryptedLogWriter(log_path, private_key, index_interval=8) as writer:
+        assert log_path.stat().st_size == size
+        writer.append("after crash")
+    reader = EncryptedLogReader(log_path)
+    assert list(reader.decrypt(RSADecryptor(private_key), -2)) == [
+        RECORDS[-1],
+        "after crash",
+    ]
+    reader.close()
+
+
+def test_damaged_length_is_not_truncated(tmp_path, public_key, private_key):
+    path = tmp_path / "damaged.log"
+    with EncryptedLogWriter(path, public_key, index_interval=1000) as writer:
+        writer.extend(RECORDS)
+    with EncryptedLogReader(path) as reader:
+        offset = reader._frame_offset(50)
+    data = bytearray(path.read_bytes())
+    data[offset + 3] ^= 0x40  # the length now runs past the end of the log
+    path.write_bytes(data)
+    with EncryptedLogReader(path) as reader:
+        assert len(reader) == 50
+    with pytest.raises(ValueError, match=f"offset {offset} .* damaged"):
+        EncryptedLogWriter(path, private_key, index_interval=1000)
+    assert path.read_bytes() == data
+
+
+def test_follow_growing_log(tmp_path, public_key, private_key):
+    path = tmp_path / "follow.log"
+    decryptor = RSADecryptor(private_key)
+    writer = EncryptedLogWriter(path, public_key, index_interval=4)
+    writer.extend(RECORDS[:10])
+    writer.flush()
+    reader = EncryptedLogReader(path)
+    assert len(reader) == 10
+    writer.extend(RECORDS[10:30])
+    assert reader.refresh() == 10  # not flushed yet
+    writer.flush()
+    assert reader.refresh() == 30
+    assert list(reader.decrypt(decryptor, 8)) == RECORDS[8:30]
+    writer.close()
+    reader.close()
+
+
+@pytest.mark.parametrize("storage", [None, EncryptedColumns], ids=["deque", "columns"])
+def test_from_deque(tmp_path, public_key, private_key, storage):
+    kwargs = {} if storage is None else {"storage": storage}
+    esd = EncryptedStringDeque(public_key, data=RECORDS[:20], **kwargs)
+    path = tmp_path / "deque.log"
+    with EncryptedLogWriter.from_deque(path, esd) as writer:
+        writer.append("appended")
+    reader = EncryptedLogReader(path)
+    assert reader.enc_session_key == esd.enc_session_key
+    assert reader[3] == esd[3]
+    assert list(reader.decrypt(RSADecryptor(private_key))) == [
+        *RECORDS[:20],
+        "appended",
+    ]
+    reader.close()
+    with pytest.raises(FileExistsError):
+        EncryptedLogWriter.from_deque(path, esd)
+
+
+def test_rejects_foreign_messages(tmp_path, public_key):
+    with EncryptedLogWriter(tmp_path / "a.log", public_key) as writer:
+        other = EncryptedStringDeque(public_key, data=["x"])
+        with pytest.raises(ValueError, match="another session key"):
+            writer.append_messages(other)
+        assert len(writer) == 0
+
+
+def test_tampered_frame(log_path, private_key):
+    data = bytearray(log_path.read_bytes())
+    data[-1] ^= 1
+    log_path.write_bytes(data)
+    with EncryptedLogReader(log_path) as reader:
+        with pytest.raises(DecryptionError, match="message 99"):
+            list(reader.decrypt(RSADecryptor(private_key), 90))
+        with pytest.raises(ValueError, match="chunk_size"):
+            reader.decrypt(RSADecryptor(private_key), chunk_size=0)
+
+
+def test_invalid_files(tmp_path, public_key):
+    path = tmp_path / "not.log"
+    path.write_bytes(b"plain text, not a log")
+    with pytest.raises(ValueError, match="not an encrypted log"):
+        EncryptedLogReader(path)
+    with pytest.raises(ValueError, match="index_interval"):
+        EncryptedLogWriter(tmp_path / "new.log", public_key, index_interval=0)
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="not an encrypted log"):
+        EncryptedLogReader(path)
@@ -0,0 +1,57 @@
+# ruff: noqa: ANN201, D103, S101, S603, SLF001
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests that importing the package stays lazy."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import stringdatadeque
+from stringdatadeque import typecheck
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+PROBE = """
+import sys
+import stringdatadeque
+from stringdatadeque import typecheck
+
+eager = [name for name in ("Crypto", "asyncio") if name in sys.modules]
+pending = stringdatadeque.StringDeque in typecheck._pending
+stringdatadeque.StringDeque("x")
+decorated = stringdatadeque.StringDeque not in typecheck._pending
+base_decorated = stringdatadeque.StringDataDeque not in typecheck._pending
+cls = stringdatadeque.EncryptedStringDeque
+print(eager, pending, decorated, base_decorated, "Crypto" in sys.modules, cls.__name__)
+"""
+
+
+def test_import_is_lazy():
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    env.pop(typecheck.ENV_VAR, None)
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    ).stdout.split()
+    assert output == ["[]", "True", "True", "True", "True", "EncryptedStringDeque"]
+
+
+def test_lazy_attributes():
+    assert stringdatadeque.RSAMessage.__name__ == "RSAMessage"
+    assert "RSAMessage" in vars(stringdatadeque)
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        stringdatadeque.missing  # noqa: B018
+
+
+@pytest.mark.skipif(typecheck.LEVEL == "off", reason="type checking disabled")
+def test_decorate_pending():
+    typecheck.decorate_pending()
+    assert not typecheck._pending
+    assert hasattr(stringdatadeque.WORMStringDeque.__setitem__, "__wrapped__")
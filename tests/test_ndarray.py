@@ -0,0 +1,86 @@
+# ruff: noqa: ANN001, ANN201, ANN202, D103, S101
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for the NumPy bulk ingest path."""
+
+import pytest
+
+from stringdatadeque import CircularStringDeque
+from stringdatadeque import StringDataDeque
+from stringdatadeque import StringDeque
+from stringdatadeque import ndarray as ndarray_module
+
+np = pytest.importorskip("numpy")
+
+rng = np.random.default_rng(42)
+ARRAYS = {
+    "int64": rng.integers(-(2**63), 2**63 - 1, 500, dtype=np.int64),
+    "uint64": rng.integers(0, 2**64 - 1, 500, dtype=np.uint64),
+    "int8": rng.integers(-128, 127, 500, dtype=np.int8),
+    "bool": rng.integers(0, 2, 500).astype(bool),
+    "float64": np.concatenate(
+        [
+            rng.standard_normal(500) * 10.0 ** rng.integers(-300, 300, 500),
+            [np.nan, np.inf, -np.inf, -0.0, 5e-324, 1e16, 0.1],
+        ],
+    ),
+    "float32": rng.standard_normal(500).astype(np.float32),
+    "float16": rng.standard_normal(500).astype(np.float16),
+    "complex128": rng.standard_normal(500) + 1j * rng.standard_normal(500),
+    "unicode": np.array(["a", "héllo", "", "x" * 40]),
+    "bytes": np.array([b"a", b"bc"]),
+    "datetime": np.array(["2020-01-01", "NaT"], dtype="datetime64[D]"),
+    "object": np.array([1, "a", None], dtype=object),
+    "2d": np.arange(6).reshape(2, 3),
+    "masked": np.ma.masked_array([1, 2, 3], mask=[0, 1, 0]),
+}
+
+
+@pytest.mark.parametrize("name", list(ARRAYS))
+def test_matches_per_element_str(name):
+    array = ARRAYS[name]
+    expected = [str(item) for item in array]
+    assert list(array | StringDeque()) == expected
+    sd = StringDeque()
+    sd |= array
+    assert list(sd) == expected
+    assert list(StringDeque().insert(array)) == expected
+    assert list(StringDeque(array)) == expected
+
+
+def test_uses_bulk_path(monkeypatch):
+    calls = []
+    original = ndarray_module.extend_str
+
+    def spy(target, array):
+        calls.append(array.dtype.kind)
+        return original(target, array)
+
+    monkeypatch.setattr("stringdatadeque.stringdatadeque.extend_str", spy)
+    monkeypatch.setattr(ndarray_module, "BULK_CHUNK", 7)
+    array = np.arange(100)
+    sd = StringDeque(sep=",")
+    sd |= array
+    assert str(sd) == ",".join(map(str, range(100)))
+    assert calls == ["i"]
+
+
+def test_bulk_path_respects_storage_and_convert_func():
+    circular = CircularStringDeque(size=3, data=np.arange(10))
+    assert list(circular) == ["7", "8", "9"]
+    doubled = StringDataDeque(
+        convert_func=lambda value: value * 2,
+        format_func=str,
+        data=np.arange(3),
+    )
+    assert str(doubled) == "024"
+
+
+def test_scalars_and_zero_dim_arrays_are_single_items():
+    sd = StringDeque()
+    sd.insert(np.float32(0.1))
+    sd.insert(np.array(5))
+    assert list(sd) == ["0.1", "5"]
+    assert ndarray_module.is_ndarray(np.arange(2))
+    assert not ndarray_module.is_ndarray(np.array(5))
+    assert not ndarray_module.is_ndarray([1])
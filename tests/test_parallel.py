@@ -0,0 +1,78 @@
+# ruff: noqa: ANN001, ANN201, ANN202, D103, S101
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for parallel rendering."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from stringdatadeque import ParallelRender
+from stringdatadeque import StringDataDeque
+from stringdatadeque import StringDeque
+
+
+def _records(count):
+    return StringDataDeque(
+        convert_func=int,
+        format_func=lambda value: f"<{value}>",
+        data=list(range(count)),
+        sep=",",
+    )
+
+
+@pytest.mark.parametrize("count", [0, 1, 9, 10, 11, 97, 1000])
+def test_thread_render_matches_serial(count):
+    sd = _records(count)
+    expected = str(sd)
+    sd = _records(count)
+    sd.parallel = ParallelRender(max_workers=3, min_slice=5)
+    assert str(sd) == expected
+    assert f"{sd:sep=|}" == expected.replace(",", "|")
+
+
+def test_process_render_matches_serial():
+    sd = StringDeque([str(n) for n in range(200)], sep="\n")
+    expected = str(sd)
+    sd = StringDeque([str(n) for n in range(200)], sep="\n")
+    sd.parallel = ParallelRender("process", max_workers=2, min_slice=10)
+    assert str(sd) == expected
+
+
+def test_uses_the_pool_only_when_large_enough():
+    threads = set()
+
+    def fmt(value):
+        threads.add(threading.get_ident())
+        return str(value)
+
+    sd = StringDataDeque(convert_func=int, format_func=fmt, data=list(range(19)))
+    sd.parallel = ParallelRender(max_workers=4, min_slice=10)
+    str(sd)
+    assert threads == {threading.get_ident()}
+    sd += 19
+    sd.format_func = fmt
+    threads.clear()
+    with ThreadPoolExecutor(2) as pool:
+        sd.parallel = ParallelRender(pool, max_workers=2, min_slice=10)
+        assert str(sd) == "".join(map(str, range(20)))
+    assert threading.get_ident() not in threads
+
+
+def test_cached_tail_is_rendered_in_parallel():
+    sd = _records(10)
+    sd.parallel = ParallelRender(max_workers=2, min_slice=2)
+    assert str(sd) == ",".join(f"<{n}>" for n in range(10))
+    sd.insert(list(range(10, 50)))
+    assert str(sd) == ",".join(f"<{n}>" for n in range(50))
+    sd.parallel = None
+    assert sd.parallel is None
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError, match="min_slice"):
+        ParallelRender(min_slice=0)
+    with pytest.raises(ValueError, match="max_workers"):
+        ParallelRender(max_workers=0)
+    assert ParallelRender(max_workers=1).render([1, 2], 2, str, "-") == "1-2"
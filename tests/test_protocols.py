@@ -0,0 +1,44 @@
+# ruff: noqa: ANN201, ANN204, D101, D103, D105, PLR2004, S101, SLF001
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for the validators in protocols."""
+
+import pytest
+
+from stringdatadeque import StringDeque
+from stringdatadeque import protocols
+from stringdatadeque import typecheck
+
+
+class Plain:
+    pass
+
+
+class Custom:
+    def __str__(self):
+        return "custom"
+
+
+def test_defines_str():
+    assert protocols._defines_str(1)
+    assert protocols._defines_str("a")
+    assert protocols._defines_str(None) is False
+    assert protocols._defines_str(Custom())
+    assert protocols._defines_str(Plain()) is False
+
+
+def test_defines_str_is_cached_per_type():
+    protocols._type_defines_str.cache_clear()
+    for value in range(1000):
+        protocols._defines_str(value)
+    info = protocols._type_defines_str.cache_info()
+    assert info.misses == 1
+    assert info.hits == 999
+    assert info.maxsize == protocols.TYPE_CACHE_SIZE
+
+
+@pytest.mark.skipif(typecheck.LEVEL == "off", reason="type checking disabled")
+def test_constructor_rejects_objects_without_str():
+    assert str(StringDeque(Custom())) == "custom"
+    with pytest.raises(Exception, match="violates"):
+        StringDeque(Plain())
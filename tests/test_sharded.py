@@ -0,0 +1,184 @@
+# ruff: noqa: ANN001, ANN201, ANN202, D103, PERF401, PLR2004, S101, SLF001
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for the per-thread sharded storage and ShardedStringDeque."""
+
+import threading
+
+import pytest
+
+from stringdatadeque import ShardedStorage
+from stringdatadeque import ShardedStringDeque
+
+
+def _run_threads(count, target):
+    barrier = threading.Barrier(count)
+
+    def worker(number):
+        barrier.wait()
+        target(number)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+@pytest.mark.parametrize("order", ["thread", "arrival"])
+def test_concurrent_appends_keep_per_thread_order(order):
+    sd = ShardedStringDeque(sep=",", order=order)
+
+    def work(number):
+        for i in range(2000):
+            sd.insert(f"{number}:{i}")
+
+    _run_threads(8, work)
+    assert len(sd) == 16000
+    assert sd._data.shards == 8
+    items = str(sd).split(",")
+    assert sorted(items) == sorted(f"{n}:{i}" for n in range(8) for i in range(2000))
+    for number in range(8):
+        mine = [item for item in items if item.startswith(f"{number}:")]
+        assert mine == [f"{number}:{i}" for i in range(2000)]
+
+
+def test_thread_order_is_shard_order():
+    sd = ShardedStringDeque(["main"], sep=" ")
+    thread = threading.Thread(target=lambda: sd.insert(["a", "b"]))
+    thread.start()
+    thread.join()
+    sd += "c"
+    assert str(sd) == "main c a b"
+
+
+def test_arrival_order():
+    sd = ShardedStringDeque(["first"], sep=" ", order="arrival")
+    thread = threading.Thread(target=lambda: sd.insert("second"))
+    thread.start()
+    thread.join()
+    sd += "third"
+    assert str(sd) == "first second third"
+    assert list(reversed(sd._data)) == ["third", "second", "first"]
+
+
+def test_reads_during_appends():
+    sd = ShardedStringDeque(sep="\n")
+    stop = threading.Event()
+    lengths = []
+
+    def reader():
+        while not stop.is_set():
+            str(sd)
+            lengths.append(len(sd))
+            assert "x" not in sd
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    _run_threads(4, lambda _: [sd.insert("y") for _ in range(5000)])
+    stop.set()
+    thread.join()
+    assert lengths == sorted(lengths)
+    assert len(sd) == 20000
+
+
+def test_clear_and_draw():
+    sd = ShardedStringDeque(sep=",")
+    thread = threading.Thread(target=lambda: sd.insert(["a", "b"]))
+    thread.start()
+    thread.join()
+    sd.insert(["c"])
+    assert str(sd) == "a,b,c"
+    assert sd.draw(1) == "b"
+    assert sd.draw() == "c"
+    sd[0] = "z"
+    assert str(sd) == "z"
+    sd.clear()
+    assert len(sd) == 0
+    assert str(sd) == ""
+    with pytest.raises(IndexError):
+        sd.draw()
+
+
+def test_concurrent_draws_are_unique():
+    sd = ShardedStringDeque([str(i) for i in range(1000)])
+    drawn = []
+
+    def work(_):
+        for _ in range(250):
+            drawn.append(sd.draw(0))
+
+    _run_threads(4, work)
+    assert sorted(drawn, key=int) == [str(i) for i in range(1000)]
+    assert len(sd) == 0
+
+
+def test_storage_index_and_order_validation():
+    storage = ShardedStorage(["a", "b", "c"], order="arrival")
+    assert storage[-1] == "c"
+    storage[1] = "B"
+    del storage[0]
+    assert list(storage) == ["B", "c"]
+    assert "c" in storage
+    assert "a" not in storage
+    assert "2 elements in 1 shards" in repr(storage)
+    with pytest.raises(ValueError, match="order"):
+        ShardedStorage(order="random")
+
+
+@pytest.mark.parametrize("order", ["thread", "arrival"])
+def test_shards_of_exited_threads_are_reclaimed(order):
+    storage = ShardedStorage(order=order)
+
+    def append_in_new_thread(item):
+        thread = threading.Thread(target=storage.append, args=(item,))
+        thread.start()
+        thread.join()
+
+    # one thread per task, each drained before the next one starts
+    for n in range(50):
+        append_in_new_thread(str(n))
+        assert storage.take(0) == str(n)
+    assert storage.shards <= 1
+    # shards of exited threads are kept while they hold elements
+    for item in ("a", "b", "c"):
+        append_in_new_thread(item)
+    storage.append("d")
+    assert storage.shards == 4
+    assert storage.take_many(2) == ["a", "b"]
+    assert storage.shards == 2
+    assert list(storage) == ["c", "d"]
+    storage.clear()
+    assert storage.shards == 1  # the main thread is still alive
+    storage.append("e")
+    assert list(storage) == ["e"]
+
+
+@pytest.mark.parametrize("order", ["thread", "arrival"])
+def test_draw_many_across_shards(order):
+    sd = ShardedStringDeque(sep=",", order=order)
+    _run_threads(4, lambda n: sd.insert([f"{n}-{i}" for i in range(50)]))
+    merged = list(sd._data)
+    assert sd.draw_many(30, "right") == merged[-30:]
+    assert sd.draw_many(70) == merged[:70]
+    assert list(sd._data) == merged[70:-30]
+
+
+def test_concurrent_draw_many_while_appending():
+    sd = ShardedStringDeque([str(i) for i in range(1000)])
+    drawn = []
+
+    def work(number):
+        if number == 0:
+            sd.insert(["late"] * 200)
+            return
+        for _ in range(25):
+            drawn.extend(sd.draw_many(10, "left" if number % 2 else "right"))
+
+    _run_threads(5, work)
+    # nothing is taken twice or lost, wherever the concurrent appends landed
+    remaining = list(sd._data)
+    assert sorted(drawn + remaining) == sorted(
+        [str(i) for i in range(1000)] + ["late"] * 200
+    )
+    assert len(drawn) == 1000
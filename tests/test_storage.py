@@ -0,0 +1,321 @@
+# ruff: noqa: ANN001, ANN201, D103, PLR2004, S101, S311
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for the alternative storage backends."""
+
+import random
+from collections import deque
+
+import pytest
+
+from stringdatadeque import BlockStorage
+from stringdatadeque import BoundedStorage
+from stringdatadeque import CircularStringDeque
+from stringdatadeque import RopeStorage
+from stringdatadeque import SpillingStringDeque
+from stringdatadeque import SpillStorage
+from stringdatadeque import StringDeque
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [
+        lambda _: RopeStorage(chunk_size=8),
+        lambda tmp_path: SpillStorage(memory_limit=12, directory=tmp_path),
+        lambda _: BlockStorage(block_size=4),
+    ],
+    ids=["rope", "spill", "block"],
+)
+def test_storage_matches_deque(factory, tmp_path):
+    rng = random.Random(1234)
+    rope = factory(tmp_path)
+    reference = deque()
+    for step in range(2000):
+        roll = rng.random()
+        if roll < 0.5:
+            item = "".join(rng.choice("ab\u00e9") for _ in range(rng.randint(0, 4)))
+            rope.append(item)
+            reference.append(item)
+        elif roll < 0.6 and reference:
+            index = rng.randrange(-len(reference), len(reference))
+            del rope[index]
+            del reference[index]
+        elif roll < 0.7 and reference:
+            assert rope.popleft() == reference.popleft()
+        elif roll < 0.8 and reference:
+            assert rope.pop() == reference.pop()
+        elif roll < 0.9 and reference:
+            index = rng.randrange(-len(reference), len(reference))
+            rope[index] = str(step)
+            reference[index] = str(step)
+        else:
+            needle = "".join(rng.choice("abc") for _ in range(rng.randint(0, 3)))
+            assert (needle in rope) == (needle in reference)
+        assert len(rope) == len(reference)
+        assert list(rope) == list(reference)
+        assert list(reversed(rope)) == list(reversed(reference))
+        if hasattr(rope, "iter_range"):
+            start = rng.randint(0, len(reference))
+            stop = rng.randint(start, len(reference))
+            assert list(rope.iter_range(start, stop)) == list(reference)[start:stop]
+
+
+def test_rope_contains_respects_boundaries():
+    rope = RopeStorage(["ab", "cd", "b"], chunk_size=1024)
+    rope.extend(["x"] * 2000)
+    assert "ab" in rope
+    assert "cd" in rope
+    assert "bc" not in rope
+    assert "abcd" not in rope
+    del rope[0]
+    assert "ab" not in rope
+    assert 1 not in rope
+
+
+def test_rope_errors():
+    rope = RopeStorage()
+    with pytest.raises(TypeError):
+        rope.append(1)
+    with pytest.raises(IndexError):
+        rope[0]
+    with pytest.raises(IndexError):
+        rope.pop()
+    with pytest.raises(ValueError, match="chunk_size"):
+        RopeStorage(chunk_size=0)
+
+
+def test_stringdeque_with_rope_storage():
+    sd = StringDeque(sep=",", storage=lambda: RopeStorage(chunk_size=4))
+    sd |= range(10)
+    assert str(sd) == "0,1,2,3,4,5,6,7,8,9"
+    assert sd[7] == "7"
+    assert sd.draw(0) == "0"
+    assert sd.draw() == "9"
+    assert "5" in sd
+    assert "4,5" in sd
+    assert len(sd) == 8
+
+
+def test_spill_storage_files(tmp_path):
+    storage = SpillStorage(
+        ["a" * 10, "b" * 10, "c" * 10], memory_limit=15, directory=tmp_path
+    )
+    assert storage.spilled == 2
+    directory = storage.directory
+    assert directory is not None
+    assert len(list(directory.iterdir())) == 1
+    assert storage[0] == "a" * 10
+    assert "b" * 10 in storage
+    assert "ab" not in storage
+    storage.close()
+    assert not directory.exists()
+    assert len(storage) == 0
+    with pytest.raises(ValueError, match="memory_limit"):
+        SpillStorage(memory_limit=0)
+
+
+def test_spilling_stringdeque(tmp_path):
+    sd = SpillingStringDeque(memory_limit=16, sep=",", directory=tmp_path)
+    sd |= [f"item{n}" for n in range(50)]
+    assert sd._data.spilled > 0  # noqa: SLF001
+    expected = ",".join(f"item{n}" for n in range(50))
+    assert str(sd) == expected
+    assert "".join(sd.iter_chunks(7)) == expected
+    assert sd[3] == "item3"
+    assert sd.draw(0) == "item0"
+    assert sd.draw() == "item49"
+    assert "item10,item11" in sd
+    sd.close()
+    assert str(sd) == ""
+
+
+def _within_limits(reference, maxlen, budget, measure) -> None:
+    """Evict from a reference deque the way BoundedStorage is documented to."""
+    while len(reference) > maxlen or (
+        sum(map(measure, reference)) > budget and len(reference) > 1
+    ):
+        reference.popleft()
+
+
+@pytest.mark.parametrize(
+    ("unit", "measure"),
+    [("chars", len), ("bytes", lambda text: len(text.encode()))],
+)
+@pytest.mark.parametrize("maxlen", [None, 5])
+def test_bounded_storage_matches_model(unit, measure, maxlen):
+    rng = random.Random(4321)
+    storage = BoundedStorage(maxlen=maxlen, budget=12, unit=unit)
+    reference = deque()
+    for step in range(1500):
+        roll = rng.random()
+        if roll < 0.6:
+            item = "".join(
+                rng.choice("ab\u00e9\U0001f600") for _ in range(rng.randint(0, 8))
+            )
+            storage.append(item)
+            reference.append(item)
+        elif roll < 0.7 and reference:
+            index = rng.randrange(-len(reference), len(reference))
+            del storage[index]
+            del reference[index]
+        elif roll < 0.8 and reference:
+            assert storage.popleft() == reference.popleft()
+        elif roll < 0.9 and reference:
+            assert storage.pop() == reference.pop()
+        elif reference:
+            index = rng.randrange(-len(reference), len(reference))
+            storage[index] = str(step)
+            reference[index] = str(step)
+        _within_limits(reference, maxlen or len(reference), 12, measure)
+        assert list(storage) == list(reference)
+        assert storage.total == sum(map(measure, reference))
+
+
+def test_bounded_storage_keeps_newest_fragment():
+    storage = BoundedStorage(["ab", "cd"], budget=4)
+    storage.append("x" * 10)
+    assert list(storage) == ["x" * 10]
+    assert storage.total == 10
+    storage.append("y")
+    assert list(storage) == ["y"]
+    assert repr(storage) == (
+        "BoundedStorage(<1 fragments, 1 chars>, maxlen=None, budget=4)"
+    )
+    with pytest.raises(TypeError):
+        storage.append(1)
+    with pytest.raises(ValueError, match="unit"):
+        BoundedStorage(budget=1, unit="words")
+    with pytest.raises(ValueError, match="budget"):
+        BoundedStorage(budget=-1)
+
+
+def test_circular_budget():
+    ring = CircularStringDeque(data=["aaaa", "bb", "cc"], sep="|", budget=8)
+    assert str(ring) == "aaaa|bb|cc"
+    ring += "dddd"
+    assert str(ring) == "bb|cc|dddd"
+    assert ring.total_size == 8
+    ring.insert(["\u00e9" * 3] * 2)
+    assert str(ring) == "\u00e9\u00e9\u00e9|\u00e9\u00e9\u00e9"
+    assert ring.draw(0) == "\u00e9\u00e9\u00e9"
+    assert ring.total_size == 3
+
+    both = CircularStringDeque(size=2, budget=100, unit="bytes")
+    both |= ["\u00e9", "b", "c"]
+    assert list(both) == ["b", "c"]
+    both[0] = "\u00e9" * 50
+    assert both.total_size == 1
+    assert list(both) == ["c"]
+
+    assert CircularStringDeque(size=2, data=["a", "b", "c"]).total_size is None
+    with pytest.raises(ValueError, match="size, a budget"):
+        CircularStringDeque()
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+    def advance(self, seconds) -> None:
+        self.now += round(seconds * 1e9)
+
+
+@pytest.mark.parametrize(("maxlen", "budget"), [(None, None), (6, 40)])
+def test_bounded_storage_ttl_matches_model(maxlen, budget):
+    rng = random.Random(42)
+    clock = _Clock()
+    storage = BoundedStorage(maxlen=maxlen, budget=budget, ttl=2.5, clock=clock)
+    model = []  # (stamp, fragment), oldest first
+
+    def expire() -> None:
+        while model and clock.now - model[0][0] >= 2_500_000_000:
+            model.pop(0)
+
+    for _ in range(2000):
+        action = rng.random()
+        expire()
+        if action < 0.5:
+            item = "x" * rng.randrange(12)
+            storage.append(item)
+            model.append((clock.now, item))
+            while len(model) > (maxlen or len(model)) or (
+                budget is not None
+                and len(model) > 1
+                and sum(len(item) for _, item in model) > budget
+            ):
+                model.pop(0)
+        elif action < 0.7:
+            clock.advance(rng.choice([0, 0.1, 0.5, 1, 3]))
+            expire()
+        elif action < 0.8 and model:
+            index = rng.randrange(-len(model), len(model))
+            del storage[index]
+            del model[index]
+        elif action < 0.85 and model:
+            assert storage.pop() == model.pop()[1]
+        elif action < 0.9 and model:
+            assert storage.popleft() == model.pop(0)[1]
+        assert list(storage) == [item for _, item in model]
+        assert storage.total == sum(len(item) for _, item in model)
+    # the dead prefix of the timestamps is compacted away
+    assert len(storage._stamps) - storage._stamp_head == len(model)  # noqa: SLF001
+    assert storage._stamp_head * 2 < max(len(storage._stamps), 1)  # noqa: SLF001
+    assert repr(storage).endswith("ttl=2.5)")
+
+
+def test_circular_ttl():
+    ring = CircularStringDeque(sep="|", ttl=10)
+    clock = ring._data._clock = _Clock()  # noqa: SLF001
+    ring += "a"
+    clock.advance(4)
+    ring |= ["b", "c"]
+    clock.advance(4)
+    ring += "d"
+    assert str(ring) == "a|b|c|d"
+    assert ring.tail(2) == "c|d"
+    clock.advance(2)  # "a" is exactly 10 seconds old
+    assert len(ring) == 3
+    assert str(ring) == "b|c|d"
+    assert "a" not in ring
+    assert "b" in ring
+    ring[0] = "B"  # keeps the time "b" was appended
+    clock.advance(4)
+    assert str(ring) == "d"
+    assert ring.tail(2) == "d"
+    assert ring.total_size == 1
+    clock.advance(10)
+    assert (len(ring), str(ring)) == (0, "")
+    assert ring.tail_chars(5) == ""
+
+    sized = CircularStringDeque(size=2, ttl=0.5)
+    assert sized._data.ttl == 0.5  # noqa: SLF001
+    sized |= ["a", "b", "c"]
+    assert list(sized) == ["b", "c"]
+    with pytest.raises(ValueError, match="ttl must be positive"):
+        CircularStringDeque(ttl=0)
+
+
+def test_block_storage():
+    blocks = BlockStorage(range(10), block_size=4)
+    assert blocks.popleft() == 0
+    blocks.extend(range(10, 13))
+    assert list(blocks) == list(range(1, 13))
+    assert (blocks[0], blocks[5], blocks[-1]) == (1, 6, 12)
+    assert list(blocks.iter_range(2, 9)) == list(range(3, 10))
+    assert 0 not in blocks
+    assert None not in blocks  # the freed slot of the first block
+    assert 12 in blocks
+    assert repr(blocks) == "BlockStorage(<12 elements in 4 blocks>, block_size=4)"
+    while blocks:
+        blocks.pop()
+    blocks.append("again")
+    assert list(blocks) == ["again"]
+    with pytest.raises(IndexError):
+        blocks[1]
+    with pytest.raises(IndexError):
+        BlockStorage().popleft()
+    with pytest.raises(ValueError, match="block_size"):
+        BlockStorage(block_size=0)
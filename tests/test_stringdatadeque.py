@@ -1,16 +1,28 @@
-# ruff: noqa: ANN001, ANN201, ANN205, D102, D103, N802, PLR2004, S101
+# ruff: noqa: ANN001, ANN201, ANN205, D102, D103, N802, PLR2004, S101, S311, SLF001
 # mypy: ignore-errors
 # pylint: skip-file
 """Tests covering multiple StringDeque variants and adapters."""
 
+import io
+import random
+import sys
 import textwrap
+import threading
 
 import pytest
 
+import stringdatadeque.stringdatadeque as sdd_module
+from stringdatadeque import BlockStorage
 from stringdatadeque import CircularStringDeque
+from stringdatadeque import RopeStorage
+from stringdatadeque import ShardedStringDeque
+from stringdatadeque import SliceView
+from stringdatadeque import SpillingStringDeque
 from stringdatadeque import StringDataDeque
 from stringdatadeque import StringDeque
+from stringdatadeque import WORMSnapshot
 from stringdatadeque import WORMStringDeque
+from stringdatadeque.storage import PrefixView
 
 
 def create_stringdeque(value=None):
@@ -25,6 +37,18 @@ def create_wormstringdeque(value=None):
     return WORMStringDeque(sep="\n", data=value)
 
 
+def create_ropestringdeque(value=None):
+    return StringDeque(sep="\n", data=value, storage=RopeStorage)
+
+
+def create_spillingstringdeque(value=None):
+    return SpillingStringDeque(memory_limit=8, sep="\n", data=value)
+
+
+def create_shardedstringdeque(value=None):
+    return ShardedStringDeque(sep="\n", data=value, order="arrival")
+
+
 def test_init():
     a = StringDataDeque(data="test", convert_func=str, format_func=str)
     b = StringDataDeque(data=["test"], convert_func=str, format_func=str)
@@ -38,6 +62,9 @@ def test_init():
         create_stringdeque,
         create_circularstringdeque,
         create_wormstringdeque,
+        create_ropestringdeque,
+        create_spillingstringdeque,
+        create_shardedstringdeque,
     ],
 )
 class TestForAll:
@@ -127,6 +154,19 @@ class TestForAll:
         assert isinstance(msg, str)
         assert msg == "line 1"
 
+    @staticmethod
+    def test_draw_many(stringdeque_func):
+        stringdeque = stringdeque_func(list("abcdefgh"))
+        assert stringdeque.draw_many(3) == ["a", "b", "c"]
+        assert stringdeque.draw_many(2, "right") == ["g", "h"]
+        assert stringdeque.draw_joined(2, sep="") == "de"
+        assert str(stringdeque) == "f"
+        stringdeque |= ["g", "h"]
+        assert stringdeque.draw_joined(5, "right") == "f\ng\nh"
+        assert stringdeque.draw_many(1) == []
+        with pytest.raises(ValueError, match="count"):
+            stringdeque.draw_many(-1)
+
     @staticmethod
     def test_insert_with_conv_func(stringdeque_func):
         stringdeque = stringdeque_func()
@@ -177,6 +217,8 @@ class TestForAll:
 
     @staticmethod
     def test_insert_no_pre_or_conv(stringdeque_func):
+        if stringdeque_func in {create_ropestringdeque, create_spillingstringdeque}:
+            pytest.skip("storage only stores str")
         stringdeque = stringdeque_func()
         stringdeque.insert([1, 2], pre_process_func=None, skip_conversion=True)
         stringdeque.insert(1, pre_process_func=None, skip_conversion=True)
@@ -267,3 +309,270 @@ def test_WORMStringDeque_not_implemented():
         temp.clear()
     with pytest.raises(NotImplementedError):
         del temp[0]
+
+
+def test_render_cache_formats_only_new_elements():
+    calls = []
+
+    def format_func(obj) -> str:
+        calls.append(obj)
+        return str(obj)
+
+    sdd = StringDataDeque(convert_func=int, format_func=format_func, sep=",")
+    sdd |= [1, 2, 3]
+    assert str(sdd) == "1,2,3"
+    calls.clear()
+    sdd += 4
+    sdd.insert([5, 6])
+    assert str(sdd) == "1,2,3,4,5,6"
+    assert calls == [4, 5, 6]
+    calls.clear()
+    assert str(sdd) == "1,2,3,4,5,6"
+    assert calls == []
+
+
+def test_render_cache_invalidation():
+    sd = StringDeque(data=["a", "b", "c"], sep=",")
+    assert str(sd) == "a,b,c"
+    sd[0] = "z"
+    assert str(sd) == "z,b,c"
+    assert sd.draw(1) == "b"
+    assert str(sd) == "z,c"
+    sd.sep = "-"
+    assert str(sd) == "z-c"
+    assert f"{sd:sep='+'}" == "z+c"
+    assert str(sd) == "z-c"
+    sd.format_func = str.upper
+    assert str(sd) == "Z-C"
+    sd.clear()
+    assert str(sd) == ""
+    sd += "x"
+    assert str(sd) == "X"
+
+
+def test_render_cache_circular_eviction():
+    sd = CircularStringDeque(size=2, sep=",")
+    sd |= ["a", "b"]
+    assert str(sd) == "a,b"
+    sd += "c"
+    assert str(sd) == "b,c"
+
+
+def test_contains_streams_across_boundaries(monkeypatch):
+    monkeypatch.setattr(sdd_module, "DEFAULT_RENDER_CHUNK_SIZE", 3)
+    words = ["alpha", "be", "", "gamma", "d"]
+    expected = "::".join(words)
+    needles = {expected[i:j] for i in range(len(expected)) for j in range(i, 12 + i)}
+    for needle in [*needles, "x", "a::::g", "alpha::be::::gamma::d::"]:
+        sd = StringDeque(data=words, sep="::")
+        assert (needle in sd) == (needle in expected), needle
+
+
+def test_iter_chunks():
+    sd = StringDeque(data=["abc", "defgh", "", "ij"], sep="-")
+    pieces = list(sd.iter_chunks(4))
+    assert "".join(pieces) == str(sd)
+    assert all(len(piece) <= 4 for piece in pieces)
+    assert "".join(sd.iter_chunks(1, sep="+")) == "abc+defgh++ij"
+    assert list(StringDeque().iter_chunks()) == []
+    with pytest.raises(ValueError, match="chunk_size"):
+        sd.iter_chunks(0)
+
+
+def test_write_to(tmp_path):
+    sd = StringDeque(data=["caf\u00e9", "na\u00efve", "x" * 50], sep="\n")
+    text = io.StringIO()
+    assert sd.write_to(text, chunk_size=7) == len(str(sd))
+    assert text.getvalue() == str(sd)
+    binary = io.BytesIO()
+    written = sd.write_to(binary, chunk_size=3, encoding="utf-16")
+    assert binary.getvalue() == str(sd).encode("utf-16")
+    assert written == len(binary.getvalue())
+    path = tmp_path / "out.txt"
+    with path.open("wb") as file:
+        sd.write_to(file)
+    assert path.read_bytes() == str(sd).encode()
+
+
+@pytest.mark.parametrize("sep", ["", ",", "<->"])
+def test_circular_tail_matches_rendering(sep):
+    rng = random.Random(99)
+    ring = CircularStringDeque(size=6, sep=sep)
+    pool = ["a", "bb", "", "cccc", "d" * 9]
+    for _ in range(600):
+        roll = rng.random()
+        if roll < 0.6:
+            ring += rng.choice(pool)  # the same objects come back often
+        elif roll < 0.7 and len(ring):
+            ring.draw(rng.randrange(len(ring)))
+        elif roll < 0.8 and len(ring):
+            ring[rng.randrange(len(ring))] = rng.choice(pool)
+        rendered = str(ring)
+        elements = [ring[i] for i in range(len(ring))]
+        for count in range(9):
+            assert ring.tail(count) == sep.join(
+                elements[max(len(elements) - count, 0) :]
+            )
+        for count in (1, 2, 3, 5, 8, 13, 40):
+            assert ring.tail_chars(count) == rendered[-count:]
+
+
+def test_circular_tail_is_cached():
+    calls = []
+    ring = CircularStringDeque(size=100, data=[str(n) for n in range(100)], sep=",")
+    ring.format_func = lambda text: calls.append(text) or text
+    assert ring.tail(3) == "97,98,99"
+    assert ring.tail_chars(5) == "98,99"
+    assert calls == ["99", "98", "97", "99", "98"]
+    calls.clear()
+    assert ring.tail(3) == "97,98,99"
+    assert ring.tail_chars(5) == "98,99"
+    assert calls == []
+    ring += "100"
+    assert ring.tail(3) == "98,99,100"
+    assert ring.tail_chars(5) == "9,100"
+    assert calls == ["100", "99", "98", "100", "99"]
+    ring.sep = "|"
+    assert ring.tail(2) == "99|100"
+    with pytest.raises(ValueError, match="count"):
+        ring.tail(-1)
+    with pytest.raises(ValueError, match="count"):
+        ring.tail_chars(-1)
+    assert ring.tail(0) == ring.tail_chars(0) == ""
+
+
+def test_circular_tail_tracks_left_end():
+    ring = CircularStringDeque(size=4, data=["a", "a"], sep="--")
+    assert ring.tail(3) == "a--a"
+    assert ring.tail_chars(10) == "a--a"
+    assert ring.tail_chars(3) == "--a"
+    ring += "a"
+    assert ring.tail(3) == "a--a--a"
+    assert ring.tail_chars(10) == "a--a--a"
+    ring.draw(0)
+    ring.draw(0)
+    assert ring.tail_chars(3) == "a"
+
+
+def test_worm_snapshot():
+    worm = WORMStringDeque(data=["a", "b", "c"], sep=",")
+    whole = worm.snapshot()
+    first = worm.snapshot(1)
+    worm |= ["d", "e"]
+    assert isinstance(whole, WORMSnapshot)
+    assert (str(whole), len(whole), str(first)) == ("a,b,c", 3, "a")
+    assert (whole[1], whole[-1], list(whole)) == ("b", "c", ["a", "b", "c"])
+    assert "c" in whole
+    assert "d" not in whole
+    assert "".join(whole.iter_chunks(2)) == "a,b,c"
+    out = io.BytesIO()
+    whole.write_to(out)
+    assert out.getvalue() == b"a,b,c"
+    assert f"{whole:sep=|}" == "a|b|c"
+    with pytest.raises(IndexError):
+        whole[3]
+    with pytest.raises(NotImplementedError, match="read-only"):
+        whole += "x"
+    with pytest.raises(NotImplementedError, match="read-only"):
+        whole.draw()
+    with pytest.raises(ValueError, match="count"):
+        worm.snapshot(6)
+    # drawing past a snapshot leaves it sharing the storage
+    assert worm.draw() == "e"
+    assert first._data.shared
+    assert whole._data.shared
+    # drawing inside one copies that snapshot first
+    assert worm.draw(1) == "b"
+    assert str(worm) == "a,c,d"
+    assert (str(whole), str(first)) == ("a,b,c", "a")
+    assert not whole._data.shared
+    assert first._data.shared
+    # calls that remove nothing leave every snapshot sharing the storage
+    assert worm.draw_many(0) == []
+    assert worm.draw_many(0, side="right") == []
+    with pytest.raises(ValueError, match="count"):
+        worm.draw_many(-1)
+    assert first._data.shared
+
+
+def test_worm_snapshot_while_appending():
+    expected = [str(n) for n in range(20_000)]
+    worm = WORMStringDeque(data=expected, sep=",")
+    snapshot = worm.snapshot()
+    stop = threading.Event()
+
+    def writer() -> None:
+        while not stop.is_set():
+            worm.insert(["more"] * 100)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(5):
+            assert list(snapshot) == expected
+            assert "".join(snapshot.iter_chunks(1000)) == ",".join(expected)
+    finally:
+        stop.set()
+        thread.join()
+        sys.setswitchinterval(interval)
+    assert len(worm) > len(expected)
+
+
+def test_prefix_view_reraises_persistent_errors():
+    class Broken(list):
+        def __iter__(self) -> None:
+            msg = "broken"
+            raise RuntimeError(msg)
+
+    view = PrefixView(Broken([1, 2]), 2)
+    with pytest.raises(RuntimeError, match="broken"):
+        list(view)
+    assert list(reversed(PrefixView([1, 2, 3], 2))) == [2, 1]
+    # a storage that lost elements fails instead of looping forever
+    backing = [1, 2]
+    view = PrefixView(backing, 2)
+    backing.pop()
+    with pytest.raises(RuntimeError, match="shorter"):
+        list(view)
+
+
+@pytest.mark.parametrize(
+    "storage",
+    [None, lambda: BlockStorage(block_size=4), lambda: RopeStorage(chunk_size=6)],
+    ids=["deque", "block", "rope"],
+)
+def test_slices_and_render_match_list(storage):
+    rng = random.Random(99)
+    elements = [str(n) * (n % 3) for n in range(40)]
+    kwargs = {} if storage is None else {"storage": storage}
+    sd = StringDeque(data=elements, sep=",", **kwargs)
+    bounds = [None, *range(-45, 45)]
+    for _ in range(300):
+        start, stop = rng.choice(bounds), rng.choice(bounds)
+        step = rng.choice([None, 1, 2, 5, -1, -3])
+        view = sd[start:stop:step]
+        expected = elements[start:stop:step]
+        assert isinstance(view, SliceView)
+        assert len(view) == len(expected)
+        assert list(view) == expected
+        assert str(view) == ",".join(expected)
+        inner = rng.choice(bounds)
+        assert list(view[inner:]) == expected[inner:]
+        if expected:
+            index = rng.randrange(-len(expected), len(expected))
+            assert view[index] == expected[index]
+        assert sd.render(start, stop) == ",".join(elements[start:stop])
+    assert sd.render() == str(sd)
+    with pytest.raises(IndexError):
+        sd[5:10][5]
+
+
+def test_slice_view_reads_current_elements():
+    sd = StringDeque(data=["a", "b", "c", "d"], sep="-")
+    view = sd[1:3]
+    assert repr(view) == "SliceView(StringDeque[1:3:1])"
+    sd[1] = "B"
+    assert str(view) == "B-c"
+    assert f"{sd[::-1]}" == "d-c-B-a"
@@ -0,0 +1,76 @@
+# ruff: noqa: ANN001, ANN201, ANN202, D103, S101, S603
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for the runtime type-checking levels."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from beartype.roar import BeartypeCallHintParamViolation
+
+from stringdatadeque import typecheck
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+PROBE = """
+from stringdatadeque import StringDeque
+from stringdatadeque.typecheck import LEVEL
+
+def kind(func):
+    try:
+        func()
+    except Exception as exc:
+        return "beartype" if "Beartype" in type(exc).__name__ else "other"
+    return "ok"
+
+sd = StringDeque("x")
+print(LEVEL, kind(lambda: sd.draw("a")), kind(lambda: StringDeque(sep=1)))
+"""
+
+
+def _probe(level):
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    env.pop(typecheck.ENV_VAR, None)
+    if level is not None:
+        env[typecheck.ENV_VAR] = level
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    return result.stdout.split()
+
+
+@pytest.mark.parametrize(
+    ("level", "expected"),
+    [
+        (None, ["full", "beartype", "beartype"]),
+        ("full", ["full", "beartype", "beartype"]),
+        (" Boundary ", ["boundary", "other", "beartype"]),
+        ("off", ["off", "other", "ok"]),
+        ("bogus", ["full", "beartype", "beartype"]),
+    ],
+)
+def test_levels(level, expected):
+    assert _probe(level) == expected
+
+
+def test_typechecked_functions_at_boundary(monkeypatch):
+    monkeypatch.setattr(typecheck, "LEVEL", "boundary")
+
+    def insert(value: int) -> int:
+        return value
+
+    def other(value: int) -> int:
+        return value
+
+    assert typecheck.typechecked(other) is other
+    checked = typecheck.typechecked(insert)
+    assert checked is not insert
+    with pytest.raises(BeartypeCallHintParamViolation):
+        checked("x")
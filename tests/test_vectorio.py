@@ -0,0 +1,156 @@
+# ruff: noqa: ANN001, ANN201, ANN202, ARG001, D103, FBT003, PLR2004, S101
+# mypy: ignore-errors
+# pylint: skip-file
+"""Tests for vectored output and the flush_to methods."""
+
+import os
+import socket
+import threading
+
+import pytest
+
+from stringdatadeque import BytesDataDeque
+from stringdatadeque import StringDeque
+from stringdatadeque import WORMStringDeque
+from stringdatadeque import vectorio
+
+
+def _read_all(fd_or_sock, out):
+    chunks = []
+    while True:
+        if isinstance(fd_or_sock, socket.socket):
+            data = fd_or_sock.recv(1 << 16)
+        else:
+            data = os.read(fd_or_sock, 1 << 16)
+        if not data:
+            break
+        chunks.append(data)
+    out.append(b"".join(chunks))
+
+
+def test_interleave():
+    assert list(vectorio.interleave([], ",")) == []
+    assert list(vectorio.interleave(["a"], ",")) == ["a"]
+    assert list(vectorio.interleave(["a", "b", "c"], ",")) == [
+        "a",
+        ",",
+        "b",
+        ",",
+        "c",
+    ]
+    assert list(vectorio.interleave(["a", "b"], "")) == ["a", "b"]
+
+
+def test_partial_writes(monkeypatch):
+    received = bytearray()
+
+    def short_writev(fd, buffers):
+        # accept at most 3 bytes per call to exercise resumption
+        data = b"".join(bytes(buffer) for buffer in buffers)[:3]
+        received.extend(data)
+        return len(data)
+
+    monkeypatch.setattr(vectorio.os, "writev", short_writev)
+    monkeypatch.setattr(vectorio, "IOV_MAX", 4)
+    buffers = [b"hello", b"", bytearray(b" "), memoryview(b"world"), b"!" * 10]
+    written = vectorio.writev_all(99, buffers)
+    assert bytes(received) == b"hello world" + b"!" * 10
+    assert written == len(received)
+
+
+def test_timeout_reports_bytes_written(monkeypatch):
+    received = bytearray()
+
+    def writev_then_time_out(fd, buffers):
+        if len(received) >= 12:
+            msg = "timed out"
+            raise TimeoutError(msg)
+        data = b"".join(bytes(buffer) for buffer in buffers)[:5]
+        received.extend(data)
+        return len(data)
+
+    monkeypatch.setattr(vectorio.os, "writev", writev_then_time_out)
+    monkeypatch.setattr(vectorio, "IOV_MAX", 3)
+    monkeypatch.setattr(vectorio, "COALESCE_BELOW", 0)
+    buffers = [b"abcd", b"efgh", b"ijkl", b"mnop", b"qrst"]
+    with pytest.raises(TimeoutError) as info:
+        vectorio.writev_all(99, buffers)
+    # counted across batches, from the start of the output
+    assert info.value.characters_written == len(received) == 13
+    assert bytes(received) == b"".join(buffers)[:13]
+
+
+def test_flush_to_non_blocking_socket_can_resume():
+    sd = StringDeque(sep="\n")
+    sd |= [f"line {n:07d} " + "x" * 90 for n in range(100_000)]
+    expected = str(sd).encode()
+    left, right = socket.socketpair()
+    with left, right:
+        left.setblocking(False)
+        with pytest.raises(BlockingIOError) as info:
+            sd.flush_to(left, clear=True)
+        written = info.value.characters_written
+        assert 0 < written < len(expected)
+        assert len(sd) == 100_000
+        out = []
+        reader = threading.Thread(target=_read_all, args=(right, out))
+        reader.start()
+        left.setblocking(True)
+        left.sendall(expected[written:])
+        left.shutdown(socket.SHUT_WR)
+        reader.join()
+    assert out[0] == expected
+
+
+def test_worm_flush_to_clear(tmp_path):
+    worm = WORMStringDeque(["a", "b"], sep="")
+    snapshot = worm.snapshot()
+    path = tmp_path / "out.txt"
+    with path.open("wb") as file:
+        assert worm.flush_to(file, clear=True) == 2
+    assert path.read_bytes() == b"ab"
+    assert len(worm) == 0
+    assert list(snapshot) == ["a", "b"]
+
+
+def test_flush_to_pipe_many_fragments():
+    sd = StringDeque(sep="\n")
+    sd |= [f"line {n} é" for n in range(vectorio.IOV_MAX * 3 + 7)]
+    expected = str(sd).encode()
+    read_fd, write_fd = os.pipe()
+    out = []
+    reader = threading.Thread(target=_read_all, args=(read_fd, out))
+    reader.start()
+    try:
+        assert sd.flush_to(write_fd) == len(expected)
+    finally:
+        os.close(write_fd)
+        reader.join()
+        os.close(read_fd)
+    assert out[0] == expected
+    assert len(sd) > 0
+
+
+def test_flush_to_socket_stateful_encoding_and_clear():
+    sd = StringDeque(data=["a", "b", "c"], sep="-")
+    expected = str(sd).encode("utf-16")
+    left, right = socket.socketpair()
+    out = []
+    reader = threading.Thread(target=_read_all, args=(right, out))
+    reader.start()
+    with left:
+        assert sd.flush_to(left, encoding="utf-16", clear=True) == len(expected)
+        left.shutdown(socket.SHUT_WR)
+        reader.join()
+    right.close()
+    assert out[0] == expected
+    assert len(sd) == 0
+
+
+def test_bytes_flush_to_file(tmp_path):
+    bd = BytesDataDeque([b"one", memoryview(b"two"), bytearray(b"three")], sep=b", ")
+    path = tmp_path / "out.bin"
+    with path.open("wb") as file:
+        file.write(b"head:")
+        assert bd.flush_to(file) == bd.nbytes
+    assert path.read_bytes() == b"head:" + bytes(bd)